@@ -10,7 +10,7 @@ from tgbot.config import load_config
 
 from tgbot.database.models.models import GendersEnum, NationsEnum, WorkingStylesEnum, UniversityDirections, Forms, \
                                           Professions, FormsProfessions, WorkingCompanies, Languages, Applications, \
-                                          Users
+                                          Users, MailingJobs, MailingRecipients, DailyStats
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,53 @@
+"""mailing jobs
+
+Revision ID: 3c9a51d27e04
+Revises: 208fa17666ca
+Create Date: 2023-01-14 18:02:11.417305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a51d27e04'
+down_revision = '208fa17666ca'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('mailing_jobs',
+    sa.Column('job_id', sa.INTEGER(), autoincrement=True, nullable=False),
+    sa.Column('admin_id', sa.BIGINT(), nullable=False),
+    sa.Column('from_chat_id', sa.BIGINT(), nullable=False),
+    sa.Column('message_id', sa.BIGINT(), nullable=False),
+    sa.Column('target_text', sa.TEXT(), nullable=True),
+    sa.Column('status', sa.Enum('RUNNING', 'PAUSED', 'CANCELLED', 'DONE', name='mailingstatusesenum'),
+              server_default='RUNNING', nullable=False),
+    sa.Column('total', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('sent', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('failed', sa.INTEGER(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_table('mailing_recipients',
+    sa.Column('job_id', sa.INTEGER(), nullable=False),
+    sa.Column('telegram_id', sa.BIGINT(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENDING', 'SENT', 'FAILED', name='recipientstatusesenum'),
+              server_default='PENDING', nullable=False),
+    sa.Column('error', sa.VARCHAR(length=255), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['mailing_jobs.job_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'telegram_id')
+    )
+    op.create_index('ix_mailing_recipients_job_id_status', 'mailing_recipients', ['job_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mailing_recipients_job_id_status', table_name='mailing_recipients')
+    op.drop_table('mailing_recipients')
+    op.drop_table('mailing_jobs')
+    sa.Enum(name='recipientstatusesenum').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='mailingstatusesenum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""stats indexes
+
+Revision ID: 5e1b7c9a2f43
+Revises: 3c9a51d27e04
+Create Date: 2023-01-18 11:24:36.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1b7c9a2f43'
+down_revision = '3c9a51d27e04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_users_registered_at'), 'users', ['registered_at'], unique=False)
+    op.create_index(op.f('ix_forms_registered_at'), 'forms', ['registered_at'], unique=False)
+    op.create_index(op.f('ix_forms_updated_at'), 'forms', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_forms_updated_at'), table_name='forms')
+    op.drop_index(op.f('ix_forms_registered_at'), table_name='forms')
+    op.drop_index(op.f('ix_users_registered_at'), table_name='users')
@@ -0,0 +1,40 @@
+"""daily stats
+
+Revision ID: 8d4f2a6b1c90
+Revises: 5e1b7c9a2f43
+Create Date: 2023-01-20 16:40:12.518230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4f2a6b1c90'
+down_revision = '5e1b7c9a2f43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_stats',
+    sa.Column('day', sa.DATE(), nullable=False),
+    sa.Column('metric', sa.Enum('USERS', 'FORMS', 'UPDATED_FORMS', name='statsmetricsenum'), nullable=False),
+    sa.Column('count', sa.INTEGER(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('day', 'metric')
+    )
+    # Backfill from existing data
+    op.execute("""
+        INSERT INTO daily_stats (day, metric, count)
+        SELECT registered_at::date, 'USERS'::statsmetricsenum, count(*) FROM users GROUP BY 1
+        UNION ALL
+        SELECT registered_at::date, 'FORMS'::statsmetricsenum, count(*) FROM forms GROUP BY 1
+        UNION ALL
+        SELECT updated_at::date, 'UPDATED_FORMS'::statsmetricsenum, count(*) FROM forms
+        WHERE updated_at IS NOT NULL GROUP BY 1
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_stats')
+    sa.Enum(name='statsmetricsenum').drop(op.get_bind(), checkfirst=True)
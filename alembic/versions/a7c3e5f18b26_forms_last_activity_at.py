@@ -0,0 +1,29 @@
+"""forms last_activity_at
+
+Revision ID: a7c3e5f18b26
+Revises: 8d4f2a6b1c90
+Create Date: 2023-01-23 10:12:53.730416
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5f18b26'
+down_revision = '8d4f2a6b1c90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('forms', sa.Column('last_activity_at', sa.TIMESTAMP(), nullable=True))
+    op.execute("UPDATE forms SET last_activity_at = GREATEST(registered_at, updated_at)")
+    op.alter_column('forms', 'last_activity_at', nullable=False, server_default=sa.text('now()'))
+    op.create_index('ix_forms_last_activity_at_form_id', 'forms',
+                    [sa.text('last_activity_at DESC'), sa.text('form_id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_forms_last_activity_at_form_id', table_name='forms')
+    op.drop_column('forms', 'last_activity_at')
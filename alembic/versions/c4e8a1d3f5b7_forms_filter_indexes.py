@@ -0,0 +1,32 @@
+"""forms filter indexes
+
+Revision ID: c4e8a1d3f5b7
+Revises: a7c3e5f18b26
+Create Date: 2023-01-24 09:47:18.215630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d3f5b7'
+down_revision = 'a7c3e5f18b26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_forms_gender_last_activity_at_form_id', 'forms',
+                    ['gender', sa.text('last_activity_at DESC'), sa.text('form_id DESC')], unique=False)
+    op.create_index('ix_forms_university_grade_last_activity_at_form_id', 'forms',
+                    ['university_grade', sa.text('last_activity_at DESC'), sa.text('form_id DESC')], unique=False)
+    op.create_index('ix_forms_direction_id', 'forms', ['direction_id'], unique=False)
+    op.create_index('ix_forms_working_style', 'forms', ['working_style'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_forms_working_style', table_name='forms')
+    op.drop_index('ix_forms_direction_id', table_name='forms')
+    op.drop_index('ix_forms_university_grade_last_activity_at_form_id', table_name='forms')
+    op.drop_index('ix_forms_gender_last_activity_at_form_id', table_name='forms')
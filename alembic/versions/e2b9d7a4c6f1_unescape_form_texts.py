@@ -0,0 +1,30 @@
+"""unescape form texts
+
+Revision ID: e2b9d7a4c6f1
+Revises: c4e8a1d3f5b7
+Create Date: 2023-01-26 11:02:41.508317
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9d7a4c6f1'
+down_revision = 'c4e8a1d3f5b7'
+branch_labels = None
+depends_on = None
+
+# These texts were saved HTML escaped, now they are saved as typed and escaped by the form renderer
+COLUMNS = ['address', 'positive_assessment', 'negative_assessment']
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.execute(f"UPDATE forms SET {column} = replace(replace(replace({column}, '&lt;', '<'), '&gt;', '>'), "
+                   f"'&amp;', '&') WHERE {column} LIKE '%&%'")
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.execute(f"UPDATE forms SET {column} = replace(replace(replace({column}, '&', '&amp;'), '<', '&lt;'), "
+                   f"'>', '&gt;') WHERE {column} ~ '[&<>]'")
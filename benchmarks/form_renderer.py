@@ -0,0 +1,220 @@
+"""
+Time of rendering a form for every view: the old code of the handlers (the if/elif chains of admin.show_form and
+basics.show_my_form, the group post concatenated answer by answer in form_filling) and render_form.
+
+    python -m benchmarks.form_renderer
+"""
+import argparse
+import timeit
+from datetime import date, datetime
+
+from benchmarks.utils import print_table
+from tgbot.database.models.models import GendersEnum, NationsEnum, WorkingStylesEnum
+from tgbot.misc.dataclasses import Form
+from tgbot.misc.form_renderer import FormView, render_form
+
+FORM = Form(
+    1, "Aziz Karimov", date(2001, 9, 11), GendersEnum.MALE, "998901234567", ["Buxgalteriya", "Marketing", "Savdo"],
+    "Qo'qon shahri, Navoiy ko'chasi 12", NationsEnum.UZBEK, 3, "iqtisodiyot", ("Artel", "Buxgalter"), False, True,
+    [("rus", 75), ("ingiliz", 50), ("nemis", 25)], [("word", 100), ("excel", 75), ("1c", 50), ("photoshop", 25)],
+    WorkingStylesEnum.COLLECTIVE, 2, "Mehnatkash va o'z ustida ishlaydi", "Shoshqaloq", "photo",
+    datetime(2023, 1, 20, 10, 15, 30), datetime(2023, 1, 25, 12, 0, 5), "Aziz", "aziz_karimov", 1001
+)
+
+
+def render_admin_old(form: Form) -> str:
+    """  admin.show_form before the renderer  """
+    gender = 'Erkak' if form.gender == GendersEnum.MALE else 'Ayol'
+    professions = "Mavjud emas!" if not form.professions else ', '.join(form.professions)
+    nation = "O'zbek"
+    if form.nation == NationsEnum.RUSSIAN:
+        nation = "Rus"
+    elif form.nation == NationsEnum.OTHER:
+        nation = "Boshqa"
+    university_grade = 'Magistr' if form.university_grade == 5 else form.university_grade
+    university_direction = form.direction.capitalize() if form.direction is not None else \
+        "Ma'lumotlar bazasidan o'chirilgan!"
+    working_company = "Mavjud emas!" if not form.working_company else \
+        f"\n    <b>Nomi:</b> {form.working_company[0]}\n    <b>Lavozimi:</b> {form.working_company[1]}"
+    driver_license = "Bor" if form.driver_license else "Yo'q"
+    languages = ""
+    for i in form.languages:
+        languages += f"    <b>{i[0]}:</b> {i[1]}%\n"
+    apps = ""
+    for i in form.apps:
+        apps += f"    <b>{i[0]}:</b> {i[1]}%\n"
+    working_style = 'Jamoada' if form.working_style == WorkingStylesEnum.COLLECTIVE else 'Individual'
+    salary = "1 - 2 milion so'm"
+    if form.wanted_salary == 2:
+        salary = "3 - 4 million so'm"
+    elif form.wanted_salary == 3:
+        salary = "5 million so'm va undan yuqori"
+    username = "Mavjud emas!" if form.username is None else f"@{form.username}"
+    registered_at = f"{form.registered_at.day}.{form.registered_at.month}.{form.registered_at.year} " \
+        f"{form.registered_at.hour}:{form.registered_at.minute}:{form.registered_at.second}"
+    updated_at = "\n" if not form.updated_at else \
+        f"\n<b>Yangilangan vaqt:</b> " \
+        f"{form.updated_at.day}.{form.updated_at.month}.{form.updated_at.year} " \
+        f"{form.updated_at.hour}:{form.updated_at.minute}:{form.updated_at.second}"
+    return f"<b>Ism va Familiya:</b> {form.full_name}\n" \
+           f"<b>Tug'ilgan sana:</b> {form.birth_date.day}.{form.birth_date.month}.{form.birth_date.year}\n" \
+           f"<b>Jins:</b> {gender}\n" \
+           f"<b>Telefon raqam:</b> {form.phonenum}\n" \
+           f"<b>Qiziqtirgan sohalar:</b> {professions}\n" \
+           f"<b>Yashash manzil:</b> {form.address}\n" \
+           f"<b>Millat:</b> {nation}\n" \
+           f"<b>Kurs:</b> {university_grade}\n" \
+           f"<b>Ta'lim yo'nalishi:</b> {university_direction}\n" \
+           f"<b>Ish o'rni:</b> {working_company}\n" \
+           f"<b>Oilaviy ahvol:</b> {'Turmush qurgan' if form.marital_status else 'Turmush qurmagan'}\n" \
+           f"<b>Haydovchilik guvohnomasi:</b> {driver_license}\n" \
+           f"<b>Tillar:</b>\n" \
+           f"{languages}" \
+           f"<b>Dasturlar:</b>\n" \
+           f"{apps}" \
+           f"<b>Ishlash uslubi:</b> {working_style}\n" \
+           f"<b>Oylik maoshi:</b> {salary}\n" \
+           f"<b>Ijobiy ta'rif:</b> {form.positive_assessment}\n" \
+           f"<b>Salbiy ta'rif:</b> {form.negative_assessment}\n" \
+           f"<b>Telegramdagi ismi:</b> {form.telegram_name}\n" \
+           f"<b>Telegramdagi nomi:</b> {username}\n" \
+           f"<b>Telegram ID:</b> {form.telegram_id}\n" \
+           f"<b>Tuzilgan vaqt:</b> {registered_at}" \
+           f"{updated_at}"
+
+
+def render_owner_old(form: Form) -> str:
+    """  basics.show_my_form before the renderer  """
+    gender = 'Erkak' if form.gender == GendersEnum.MALE else 'Ayol'
+    professions = "Mavjud emas!" if not form.professions else ', '.join(form.professions)
+    nation = "O'zbek"
+    if form.nation == NationsEnum.RUSSIAN:
+        nation = "Rus"
+    elif form.nation == NationsEnum.OTHER:
+        nation = "Boshqa"
+    university_grade = 'Magistr' if form.university_grade == 5 else form.university_grade
+    university_direction = form.direction.capitalize() if form.direction is not None else \
+        "Ma'lumotlar bazasidan o'chirilgan!"
+    working_company = "Mavjud emas!" if not form.working_company else \
+        f"\n    <b>Nomi:</b> {form.working_company[0]}\n    <b>Lavozimi:</b> {form.working_company[1]}"
+    driver_license = "Bor" if form.driver_license else "Yo'q"
+    languages = ""
+    for i in form.languages:
+        languages += f"<b>{i[0]}:</b> {i[1]}%\n"
+    apps = ""
+    for i in form.apps:
+        apps += f"<b>{i[0]}:</b> {i[1]}%\n"
+    working_style = 'Jamoada' if form.working_style == WorkingStylesEnum.COLLECTIVE else 'Individual'
+    salary = "1 - 2 milion so'm"
+    if form.wanted_salary == 2:
+        salary = "3 - 4 million so'm"
+    elif form.wanted_salary == 3:
+        salary = "5 million so'm va undan yuqori"
+    registered_at = f"{form.registered_at.day}.{form.registered_at.month}.{form.registered_at.year} " \
+                    f"{form.registered_at.hour}:{form.registered_at.minute}:{form.registered_at.second}"
+    updated_at = "\n" if not form.updated_at else \
+        f"\n<b>Yangilangan vaqt:</b> " \
+        f"{form.updated_at.day}.{form.updated_at.month}.{form.updated_at.year} " \
+        f"{form.updated_at.hour}:{form.updated_at.minute}:{form.updated_at.second}"
+    return f"<b>Ism va Familiya:</b> {form.full_name}\n" \
+           f"<b>Tug'ilgan sana:</b> {form.birth_date.day}.{form.birth_date.month}.{form.birth_date.year}\n" \
+           f"<b>Jins:</b> {gender}\n" \
+           f"<b>Telefon raqam:</b> {form.phonenum}\n" \
+           f"<b>Qiziqtirgan sohalar:</b> {professions}\n" \
+           f"<b>Yashash manzil:</b> {form.address}\n" \
+           f"<b>Millat:</b> {nation}\n" \
+           f"<b>Kurs:</b> {university_grade}\n" \
+           f"<b>Ta'lim yo'nalishi:</b> {university_direction}\n" \
+           f"<b>Ish o'rni:</b> {working_company}\n" \
+           f"<b>Oilaviy ahvol:</b> {'Turmush qurgan' if form.marital_status else 'Turmush qurmagan'}\n" \
+           f"<b>Haydovchilik guvohnomasi:</b> {driver_license}\n" \
+           f"{languages}" \
+           f"{apps}" \
+           f"<b>Ishlash uslubi:</b> {working_style}\n" \
+           f"<b>Oylik maoshi:</b> {salary}\n" \
+           f"<b>Ijobiy ta'rif:</b> {form.positive_assessment}\n" \
+           f"<b>Salbiy ta'rif:</b> {form.negative_assessment}\n" \
+           f"<b>Tuzilgan vaqt:</b> {registered_at}" \
+           f"{updated_at}"
+
+
+def render_group_old(form: Form) -> str:
+    """  The group post before the renderer: every form_filling handler added its answer to the text of the state  """
+    form_text = f"<b>F.I.Sh.:</b> {form.full_name}\n"
+    form_text = form_text + f"<b>Tug'ilgan sana:</b> {form.birth_date.day}.{form.birth_date.month}." \
+                            f"{form.birth_date.year}\n"
+    gender_uz = "Erkak" if form.gender == GendersEnum.MALE else "Ayol"
+    form_text = form_text + f"<b>Jins:</b> {gender_uz}\n"
+    form_text = form_text + f"<b>Telefon raqam:</b> {form.phonenum}\n"
+    if not form.professions:
+        form_text = form_text + "<b>Qiziqtirgan sohalar:</b> Mavjud emas!\n"
+    else:
+        form_text = form_text + f"<b>Qiziqtirgan sohalar:</b> {', '.join(form.professions)}\n"
+    form_text = form_text + f"<b>Yashash manzil:</b> {form.address}\n"
+    nation = "O'zbek"
+    if form.nation == NationsEnum.RUSSIAN:
+        nation = "Rus"
+    elif form.nation == NationsEnum.OTHER:
+        nation = "Boshqa"
+    form_text = form_text + f"<b>Millat:</b> {nation}\n"
+    university_grade_uz = "Magistr" if form.university_grade == 5 else form.university_grade
+    form_text = form_text + f"<b>Kurs:</b> {university_grade_uz}\n"
+    form_text = form_text + f"<b>Ta'lim yo'nalishi: </b> {form.direction.capitalize()}\n"
+    if form.working_company:
+        form_text = form_text + "<b>Ish o'rni: </b>"
+        form_text = form_text + f"\n    <b>Nomi:</b> {form.working_company[0]}\n"
+        form_text = form_text + f"    <b>Lavozimi:</b> {form.working_company[1]}\n"
+    else:
+        form_text = form_text + "<b>Ish o'rni: </b>\U00002796\n"
+    marital_status_uz = "Turmush qurgan" if form.marital_status else "Turmush qurmagan"
+    form_text = form_text + f"<b>Oilaviy ahvol:</b> {marital_status_uz}\n"
+    driver_license_uz = "Bor" if form.driver_license else "Yo'q"
+    form_text = form_text + f"<b>Haydovchilik guvohnomasi:</b> {driver_license_uz}\n<b>Tillar:</b>\n"
+    form_text = form_text + f"Rus tili: {form.languages[0][1]}%\n"
+    form_text = form_text + f"Ingiliz tili: {form.languages[1][1]}%\n"
+    for name, level in form.languages[2:]:
+        form_text = form_text + f"{name.capitalize()}: "
+        form_text = form_text + f"{level}%\n"
+    form_text = form_text + "<b>Dasturlar:</b>\n"
+    form_text = form_text + f"Word: {form.apps[0][1]}%\n"
+    form_text = form_text + f"Excel: {form.apps[1][1]}%\n"
+    form_text = form_text + f"1C: {form.apps[2][1]}%\n"
+    for name, level in form.apps[3:]:
+        form_text = form_text + f"{name.capitalize()}: "
+        form_text = form_text + f"{level}%\n"
+    working_style_uz = "Jamoada" if form.working_style == WorkingStylesEnum.COLLECTIVE else "Individual"
+    form_text = form_text + f"<b>Ishlash uslubi:</b> {working_style_uz}\n"
+    salary_uz = "1 - 2 milion so'm"
+    if form.wanted_salary == 2:
+        salary_uz = "3 - 4 million so'm"
+    elif form.wanted_salary == 3:
+        salary_uz = "5 million so'm va undan yuqori"
+    form_text = form_text + f"<b>Oylik maoshi:</b> {salary_uz}\n"
+    form_text = form_text + f"<b>Ijobiy ta'rif:</b> {form.positive_assessment}\n"
+    form_text = form_text + f"<b>Salbiy ta'rif:</b> {form.negative_assessment}\n"
+    username = "Mavjud emas!" if form.username is None else f"@{form.username}"
+    form_text = form_text + f"<b>Telegramdagi ismi:</b> {form.telegram_name}\n" \
+                            f"<b>Telegramdagi nomi:</b> {username}\n" \
+                            f"<b>Telegram ID:</b> {form.telegram_id}\n"
+    if form.updated_at:
+        form_text = form_text + "<code>YANGILANGAN!</code>"
+    return form_text
+
+
+OLD_RENDERERS = {FormView.ADMIN: render_admin_old, FormView.OWNER: render_owner_old, FormView.GROUP: render_group_old}
+
+
+def main(number: int):
+    rows = []
+    for view, render_old in OLD_RENDERERS.items():
+        old = min(timeit.repeat(lambda: render_old(FORM), number=number, repeat=5)) / number * 1_000_000
+        new = min(timeit.repeat(lambda: render_form(FORM, view), number=number, repeat=5)) / number * 1_000_000
+        rows.append([view.value, old, new, old / new])
+    print(f"Best of 5 runs of {number} renders")
+    print_table(["view", "old us/form", "render_form us/form", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=10_000, help="renders of every view in one run")
+    main(parser.parse_args().number)
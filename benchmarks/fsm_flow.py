@@ -0,0 +1,129 @@
+"""
+Redis traffic of filling the 24 questions of a form: the state operations of the form_filling handlers update by update,
+with the state read once per update as the FSM middleware of the dispatcher does. The flow runs against aiogram's
+RedisStorage, which keeps the data as one JSON string, and HashRedisStorage, with and without FSMBufferMiddleware.
+
+    python -m benchmarks.fsm_flow --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+from benchmarks.utils import counting_redis, delete_keys, measure, print_table, traffic
+from tgbot.middlewares.fsm import BufferedFSMContext
+from tgbot.misc.states import FormFillingStates as States
+from tgbot.misc.storage import HashRedisStorage
+
+PREFIX = "benchmark:fsm_flow"
+LANGUAGES = [{"name": "rus", "level": 75}, {"name": "ingiliz", "level": 50}]
+APPLICATIONS = [{"name": "word", "level": 100}, {"name": "excel", "level": 75}, {"name": "1c", "level": 25}]
+GET = "get"  # get_data
+CLEAR = None  # clear
+# Operations of every update of the flow in the order of the handlers: a state is set_state, a dict is update_data
+FLOW = [
+    [States.q1_name, {"form_message_id": 2, "anketa_text_message_id": 1}],
+    [States.q2_birth_date, {"full_name": "Aziz Karimov"}, {"question_message_id": 3}],
+    [States.q3_gender, {"birth_date": "2001-01-01"}],
+    [States.q4_phonenum, {"gender": "MALE"}],
+    [{"unconfirmed_phonenum": "+998901234567"}],
+    [States.q5_professions, GET, {"phonenum": "+998901234567"}],
+    [GET, {"checked_professions": [1]}],
+    [GET, {"checked_professions": [1, 2]}],
+    [States.q6_address, GET, {"checked_professions": [1, 2], "profession_titles": ["Soha 1", "Soha 2"]}],
+    [States.q7_nation, {"address": "Qo'qon shahri, Turkiston ko'chasi, 28-A uy"}],
+    [States.q8_university_grade, {"nation": "UZBEK"}],
+    [States.q9_university_direction, {"university_grade": 3}],
+    [States.q10_working_company, {"direction_id": 1, "direction_title": "Iqtisodiyot"}],
+    [States.company_name, {"question_message_id": 3}],
+    [States.company_position, {"company": ["Artel"]}],
+    [States.q11_marital_status, GET, {"company": ["Artel", "Buxgalter"]}],
+    [States.q12_driver_license, {"marital_status": False, "languages": []}],
+    [States.q13_ru_lang, {"driver_license": True}],
+    [States.q14_eng_lang, {"languages": LANGUAGES[:1]}],
+    [States.q15_other_lang, GET, {"languages": LANGUAGES}],
+    [States.lang_name, {"question_message_id": 3}],
+    [States.lang_level, {"lang_name": "nemis"}],
+    [States.q15_other_lang, GET, {"languages": LANGUAGES + [{"name": "nemis", "level": 25}], "lang_name": None}],
+    [States.q16_word_app, {"applications": []}],
+    [States.q17_excel_app, {"applications": APPLICATIONS[:1]}],
+    [States.q18_1c_app, GET, {"applications": APPLICATIONS[:2]}],
+    [States.q19_other_app, GET, {"applications": APPLICATIONS}],
+    [States.app_name, {"question_message_id": 3}],
+    [States.app_level, {"app_name": "photoshop"}],
+    [States.q19_other_app, GET, {"applications": APPLICATIONS + [{"name": "photoshop", "level": 50}],
+                                 "app_name": None}],
+    [States.q20_working_style],
+    [States.q21_salary, {"working_style": "COLLECTIVE"}],
+    [States.q22_positive_assessment, {"salary": 2}],
+    [States.q23_negative_assessment, {"positive_assessment": "Mas'uliyatli, tez o'rganaman"}],
+    [States.q24_photo, {"negative_assessment": "Ba'zan shoshilaman"}],
+    [States.ready_form, GET, {"photo_id": "AgACAgIAAxkBAAIBZ2PQ", "form_message_id": 5, "form_photo_message_id": 4,
+                              "anketa_text_message_id": 6}],
+    [GET, CLEAR],
+]
+
+
+async def run_update(context: FSMContext, operations: list, buffered: bool):
+    """
+    Read the state as the FSM middleware does, then run the operations of the handler.
+    If 'buffered', they go through BufferedFSMContext and are written after the handler, as in FSMBufferMiddleware
+    """
+    raw_state = await context.get_state()
+    if buffered:
+        context = BufferedFSMContext(context, raw_state)
+    for operation in operations:
+        if operation is GET:
+            await context.get_data()
+        elif operation is CLEAR:
+            await context.clear()
+        elif isinstance(operation, dict):
+            await context.update_data(operation)
+        else:
+            await context.set_state(operation)
+    if buffered:
+        await context.flush()
+
+
+async def run_flow(context: FSMContext, buffered: bool):
+    """  Fill the form from the first update to the last one, the last update clears the state  """
+    for operations in FLOW:
+        await run_update(context, operations, buffered)
+
+
+async def main(redis_url: str, repeat: int):
+    redis = counting_redis(redis_url, decode_responses=True)
+    key_builder = DefaultKeyBuilder(prefix=PREFIX)
+    bot = Bot(token="1:benchmark")  # RedisStorage encodes the data with the JSON functions of the bot session
+    key = StorageKey(bot_id=1, chat_id=1, user_id=1)
+    storages = {"RedisStorage": RedisStorage(redis, key_builder=key_builder),
+                "HashRedisStorage": HashRedisStorage(redis, key_builder=key_builder)}
+    rows = []
+    try:
+        for buffered in (False, True):
+            for name, storage in storages.items():
+                await delete_keys(redis, f"{PREFIX}:*")
+                context = FSMContext(bot=bot, storage=storage, key=key)
+                traffic.reset()
+                await run_flow(context, buffered)
+                rows.append([name, "yes" if buffered else "no", traffic.round_trips, traffic.commands,
+                             traffic.commands / len(FLOW), traffic.bytes_sent, traffic.bytes_received,
+                             await measure(lambda: run_flow(context, buffered), repeat) * 1000])
+    finally:
+        await delete_keys(redis, f"{PREFIX}:*")
+        await redis.close()
+        await bot.session.close()
+    print(f"{len(FLOW)} updates, median time of {repeat} flows")
+    print_table(["storage", "buffered", "round trips", "commands", "commands/update", "bytes sent", "bytes received",
+                 "ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of the flow, the median time is printed")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.redis_url, arguments.repeat))
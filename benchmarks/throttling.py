@@ -0,0 +1,70 @@
+"""
+Per-update overhead of the throttling middlewares: in-memory ThrottlingMiddleware and RedisThrottlingMiddleware.
+Updates of many chats are all allowed, a flood of one chat is throttled after the first update.
+
+    python -m benchmarks.throttling --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import Chat, Message
+
+from benchmarks.utils import counting_redis, delete_keys, print_table, traffic
+from tgbot.middlewares.throttling import RedisThrottlingMiddleware, ThrottlingMiddleware
+
+PREFIX = "benchmark:throttling"
+
+
+async def handler(event: Message, data: dict):
+    return True
+
+
+def make_updates(count: int, chats: int) -> list[tuple[Message, dict]]:
+    """  Make messages of the chats in turn with handler data that has the throttling flag of the bot's handlers  """
+    handler_object = HandlerObject(callback=handler, flags={"throttling_key": "default"})
+    return [(Message(message_id=number, date=datetime.now(), chat=Chat(id=number % chats, type="private")),
+             {"handler": handler_object}) for number in range(count)]
+
+
+async def run_updates(middleware, updates: list[tuple[Message, dict]]) -> tuple[float, int]:
+    """  Pass the updates through the middleware one by one, return microseconds per update and count of handled  """
+    handled = 0
+    started_at = time.perf_counter()
+    for event, data in updates:
+        if await middleware(handler, event, data):
+            handled += 1
+    return (time.perf_counter() - started_at) / len(updates) * 1_000_000, handled
+
+
+async def main(redis_url: str, count: int):
+    redis = counting_redis(redis_url)
+    await redis.ping()
+    scenarios = {"many chats": make_updates(count, chats=count), "one chat flood": make_updates(count, chats=1)}
+    rows = []
+    try:
+        for scenario, updates in scenarios.items():
+            ThrottlingMiddleware.caches["default"].clear()
+            microseconds, handled = await run_updates(ThrottlingMiddleware(), updates)
+            rows.append([scenario, "memory", microseconds, handled, 0.0, 0.0])
+
+            await delete_keys(redis, f"{PREFIX}:*")
+            traffic.reset()
+            microseconds, handled = await run_updates(RedisThrottlingMiddleware(redis, prefix=PREFIX), updates)
+            rows.append([scenario, "redis", microseconds, handled, traffic.round_trips / count,
+                         (traffic.bytes_sent + traffic.bytes_received) / count])
+    finally:
+        await delete_keys(redis, f"{PREFIX}:*")
+        await redis.close()
+    print(f"{count} updates")
+    print_table(["scenario", "backend", "us/update", "handled", "round trips/update", "bytes/update"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--count", type=int, default=10_000, help="count of updates of every scenario")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.redis_url, arguments.count))
@@ -0,0 +1,92 @@
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Iterable
+
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.connection import Connection
+
+
+def print_table(header: list[str], rows: Iterable[Iterable[Any]]):
+    """  Print rows as a table with columns aligned to the right  """
+    rows = [header] + [[f"{value:.2f}" if isinstance(value, float) else str(value) for value in row] for row in rows]
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+async def measure(function: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    """  Call the function 'repeat' times one by one, return the median time of a call in seconds  """
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await function()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+class Traffic:
+    """  Redis traffic of the counting connections: commands, round trips and bytes in both directions  """
+
+    def __init__(self):
+        self.commands = 0
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def reset(self):
+        self.__init__()
+
+
+traffic = Traffic()
+
+
+class CountingStreamReader:
+    """  Reader of the connection socket that counts received bytes  """
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    async def read(self, n: int = -1) -> bytes:
+        return self.count(await self.reader.read(n))
+
+    async def readline(self) -> bytes:
+        return self.count(await self.reader.readline())
+
+    async def readexactly(self, n: int) -> bytes:
+        return self.count(await self.reader.readexactly(n))
+
+    @staticmethod
+    def count(data: bytes) -> bytes:
+        traffic.bytes_received += len(data)
+        return data
+
+    def __getattr__(self, name: str):
+        return getattr(self.reader, name)
+
+
+class CountingConnection(Connection):
+    """  Connection that adds everything it sends and receives to 'traffic', one send is one round trip  """
+
+    async def _connect(self):
+        await super()._connect()
+        self._reader = CountingStreamReader(self._reader)
+
+    def pack_command(self, *args):  # Pipelines pack their commands one by one with it too
+        traffic.commands += 1
+        return super().pack_command(*args)
+
+    async def send_packed_command(self, command, check_health: bool = True):
+        traffic.round_trips += 1
+        traffic.bytes_sent += len(command) if isinstance(command, (bytes, str)) else sum(map(len, command))
+        await super().send_packed_command(command, check_health)
+
+
+def counting_redis(url: str, **kwargs) -> Redis:
+    """  Make a client of the Redis whose traffic is counted in 'traffic'  """
+    return Redis(connection_pool=ConnectionPool.from_url(url, connection_class=CountingConnection, **kwargs))
+
+
+async def delete_keys(redis: Redis, pattern: str):
+    """  Delete keys the benchmark made  """
+    async for key in redis.scan_iter(match=pattern, count=1000):
+        await redis.unlink(key)
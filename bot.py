@@ -3,7 +3,7 @@ import logging
 
 from aiogram import Bot, Dispatcher, F
 from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import Redis
 
 from tgbot.handlers.admin import admin_router
 from tgbot.handlers.basics import basics_router
@@ -11,11 +11,20 @@ from tgbot.handlers.form_filling import form_filling_router
 from tgbot.handlers.feedback import feedback_router
 from tgbot.middlewares.config import ConfigMiddleware
 from tgbot.middlewares.database import DbSessionMiddleware
+from tgbot.middlewares.fsm import FSMBufferMiddleware
 from tgbot.config import load_config, Config
-from tgbot.middlewares.throttling import ThrottlingMiddleware
+from tgbot.middlewares.throttling import ThrottlingMiddleware, RedisThrottlingMiddleware
 from tgbot.misc import broadcaster
+from tgbot.misc.mailing import MailingWorker
+from tgbot.misc.cleanup import deletion_scheduler
+from tgbot.misc.session import InstrumentedAiohttpSession
+from tgbot.misc.storage import HashRedisStorage
+from tgbot.misc.webhook import WebhookHandler, run_webhook_server
+from tgbot.misc.updates_stream import UpdatesProducer, UpdatesConsumer, poll_updates
 from tgbot.misc.default_commands import setup_default_commands
 from tgbot.database.functions.setup import create_session_pool
+from tgbot.database.functions.functions import get_professions, get_directions
+from tgbot.database.functions.cache import catalog_cache, forms_cache, profiles_cache
 
 
 logger = logging.getLogger(__name__)
@@ -30,12 +39,42 @@ async def on_shutdown(bot: Bot, config: Config):
     await broadcaster.broadcast(bot, config.tgbot.admins, "Bot Stopped!!")
 
 
-def register_global_middlewares(dp: Dispatcher, config, session_pool):
-    dp.message.middleware(ThrottlingMiddleware())
+async def start_webhook(dp: Dispatcher, bot: Bot, config: Config, feed=None):
+    """  Register the webhook and serve updates with an embedded aiohttp server  """
+    webhook = config.webhook
+    # Every replica sets the same url, so it is safe to run several of them behind one ingress
+    await bot.set_webhook(url=webhook.url + webhook.path, secret_token=webhook.secret_token or None,
+                          allowed_updates=dp.resolve_used_update_types())
+    handler = WebhookHandler(feed=feed or (lambda update: dp.feed_raw_update(bot, update)),
+                             secret_token=webhook.secret_token or None)
+    await run_webhook_server(handler, path=webhook.path, host=webhook.host, port=webhook.port)
+
+
+async def start_receiver(dp: Dispatcher, bot: Bot, config: Config, redis: Redis):
+    """  Only receive updates and push them to Redis Streams, workers handle them  """
+    producer = UpdatesProducer(redis, partitions=config.cluster.partitions)
+    if config.webhook.use_webhook:
+        await start_webhook(dp, bot, config, feed=producer.push_raw)
+    else:
+        await bot.delete_webhook()
+        await poll_updates(bot, producer, allowed_updates=dp.resolve_used_update_types())
+
+
+async def start_worker(dp: Dispatcher, bot: Bot, config: Config, redis: Redis):
+    """  Handle updates from Redis Streams, any count of workers can be started on any hosts  """
+    consumer = UpdatesConsumer(redis, dp, bot, partitions=config.cluster.partitions,
+                               consumer_name=config.cluster.worker_name)
+    await consumer.run()
+
+
+def register_global_middlewares(dp: Dispatcher, config, session_pool, redis=None):
+    dp.message.middleware(RedisThrottlingMiddleware(redis) if redis else ThrottlingMiddleware())
     dp.message.outer_middleware(ConfigMiddleware(config))
     dp.callback_query.outer_middleware(ConfigMiddleware(config))
     dp.message.middleware(DbSessionMiddleware(session_pool=session_pool))
     dp.callback_query.middleware(DbSessionMiddleware(session_pool=session_pool))
+    dp.message.middleware(FSMBufferMiddleware())
+    dp.callback_query.middleware(FSMBufferMiddleware())
 
 
 async def main():
@@ -46,11 +85,15 @@ async def main():
     logger.info("Starting bot!")
     config = load_config(".env")
 
-    storage = RedisStorage.from_url(
+    storage = HashRedisStorage.from_url(
             url=config.tgbot.redis_url,
             connection_kwargs={"decode_responses": True}
         ) if config.tgbot.use_redis else MemoryStorage()
-    bot = Bot(token=config.tgbot.bot_token, parse_mode="HTML")
+    http = config.http
+    bot_session = InstrumentedAiohttpSession(pool_size=http.pool_size, keepalive_timeout=http.keepalive_timeout,
+                                             dns_cache_ttl=http.dns_cache_ttl, retries=http.retries,
+                                             log_every=http.log_every)
+    bot = Bot(token=config.tgbot.bot_token, parse_mode="HTML", session=bot_session)
     dp = Dispatcher(storage=storage)
     dp.message.filter(F.chat.type == "private")
     session_pool = await create_session_pool(db=config.db)
@@ -63,14 +106,46 @@ async def main():
     ]:
         dp.include_router(router)
 
-    register_global_middlewares(dp, config, session_pool)
+    role = config.cluster.role
+    if role != "all" and not config.tgbot.use_redis:
+        raise ValueError(f"Role {role!r} needs Redis, set USE_REDIS=True")
+    redis = Redis.from_url(config.tgbot.redis_url, decode_responses=True) if config.tgbot.use_redis else None
+    register_global_middlewares(dp, config, session_pool, redis)
+    background_tasks = []
+    if role != "receiver":
+        async with session_pool() as session:  # Load catalogs to the cache before the first update
+            await get_professions(session)
+            await get_directions(session)
+        if redis:
+            background_tasks.append(asyncio.create_task(catalog_cache.listen(redis)))
+            background_tasks.append(asyncio.create_task(forms_cache.listen(redis)))
+            background_tasks.append(asyncio.create_task(profiles_cache.listen(redis)))
+        mailing_worker = MailingWorker(bot, session_pool, rate=config.tgbot.mailing_rate, redis=redis,
+                                       owner_name=config.cluster.worker_name)
+        background_tasks.append(asyncio.create_task(mailing_worker.run()))
+        background_tasks.append(asyncio.create_task(deletion_scheduler.run(bot, redis)))
 
     try:
-        await on_startup(bot, config)
-        await dp.start_polling(bot)
+        if role != "worker":
+            await on_startup(bot, config)
+        if role == "receiver":
+            await start_receiver(dp, bot, config, redis)
+        elif role == "worker":
+            await start_worker(dp, bot, config, redis)
+        elif config.webhook.use_webhook:
+            await start_webhook(dp, bot, config)
+        else:
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
     finally:
-        await on_shutdown(bot, config)
+        for task in background_tasks:
+            task.cancel()
+        if role != "worker":
+            await on_shutdown(bot, config)
+        if redis:
+            await redis.close()
         await dp.storage.close()
+        bot_session.log_stats()
         await bot.session.close()
 
 
@@ -0,0 +1,14 @@
+import pytest
+
+from tgbot.database.functions.cache import catalog_cache, forms_cache, profiles_cache
+from tgbot.keyboards.inline import forms_pages
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """  Every test creates the tables again, so nothing cached by a previous test is valid  """
+    catalog_cache.drop("professions")
+    catalog_cache.drop("directions")
+    forms_cache.drop()
+    profiles_cache.local.clear()
+    forms_pages.clear()
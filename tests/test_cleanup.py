@@ -0,0 +1,20 @@
+import asyncio
+
+from redis.exceptions import ConnectionError
+
+from tgbot.misc.cleanup import DeletionScheduler
+
+
+def test_messages_of_the_heap_are_taken_when_redis_fails():
+    async def failing_script(keys, args):
+        raise ConnectionError("Redis is unavailable")
+
+    async def scenario():
+        scheduler = DeletionScheduler(batch_size=2)
+        await scheduler.schedule_many([(1, 10), (1, 11), (2, 20)])
+        scheduler.pop_due_script = failing_script
+        assert await scheduler.pop_due() == [(1, 10), (1, 11)]
+        assert await scheduler.pop_due() == [(2, 20)]
+        assert await scheduler.pop_due() == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import asyncio
+
+from sqlalchemy import insert
+
+from tests.test_form_saving import TELEGRAM_ID, make_answers, prepare
+from tests.utils import connect, requires_database
+from tgbot.database.functions.cache import forms_cache
+from tgbot.database.functions.functions import add_form, get_form, get_rendered_form, update_form
+from tgbot.database.models.models import Users
+from tgbot.misc.dataclasses import RenderedForm
+from tgbot.misc.form_renderer import FormView
+
+pytestmark = requires_database
+
+
+def test_get_form_statements_count_does_not_depend_on_child_rows():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await prepare(session_pool)
+            async with session_pool() as session:
+                form_id = await add_form(session, **make_answers())
+                await session.execute(insert(Users).values(telegram_id=TELEGRAM_ID + 1, telegram_name="Olim"))
+                await session.commit()
+                small_form_id = await add_form(session, **make_answers(
+                    telegram_id=TELEGRAM_ID + 1, checked_professions=[], company=[],
+                    languages=[{"name": "rus", "level": 25}], applications=[]))
+
+            async with session_pool() as session:
+                counter.reset()
+                form = await get_form(session, form_id)
+            # The form with its direction, company and user, then professions, languages and apps
+            assert counter.count == 2
+            assert form.professions == ["Soha 1", "Soha 2", "Soha 3"]
+            assert form.languages == [("rus", 75), ("ingiliz", 50), ("nemis", 25)]
+            assert form.apps == [("word", 100), ("excel", 75)]
+            assert (form.direction, form.working_company, form.telegram_id) == \
+                ("Iqtisodiyot", ("Artel", "Buxgalter"), TELEGRAM_ID)
+
+            async with session_pool() as session:
+                counter.reset()
+                form = await get_form(session, small_form_id)
+            assert counter.count == 2
+            assert (form.professions, form.working_company, form.languages, form.apps) == \
+                ([], None, [("rus", 25)], [])
+
+    asyncio.run(scenario())
+
+
+def test_cached_form_costs_no_statements_until_it_is_updated():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await prepare(session_pool)
+            async with session_pool() as session:
+                form_id = await add_form(session, **make_answers())
+            async with session_pool() as session:
+                await get_rendered_form(session, form_id, FormView.ADMIN)
+                counter.reset()
+                rendered = await get_rendered_form(session, form_id, FormView.ADMIN)
+                assert counter.count == 0
+                assert "Aziz Karimov" in rendered.text
+
+                await update_form(session, form_id=form_id, **make_answers(full_name="Olim Karimov"))
+                rendered = await get_rendered_form(session, form_id, FormView.ADMIN)
+                assert "Olim Karimov" in rendered.text
+
+    asyncio.run(scenario())
+
+
+def test_form_rendered_before_invalidation_is_not_cached():
+    async def scenario():
+        version = forms_cache.version()
+        await forms_cache.invalidate(1)  # A write committed while the form was being rendered
+        await forms_cache.set(1, FormView.ADMIN.value, RenderedForm(text="Old", photo_id="photo", version=""), version)
+        assert await forms_cache.get(1, FormView.ADMIN.value) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import insert
+
+from tests.utils import connect, requires_database
+from tgbot.database.functions.functions import add_form, update_form
+from tgbot.database.models.models import Professions, UniversityDirections, Users
+
+pytestmark = requires_database
+
+TELEGRAM_ID = 1001
+
+
+def make_answers(**changes) -> dict:
+    answers = dict(
+        telegram_id=TELEGRAM_ID, full_name="Aziz Karimov", birth_date=date(2001, 9, 11), gender="MALE",
+        phonenum="998901234567", address="Qo'qon", nation="UZBEK", university_grade=3, direction_id=1,
+        marital_status=False, driver_license=True, working_style="COLLECTIVE", wanted_salary=2,
+        positive_assessment="Mehnatkash", negative_assessment="Shoshqaloq", photo_id="photo",
+        checked_professions=[1, 2, 3], company=["Artel", "Buxgalter"],
+        languages=[{"name": "rus", "level": 75}, {"name": "ingiliz", "level": 50}, {"name": "nemis", "level": 25}],
+        applications=[{"name": "word", "level": 100}, {"name": "excel", "level": 75}]
+    )
+    answers.update(changes)
+    return answers
+
+
+async def prepare(session_pool):
+    async with session_pool() as session:
+        await session.execute(insert(Professions).values([{"title": f"Soha {number}"} for number in range(1, 5)]))
+        await session.execute(insert(UniversityDirections).values(title="Iqtisodiyot"))
+        await session.execute(insert(Users).values(telegram_id=TELEGRAM_ID, telegram_name="Aziz"))
+        await session.commit()
+
+
+def written_tables(statements: list[str], command: str) -> list[str]:
+    return [statement.split()[2] for statement in statements if statement.startswith(command)]
+
+
+def test_add_form_statements_count_does_not_depend_on_child_rows():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await prepare(session_pool)
+            async with session_pool() as session:
+                counter.reset()
+                await add_form(session, **make_answers())
+            # forms, daily_stats, forms_professions, working_companies, languages, applications, users
+            assert counter.count == 7
+
+            async with session_pool() as session:
+                await session.execute(insert(Users).values(telegram_id=TELEGRAM_ID + 1, telegram_name="Olim"))
+                await session.commit()
+                counter.reset()
+                await add_form(session, **make_answers(telegram_id=TELEGRAM_ID + 1, checked_professions=[1],
+                                                      languages=[{"name": "rus", "level": 25}],
+                                                      applications=[{"name": "word", "level": 25}]))
+            assert counter.count == 7
+
+    asyncio.run(scenario())
+
+
+def test_update_form_without_changes_of_child_rows_writes_only_the_form():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await prepare(session_pool)
+            async with session_pool() as session:
+                form_id = await add_form(session, **make_answers())
+                counter.reset()
+                await update_form(session, form_id=form_id, **make_answers(full_name="Aziz Karimov O'g'li"))
+            # forms, forms_professions delete and upsert, working_companies upsert, select of child rows,
+            # daily_stats, users
+            assert counter.count == 7
+            assert written_tables(counter.statements, "INSERT INTO") == ["forms_professions", "working_companies",
+                                                                         "daily_stats"]
+            assert written_tables(counter.statements, "DELETE FROM") == ["forms_professions"]
+
+    asyncio.run(scenario())
+
+
+def test_update_form_writes_only_changed_child_rows():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await prepare(session_pool)
+            async with session_pool() as session:
+                form_id = await add_form(session, **make_answers())
+                await update_form(session, form_id=form_id, **make_answers())
+                counter.reset()
+                languages = [{"name": "rus", "level": 100}, {"name": "ingiliz", "level": 50}]
+                await update_form(session, form_id=form_id, **make_answers(languages=languages))
+            # The second update also takes the form out of the stats of the previous update's day
+            assert counter.count == 10
+            assert written_tables(counter.statements, "INSERT INTO").count("languages") == 1
+            assert written_tables(counter.statements, "DELETE FROM").count("languages") == 1
+            assert "applications" not in written_tables(counter.statements, "INSERT INTO")
+            assert "applications" not in written_tables(counter.statements, "DELETE FROM")
+
+    asyncio.run(scenario())
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import orjson
+from sqlalchemy import insert
+
+from tests.utils import connect, requires_database
+from tgbot.database.models.models import Forms
+from tgbot.handlers.admin import make_forms_page_state
+from tgbot.keyboards.inline import forms_pages, make_forms_keyboard
+
+pytestmark = requires_database
+
+
+async def add_forms(session_pool, count: int):
+    """  Add forms named 'Form 1', 'Form 2' and so on, the first one is the newest, every third one is updated  """
+    now = datetime(2023, 1, 25, 12)
+    rows = []
+    for number in range(1, count + 1):
+        last_activity_at = now - timedelta(minutes=number)
+        rows.append(dict(
+            full_name=f"Form {number}", birth_date=date(2001, 1, 1), gender="MALE" if number % 2 else "FEMALE",
+            phonenum="998901234567", address="Qo'qon", nation="UZBEK", university_grade=number % 5 + 1,
+            marital_status=False, driver_license=False, working_style="COLLECTIVE", wanted_salary=1,
+            positive_assessment="", negative_assessment="", photo_id="photo",
+            registered_at=last_activity_at - timedelta(days=1) if number % 3 == 0 else last_activity_at,
+            updated_at=last_activity_at if number % 3 == 0 else None, last_activity_at=last_activity_at))
+    async with session_pool() as session:
+        await session.execute(insert(Forms).values(rows))
+        await session.commit()
+
+
+def listed_names(keyboard_data: dict) -> list[str]:
+    return [line.split(". ", 1)[1].rstrip("*") for line in keyboard_data["text"].splitlines()]
+
+
+def navigation_actions(keyboard_data: dict) -> list[str]:
+    return [button.callback_data.split(":")[1] for row in keyboard_data["keyboard"].inline_keyboard for button in row
+            if button.callback_data.split(":")[1] in ("previous", "next")]
+
+
+def test_every_page_of_forms_costs_one_statement():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await add_forms(session_pool, 21)
+            async with session_pool() as session:
+                # The same requests as send_form_list, send_next_form_list and send_previous_form_list make
+                counter.reset()
+                first_page = await make_forms_keyboard(session, cursor=None, action="first")
+                assert counter.count == 1
+                assert listed_names(first_page) == [f"Form {number}" for number in range(1, 11)]
+                assert "Form 3*" in first_page["text"]
+                assert navigation_actions(first_page) == ["next"]
+
+                counter.reset()
+                second_page = await make_forms_keyboard(session, cursor=first_page["last_cursor"], action="next",
+                                                        counter=10)
+                assert counter.count == 1
+                assert listed_names(second_page) == [f"Form {number}" for number in range(11, 21)]
+                assert navigation_actions(second_page) == ["previous", "next"]
+
+                counter.reset()
+                last_page = await make_forms_keyboard(session, cursor=second_page["last_cursor"], action="next",
+                                                      counter=20)
+                assert counter.count == 1
+                assert listed_names(last_page) == ["Form 21"]
+                assert navigation_actions(last_page) == ["previous"]
+
+                counter.reset()
+                previous_page = await make_forms_keyboard(session, cursor=last_page["first_cursor"],
+                                                          action="previous", counter=10)
+                assert counter.count == 1
+                assert listed_names(previous_page) == [f"Form {number}" for number in range(11, 21)]
+                assert navigation_actions(previous_page) == ["previous", "next"]
+
+                counter.reset()
+                first_page_again = await make_forms_keyboard(session, cursor=previous_page["first_cursor"],
+                                                             action="previous", counter=0)
+                assert counter.count == 1
+                assert listed_names(first_page_again) == listed_names(first_page)
+                assert navigation_actions(first_page_again) == ["next"]
+
+                # show_form rebuilds the shown page from the cache
+                counter.reset()
+                await make_forms_keyboard(session, cursor=None, action="first")
+                assert counter.count == 0
+
+    asyncio.run(scenario())
+
+
+def test_filtered_page_of_forms_costs_one_statement():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await add_forms(session_pool, 30)
+            async with session_pool() as session:
+                counter.reset()
+                first_page = await make_forms_keyboard(session, cursor=None, action="first", filter_type="female")
+                second_page = await make_forms_keyboard(session, cursor=first_page["last_cursor"], action="next",
+                                                        filter_type="female", counter=10)
+                assert counter.count == 2
+                assert listed_names(first_page) == [f"Form {number}" for number in range(2, 21, 2)]
+                assert listed_names(second_page) == [f"Form {number}" for number in range(22, 31, 2)]
+                assert navigation_actions(second_page) == ["previous"]
+
+    asyncio.run(scenario())
+
+
+def test_state_of_forms_list_keeps_only_cursors():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            await add_forms(session_pool, 21)
+            async with session_pool() as session:
+                forms_page = {"cursor": None, "action": "first", "filter_type": None, "counter": 0}
+                first_page = await make_forms_keyboard(session, **forms_page)
+                # Encoded as the storage encodes it, the keyboard and the text aren't saved
+                encoded_state = orjson.dumps(make_forms_page_state(forms_page, first_page))
+                assert len(encoded_state) < 200
+                assert b"Form" not in encoded_state
+
+                # The next page is built from the saved cursor even if the shown page left the cache
+                forms_pages.clear()
+                state = orjson.loads(encoded_state)
+                counter.reset()
+                second_page = await make_forms_keyboard(session, cursor=state["last_cursor"], action="next",
+                                                        filter_type=state["filter_type"], counter=10)
+                assert counter.count == 1
+                assert listed_names(second_page) == [f"Form {number}" for number in range(11, 21)]
+
+    asyncio.run(scenario())
@@ -0,0 +1,144 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+from tests.utils import connect, requires_database
+from tgbot.database.functions.functions import FORMS_LIST_KEYS, make_forms_list_query, make_keyset_page_query, \
+    make_users_filter_query
+
+FORMS_COUNT = 30_000  # form_id is SMALLINT, so there can't be much more forms
+# Every third form has a working company, forms are spread equally between genders, grades and directions
+SEED_STATEMENTS = [
+    "INSERT INTO university_directions (title) SELECT 'Direction ' || number FROM generate_series(1, 20) AS number",
+    f"""
+    INSERT INTO forms (full_name, birth_date, gender, phonenum, address, nation, university_grade, direction_id,
+                       marital_status, driver_license, working_style, wanted_salary, positive_assessment,
+                       negative_assessment, photo_id, registered_at, last_activity_at)
+    SELECT 'Form ' || number, DATE '2001-01-01',
+           (CASE WHEN number % 2 = 0 THEN 'MALE' ELSE 'FEMALE' END)::gendersenum, '998901234567', 'Qo''qon',
+           'UZBEK', number % 5 + 1, number % 20 + 1, false, false,
+           (CASE WHEN number % 2 = 0 THEN 'COLLECTIVE' ELSE 'INDIVIDUAL' END)::workingstylesenum, 1, '', '', 'photo',
+           TIMESTAMP '2020-01-01' + number * INTERVAL '1 hour', TIMESTAMP '2020-01-01' + number * INTERVAL '1 hour'
+    FROM generate_series(1, {FORMS_COUNT}) AS number
+    """,
+    "INSERT INTO users (telegram_id, telegram_name, form_id) SELECT form_id, 'User', form_id FROM forms",
+    """
+    INSERT INTO working_companies (form_id, name, position)
+    SELECT form_id, 'Company', 'Position' FROM forms WHERE form_id % 3 = 0
+    """,
+]
+# Indexes of the filters added by the migration, tables of the tests are made from the models
+FILTER_INDEXES_MIGRATION = next(Path(__file__).parent.parent.glob("alembic/versions/c4e8a1d3f5b7_*.py"))
+FILTER_INDEXES = ["ix_forms_gender_last_activity_at_form_id", "ix_forms_university_grade_last_activity_at_form_id",
+                  "ix_forms_direction_id", "ix_forms_working_style"]
+# A cursor in the middle of the list
+CURSOR = (datetime(2021, 1, 1), 8785)
+
+
+@asynccontextmanager
+async def seeded_database():
+    async with connect() as (session_pool, _):
+        async with session_pool() as session:
+            for statement in SEED_STATEMENTS:
+                await session.execute(text(statement))
+            await session.commit()
+        async with session_pool() as session:
+            await session.execute(text("ANALYZE"))
+        yield session_pool
+
+
+def explain_statements(conn, cursor, statement, parameters, context, executemany):
+    return "EXPLAIN (FORMAT JSON) " + statement, parameters
+
+
+async def get_plan(session, query) -> dict:
+    """  Get the plan of the query with its real parameters, as the query would be executed  """
+    def execute(connection) -> str:
+        # The result doesn't have the columns of the query, so the row is read from the cursor
+        return connection.execute(query).cursor.fetchone()[0]
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", explain_statements, retval=True)
+    try:
+        plan = await (await session.connection()).run_sync(execute)
+    finally:
+        event.remove(engine, "before_cursor_execute", explain_statements)
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return plan[0]["Plan"]
+
+
+def scans(plan: dict, subplans: bool = True) -> list[tuple[str, str, str]]:
+    """  Get (node type, table, index) of every scan of the plan, of EXISTS and other subplans too if 'subplans'  """
+    found = []
+    if "Scan" in plan["Node Type"]:
+        found.append((plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        if subplans or child.get("Parent Relationship") not in ("SubPlan", "InitPlan"):
+            found.extend(scans(child, subplans))
+    return found
+
+
+def used_indexes(plan: dict) -> set[str]:
+    return {index for _, _, index in scans(plan) if index is not None}
+
+
+def test_migration_creates_filter_indexes():
+    migration = FILTER_INDEXES_MIGRATION.read_text()
+    for index in FILTER_INDEXES:
+        assert f"op.create_index('{index}'" in migration
+
+
+@requires_database
+@pytest.mark.parametrize("filter_type, index", [
+    (None, "ix_forms_last_activity_at_form_id"),
+    ("male", "ix_forms_gender_last_activity_at_form_id"),
+    ("female", "ix_forms_gender_last_activity_at_form_id"),
+    (1, "ix_forms_university_grade_last_activity_at_form_id"),
+    (5, "ix_forms_university_grade_last_activity_at_form_id"),
+    ("working", "ix_forms_last_activity_at_form_id"),
+    ("not_working", "ix_forms_last_activity_at_form_id"),
+])
+def test_forms_list_pages_use_filter_indexes(filter_type, index):
+    """  Pages of the admins' list read forms in the order of the index of the filter instead of sorting all forms  """
+    async def scenario():
+        async with seeded_database() as session_pool:
+            async with session_pool() as session:
+                for cursor, backward in ((None, False), (CURSOR, False), (CURSOR, True)):
+                    query = make_keyset_page_query(make_forms_list_query(filter_type), FORMS_LIST_KEYS, cursor,
+                                                   backward)
+                    plan = await get_plan(session, query)
+                    assert index in used_indexes(plan), scans(plan)
+                    # The page itself never reads the whole table. The is_behind probe may, it stops at the first
+                    # row and the rows of the current page are always behind the cursor
+                    assert ("Seq Scan", "forms", None) not in scans(plan, subplans=False), scans(plan)
+                    if filter_type in ("working", "not_working"):
+                        assert "working_companies_pkey" in used_indexes(plan), scans(plan)
+
+    asyncio.run(scenario())
+
+
+@requires_database
+@pytest.mark.parametrize("target_category, target, index", [
+    ("gender", "MALE", "ix_forms_gender_last_activity_at_form_id"),
+    ("university_grade", 3, "ix_forms_university_grade_last_activity_at_form_id"),
+    ("university_direction", 5, "ix_forms_direction_id"),
+    ("working_style", "INDIVIDUAL", "ix_forms_working_style"),
+])
+def test_mailing_filters_can_use_indexes(target_category, target, index):
+    """
+    Mailing filters have indexes. A half of the forms matches a gender or a working style, reading the whole table
+    is cheaper then, so only usability of the indexes is checked
+    """
+    async def scenario():
+        async with seeded_database() as session_pool:
+            async with session_pool() as session:
+                await session.execute(text("SET enable_seqscan = off"))
+                plan = await get_plan(session, make_users_filter_query(target_category, target))
+                assert index in used_indexes(plan), scans(plan)
+
+    asyncio.run(scenario())
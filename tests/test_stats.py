@@ -0,0 +1,34 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, insert
+
+from tests.utils import connect, requires_database
+from tgbot.database.functions.functions import get_stats, rebuild_daily_stats
+from tgbot.database.models.models import Users
+
+pytestmark = requires_database
+
+# Users registered so many days ago, each one falls into one more period: day, week, month, half year, year, all time
+REGISTERED_DAYS_AGO = [0, 3, 20, 100, 300, 500]
+
+
+def test_stats_cost_one_statement():
+    async def scenario():
+        async with connect() as (session_pool, counter):
+            async with session_pool() as session:
+                await session.execute(insert(Users).values([
+                    dict(telegram_id=number, telegram_name="User", registered_at=func.now() - timedelta(days=days))
+                    for number, days in enumerate(REGISTERED_DAYS_AGO, start=1)]))
+                await rebuild_daily_stats(session)
+
+            async with session_pool() as session:
+                counter.reset()
+                stats = await get_stats(session)
+                assert counter.count == 1
+            assert [stats[f"users_{name}"] for name in ("one_day", "one_week", "one_month", "half_year", "one_year",
+                                                        "all_time")] == [1, 2, 3, 4, 5, 6]
+            assert stats["forms_all_time"] == 0
+            assert stats["updated_forms_one_day"] == 0
+
+    asyncio.run(scenario())
@@ -1,3 +1,4 @@
+import socket
 from dataclasses import dataclass
 from environs import Env
 from sqlalchemy.engine.url import URL
@@ -32,6 +33,33 @@ class TgBot:
     feedbacks_group: int
     use_redis: bool
     redis_url: str
+    mailing_rate: float
+
+
+@dataclass
+class Webhook:
+    use_webhook: bool
+    url: str
+    path: str
+    secret_token: str
+    host: str
+    port: int
+
+
+@dataclass
+class Cluster:
+    role: str  # "all" handles updates in this process, "receiver" only pushes them to Redis, "worker" only handles
+    partitions: int
+    worker_name: str
+
+
+@dataclass
+class HttpSession:
+    pool_size: int
+    keepalive_timeout: float
+    dns_cache_ttl: int
+    retries: int  # Retries of idempotent requests after network errors
+    log_every: int  # Requests between logs of latency by method
 
 
 @dataclass
@@ -43,6 +71,9 @@ class Miscellaneous:
 class Config:
     tgbot: TgBot
     db: DBConfig
+    webhook: Webhook
+    cluster: Cluster
+    http: HttpSession
     misc: Miscellaneous
 
 
@@ -57,7 +88,8 @@ def load_config(path: str = None):
             forms_group=env.int("FORMS_GROUP"),
             feedbacks_group=env.int("FEEDBACKS_GROUP"),
             use_redis=env.bool("USE_REDIS"),
-            redis_url=env.str("REDIS_URL")
+            redis_url=env.str("REDIS_URL"),
+            mailing_rate=env.float("MAILING_RATE", 25)
         ),
         db=DBConfig(
             user=env.str('DB_USER'),
@@ -67,5 +99,25 @@ def load_config(path: str = None):
             database=env.str('DB_NAME'),
             pg_password=env.str('PG_PASS')
         ),
+        webhook=Webhook(
+            use_webhook=env.bool("USE_WEBHOOK", False),
+            url=env.str("WEBHOOK_URL", ""),
+            path=env.str("WEBHOOK_PATH", "/webhook"),
+            secret_token=env.str("WEBHOOK_SECRET", ""),
+            host=env.str("WEBAPP_HOST", "0.0.0.0"),
+            port=env.int("WEBAPP_PORT", 8080)
+        ),
+        cluster=Cluster(
+            role=env.str("BOT_ROLE", "all"),
+            partitions=env.int("STREAM_PARTITIONS", 16),
+            worker_name=env.str("WORKER_NAME", socket.gethostname())
+        ),
+        http=HttpSession(
+            pool_size=env.int("TG_POOL_SIZE", 100),
+            keepalive_timeout=env.float("TG_KEEPALIVE", 30),
+            dns_cache_ttl=env.int("TG_DNS_TTL", 300),
+            retries=env.int("TG_RETRIES", 1),
+            log_every=env.int("TG_STATS_EVERY", 1000)
+        ),
         misc=Miscellaneous()
     )
@@ -0,0 +1,20 @@
+"""  Recount table daily_stats from existing data: python -m tgbot.database.functions.backfill  """
+import asyncio
+import logging
+
+from tgbot.config import load_config
+from tgbot.database.functions.functions import rebuild_daily_stats
+from tgbot.database.functions.setup import create_session_pool
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    config = load_config(".env")
+    session_pool = await create_session_pool(db=config.db)
+    async with session_pool() as session:
+        await rebuild_daily_stats(session)
+    logging.info("Table daily_stats is rebuilt")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import suppress
+from typing import Optional
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from tgbot.misc.dataclasses import RenderedForm, UserProfile
+
+CATALOG_CHANNEL = "catalog:invalidate"
+FORMS_CHANNEL = "forms:invalidate"
+PROFILES_CHANNEL = "profiles:invalidate"
+FORM_KEY = "form:{form_id}"  # Hash: view -> rendered form
+
+
+class CatalogCache:
+    """
+    In-process copy of small catalogs (professions, university directions) that are read on every keyboard render.
+    Entries live until a write invalidates them, ttl is only a safety net for changes made outside the bot.
+    When Redis is set, invalidations are published to the other processes of the bot
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self.entries: dict[str, tuple[float, list]] = {}
+        self.versions: defaultdict[str, int] = defaultdict(int)  # Changes every time the catalog data changes
+        self.redis: Optional[Redis] = None
+
+    def get(self, name: str) -> Optional[list]:
+        entry = self.entries.get(name)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def set(self, name: str, rows: list, version: int):
+        """  Save rows loaded when the catalog had the given version, rows are dropped if it was invalidated since  """
+        if self.versions[name] == version:
+            self.entries[name] = (time.monotonic(), rows)
+            self.versions[name] += 1
+
+    def version(self, name: str) -> int:
+        return self.versions[name]
+
+    def drop(self, name: str):
+        self.entries.pop(name, None)
+        self.versions[name] += 1
+
+    async def invalidate(self, name: str):
+        self.drop(name)
+        if self.redis is not None:
+            with suppress(RedisError):
+                await self.redis.publish(CATALOG_CHANNEL, name)
+
+    async def listen(self, redis: Redis):
+        """  Drop catalogs changed by other processes, runs until the task is cancelled  """
+        self.redis = redis
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(CATALOG_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.drop(message["data"])
+        finally:
+            await pubsub.unsubscribe(CATALOG_CHANNEL)
+            await pubsub.close()
+
+
+catalog_cache = CatalogCache()
+
+
+class ProfilesCache:
+    """
+    Profiles of users (is the user registered and id of his form) that are read on every menu render.
+    Functions that change table users invalidate the profile in every process by Redis pub/sub,
+    ttl is only a safety net for changes made outside the bot
+    """
+
+    def __init__(self, maxsize: int = 100_000, ttl: float = 600):
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generation = 0  # Changes every time any profile is invalidated
+        self.redis: Optional[Redis] = None
+
+    def get(self, telegram_id: int) -> Optional[UserProfile]:
+        return self.local.get(telegram_id)
+
+    def version(self) -> int:
+        return self.generation
+
+    def set(self, telegram_id: int, profile: UserProfile, version: int):
+        """  Save a profile read at the given version, it is dropped if any profile was invalidated since  """
+        if self.generation == version:
+            self.local[telegram_id] = profile
+
+    def drop(self, telegram_id: int):
+        self.local.pop(telegram_id, None)
+        self.generation += 1
+
+    async def invalidate(self, telegram_id: int):
+        self.drop(telegram_id)
+        if self.redis is not None:
+            with suppress(RedisError):
+                await self.redis.publish(PROFILES_CHANNEL, str(telegram_id))
+
+    async def listen(self, redis: Redis):
+        """  Drop profiles changed by other processes, runs until the task is cancelled  """
+        self.redis = redis
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(PROFILES_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.drop(int(message["data"]))
+        finally:
+            await pubsub.unsubscribe(PROFILES_CHANNEL)
+            await pubsub.close()
+
+
+profiles_cache = ProfilesCache()
+
+
+class FormsCache:
+    """
+    Rendered forms (text and photo id) by form id and view, an in-process LRU in front of Redis.
+    Writes of a form drop its entries, deletion of a profession or direction drops all of them,
+    because their titles are in the text. Other processes drop their local entries by Redis pub/sub.
+    A text rendered before an invalidation isn't saved, and local entries expire after 'local_ttl',
+    so an entry an invalidation of another process raced with doesn't live for the process life
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: int = 86400, local_ttl: float = 300):
+        self.local = TTLCache(maxsize=maxsize, ttl=local_ttl)
+        self.ttl = ttl
+        self.generation = 0  # Changes every time any form is invalidated
+        self.redis: Optional[Redis] = None
+
+    async def get(self, form_id: int, view: str) -> Optional[RenderedForm]:
+        rendered = self.local.get((form_id, view))
+        if rendered is None and self.redis is not None:
+            with suppress(RedisError):
+                value = await self.redis.hget(FORM_KEY.format(form_id=form_id), view)
+                if value is not None:
+                    rendered = self.local[form_id, view] = RenderedForm(**json.loads(value))
+        return rendered
+
+    def version(self) -> int:
+        return self.generation
+
+    async def set(self, form_id: int, view: str, rendered: RenderedForm, version: int):
+        """  Save a form rendered at the given version, it is dropped if any form was invalidated since  """
+        if self.generation != version:
+            return
+        self.local[form_id, view] = rendered
+        if self.redis is not None:
+            with suppress(RedisError):
+                key = FORM_KEY.format(form_id=form_id)
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, view, json.dumps(rendered.__dict__))
+                    pipe.expire(key, self.ttl)
+                    await pipe.execute()
+
+    def drop(self, form_id: Optional[int] = None):
+        """  Drop local entries of the form, or all of them if form id is None  """
+        self.generation += 1
+        if form_id is None:
+            self.local.clear()
+            return
+        for key in [key for key in self.local if key[0] == form_id]:
+            self.local.pop(key, None)
+
+    async def invalidate(self, form_id: Optional[int] = None):
+        """  Drop entries of the form, or all of them if form id is None, in every process  """
+        self.drop(form_id)
+        if self.redis is None:
+            return
+        with suppress(RedisError):
+            if form_id is None:
+                async for key in self.redis.scan_iter(match=FORM_KEY.format(form_id="*"), count=1000):
+                    await self.redis.unlink(key)
+            else:
+                await self.redis.unlink(FORM_KEY.format(form_id=form_id))
+            await self.redis.publish(FORMS_CHANNEL, "*" if form_id is None else str(form_id))
+
+    async def listen(self, redis: Redis):
+        """  Drop forms changed by other processes, runs until the task is cancelled  """
+        self.redis = redis
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(FORMS_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.drop(None if message["data"] == "*" else int(message["data"]))
+        finally:
+            await pubsub.unsubscribe(FORMS_CHANNEL)
+            await pubsub.close()
+
+
+forms_cache = FormsCache()
@@ -1,49 +1,70 @@
 from contextlib import suppress
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import select, asc, desc, case, func, insert, delete, update
+from sqlalchemy import select, exists, asc, desc, func, insert, delete, update, literal, cast, DATE, union_all, or_, \
+    tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert, SMALLINT
+from sqlalchemy.orm import joinedload, aliased
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
+from tgbot.database.functions.cache import catalog_cache, profiles_cache, forms_cache
 from tgbot.database.models.models import Forms, FormsProfessions, Professions, UniversityDirections, WorkingCompanies, \
-    Languages, Applications, Users
-from tgbot.misc.dataclasses import Form
+    Languages, Applications, Users, MailingJobs, MailingRecipients, MailingStatusesEnum, RecipientStatusesEnum, \
+    DailyStats, StatsMetricsEnum
+from tgbot.misc.dataclasses import Form, UserProfile, RenderedForm, Page
+from tgbot.misc.form_renderer import FormView, render_form
 
 
 # --------------------------------------Functions to work with table Users-------------------------------------------- #
 
 async def add_user(session: AsyncSession, telegram_id, username, telegram_name):
     """  Add user to database  """
-    query = insert(Users).values(telegram_id=telegram_id, username=username, telegram_name=telegram_name)
-    await session.execute(query)
-    with suppress(IntegrityError):
-        await session.commit()
-
-
-async def get_user_ids_by_filter(session: AsyncSession, target_category: str, target: str):
+    query = pg_insert(Users).values(
+        telegram_id=telegram_id, username=username, telegram_name=telegram_name
+    ).on_conflict_do_nothing().returning(Users.telegram_id)
+    inserted = await session.scalar(query)
+    if inserted is not None:
+        await increment_daily_stat(session, StatsMetricsEnum.USERS)
+    await session.commit()
+    # Other processes may have cached that the user doesn't exist, he is loaded again on the next read
+    await profiles_cache.invalidate(telegram_id)
+
+
+async def get_user_profile(session: AsyncSession, telegram_id) -> UserProfile:
+    """  Get whether the user exists and his form id, it is served from the profiles cache  """
+    profile = profiles_cache.get(telegram_id)
+    if profile is None:
+        version = profiles_cache.version()
+        result = await session.execute(select(Users.form_id).where(Users.telegram_id == telegram_id))
+        row = result.one_or_none()
+        profile = UserProfile(exists=row is not None, form_id=row[0] if row is not None else None)
+        profiles_cache.set(telegram_id, profile, version)
+    return profile
+
+
+def make_users_filter_query(target_category: str, target):
+    """  Make a query that selects telegram ids of users matching the mailing target  """
+    if target_category == "one_user":
+        return select(Users.telegram_id).where(Users.telegram_id == target)
     if target_category == "gender":
-        form_ids = (await session.scalars(select(Forms.form_id).where(Forms.gender == target))).all()
-        query = await session.scalars(select(Users.telegram_id).where(Users.form_id.in_(form_ids)))
-        result = query.all()
-
+        condition = Forms.gender == target
     elif target_category == "university_grade":
-        form_ids = (await session.scalars(select(Forms.form_id).where(Forms.university_grade == target))).all()
-        query = await session.scalars(select(Users.telegram_id).where(Users.form_id.in_(form_ids)))
-        result = query.all()
-
+        condition = Forms.university_grade == target
     elif target_category == "university_direction":
-        form_ids = (await session.scalars(select(Forms.form_id).where(Forms.direction_id == target))).all()
-        query = await session.scalars(select(Users.telegram_id).where(Users.form_id.in_(form_ids)))
-        result = query.all()
+        condition = Forms.direction_id == target
     elif target_category == "working_style":
-        form_ids = (await session.scalars(select(Forms.form_id).where(Forms.working_style == target))).all()
-        query = await session.scalars(select(Users.telegram_id).where(Users.form_id.in_(form_ids)))
-        result = query.all()
+        condition = Forms.working_style == target
     else:
-        query = await session.scalars(select(Users.telegram_id))
-        result = query.all()
-    return result
+        return select(Users.telegram_id)
+    return select(Users.telegram_id).where(Users.form_id.in_(select(Forms.form_id).where(condition)))
+
+
+async def get_user_ids_by_filter(session: AsyncSession, target_category: str, target: str):
+    query = await session.scalars(make_users_filter_query(target_category, target))
+    return query.all()
 
 
 # ======================================Functions to work with table Users============================================ #
@@ -57,20 +78,27 @@ async def add_profession(session: AsyncSession, title):
     await session.execute(query)
     with suppress(IntegrityError):
         await session.commit()
+    await catalog_cache.invalidate("professions")
 
 
 async def get_professions(session: AsyncSession):
-    """  Get professions' ids and titles  """
-    query = select(Professions.profession_id, Professions.title)
-    result = await session.execute(query)
-    return result.all()
+    """  Get professions' ids and titles, they are served from the catalog cache  """
+    rows = catalog_cache.get("professions")
+    if rows is None:
+        version = catalog_cache.version("professions")
+        query = select(Professions.profession_id, Professions.title)
+        result = await session.execute(query)
+        rows = [tuple(row) for row in result.all()]
+        catalog_cache.set("professions", rows, version)
+    return rows
 
 
 async def get_profession(session: AsyncSession, profession_id):
-    """  Get a profession from database by its id  """
-    query = select(Professions.title).where(Professions.profession_id == profession_id)
-    result = await session.execute(query)
-    return result.one()
+    """  Get a profession by its id, the result is a row with one column: title  """
+    for row_id, title in await get_professions(session):
+        if row_id == profession_id:
+            return title,
+    raise NoResultFound(f"Profession {profession_id} is not found")
 
 
 async def delete_profession(session: AsyncSession, profession_id):
@@ -78,6 +106,8 @@ async def delete_profession(session: AsyncSession, profession_id):
     query = delete(Professions).where(Professions.profession_id == profession_id)
     await session.execute(query)
     await session.commit()
+    await catalog_cache.invalidate("professions")
+    await forms_cache.invalidate()  # Titles are in rendered forms
 
 
 # =================================Functions to work with table Professions=========================================== #
@@ -91,20 +121,27 @@ async def add_direction(session: AsyncSession, title):
     await session.execute(query)
     with suppress(IntegrityError):
         await session.commit()
+    await catalog_cache.invalidate("directions")
 
 
 async def get_directions(session: AsyncSession):
-    """  Get university directions' ids and titles  """
-    query = select(UniversityDirections.direction_id, UniversityDirections.title)
-    result = await session.execute(query)
-    return result.all()
+    """  Get university directions' ids and titles, they are served from the catalog cache  """
+    rows = catalog_cache.get("directions")
+    if rows is None:
+        version = catalog_cache.version("directions")
+        query = select(UniversityDirections.direction_id, UniversityDirections.title)
+        result = await session.execute(query)
+        rows = [tuple(row) for row in result.all()]
+        catalog_cache.set("directions", rows, version)
+    return rows
 
 
 async def get_direction(session: AsyncSession, direction_id):
-    """  Get a university direction from database by its id  """
-    query = select(UniversityDirections.title).where(UniversityDirections.direction_id == direction_id)
-    result = await session.execute(query)
-    return result.one()
+    """  Get a university direction by its id, the result is a row with one column: title  """
+    for row_id, title in await get_directions(session):
+        if row_id == direction_id:
+            return title,
+    raise NoResultFound(f"University direction {direction_id} is not found")
 
 
 async def delete_direction(session: AsyncSession, direction_id):
@@ -112,6 +149,8 @@ async def delete_direction(session: AsyncSession, direction_id):
     query = delete(UniversityDirections).where(UniversityDirections.direction_id == direction_id)
     await session.execute(query)
     await session.commit()
+    await catalog_cache.invalidate("directions")
+    await forms_cache.invalidate()  # Titles are in rendered forms
 
 
 # =================================Functions to work with table UniversityDirections================================== #
@@ -120,13 +159,11 @@ async def delete_direction(session: AsyncSession, direction_id):
 # -----------------------------------------Functions to work with table Forms----------------------------------------- #
 
 async def get_users_form_id(session: AsyncSession, telegram_id):
-    """  Get form_id from table users  """
-    query = select(Users.form_id).where(Users.telegram_id == telegram_id)
-    try:
-        result = await session.scalar(query)
-    except NoResultFound:
-        result = None
-    return result
+    """
+    Get form_id from table users. It is always read from database, not from the profiles cache,
+    because it decides whether a sent form is added or updated
+    """
+    return await session.scalar(select(Users.form_id).where(Users.telegram_id == telegram_id))
 
 
 async def update_users_form_id(session: AsyncSession, telegram_id, form_id):
@@ -134,12 +171,7 @@ async def update_users_form_id(session: AsyncSession, telegram_id, form_id):
     query = update(Users).where(Users.telegram_id == telegram_id).values(form_id=form_id)
     await session.execute(query)
     await session.commit()
-
-
-async def is_form_updated(session: AsyncSession, form_id: int) -> bool:
-    """  Check if there is data in the updated_at row in the table forms  """
-    result = await session.scalar(select(Forms.updated_at).where(Forms.form_id == form_id))
-    return True if result else False
+    await profiles_cache.invalidate(telegram_id)
 
 
 async def add_form(session: AsyncSession, telegram_id: int, full_name: str, birth_date: datetime, gender: str,
@@ -154,25 +186,22 @@ async def add_form(session: AsyncSession, telegram_id: int, full_name: str, birt
         university_grade=university_grade, direction_id=direction_id, marital_status=marital_status,
         driver_license=driver_license, working_style=working_style, wanted_salary=wanted_salary,
         positive_assessment=positive_assessment, negative_assessment=negative_assessment, photo_id=photo_id).returning(
-        Forms)
-    result = await session.execute(form_query)
-    form_id = result.first()[0]
+        Forms.form_id)
+    form_id = await session.scalar(form_query)
+    await increment_daily_stat(session, StatsMetricsEnum.FORMS)
 
-    # Inserting all data about professions that user selected to table forms_professions
+    # Inserting all rows of related tables with one multi-row INSERT per table
     if checked_professions:
-        for profession_id in checked_professions:
-            await session.execute(insert(FormsProfessions).values(form_id=form_id, profession_id=profession_id))
-    # Inserting all data about user's working company
+        await session.execute(insert(FormsProfessions).values(
+            [{"form_id": form_id, "profession_id": profession_id} for profession_id in checked_professions]))
     if company:
         await session.execute(insert(WorkingCompanies).values(form_id=form_id, name=company[0], position=company[1]))
-    # Inserting all data about languages to table languages
-    for language_data in languages:
-        await session.execute(insert(Languages).values(form_id=form_id, name=language_data["name"],
-                                                       level=language_data["level"]))
-    # Inserting all data about applications to table application
-    for app_data in applications:
-        await session.execute(insert(Applications).values(form_id=form_id, name=app_data["name"],
-                                                          level=app_data["level"]))
+    if languages:
+        await session.execute(insert(Languages).values(
+            [{"form_id": form_id, "name": language["name"], "level": language["level"]} for language in languages]))
+    if applications:
+        await session.execute(insert(Applications).values(
+            [{"form_id": form_id, "name": app["name"], "level": app["level"]} for app in applications]))
     # Not committing here because function "update_users_form_id" will do it
     await update_users_form_id(session, telegram_id, form_id)
     return form_id
@@ -184,329 +213,173 @@ async def update_form(session: AsyncSession, form_id: int, telegram_id: int, ful
                       working_style: str, wanted_salary: int, positive_assessment: str, negative_assessment: str,
                       photo_id: str, checked_professions: list[dict], company: list[str], languages: list[dict],
                       applications: list[dict]):
-    """  Update data about forms  """
-    # Updating data about forms in table forms
+    """  Update data about forms, only changed rows of related tables are written  """
+    # Updating data about forms in table forms, the subquery in RETURNING sees the row before the update
+    # Time of the update is taken from database, so its day matches the days of table daily_stats
+    old_form = aliased(Forms)
+    updated_at = func.now()
     form_query = update(Forms).where(Forms.form_id == form_id).values(
         full_name=full_name, birth_date=birth_date, gender=gender, phonenum=phonenum, address=address, nation=nation,
         university_grade=university_grade, direction_id=direction_id, marital_status=marital_status,
         driver_license=driver_license, working_style=working_style, wanted_salary=wanted_salary,
-        positive_assessment=positive_assessment, negative_assessment=negative_assessment, photo_id=photo_id)
-    await session.execute(form_query)
-
-    await session.execute(delete(FormsProfessions).where(FormsProfessions.form_id == form_id))
-    # Inserting all data about professions that user selected to table forms_professions
+        positive_assessment=positive_assessment, negative_assessment=negative_assessment, photo_id=photo_id,
+        updated_at=updated_at, last_activity_at=updated_at
+    ).returning(select(old_form.updated_at).where(old_form.form_id == form_id).scalar_subquery(), Forms.updated_at)
+    previous_updated_at, updated_at = (await session.execute(form_query)).one()
+
+    # Deleting unselected professions and inserting newly selected ones
+    await session.execute(delete(FormsProfessions).where(
+        FormsProfessions.form_id == form_id, FormsProfessions.profession_id.not_in(checked_professions)))
     if checked_professions:
-        for profession_id in checked_professions:
-            await session.execute(insert(FormsProfessions).values(form_id=form_id, profession_id=profession_id))
+        await session.execute(pg_insert(FormsProfessions).values(
+            [{"form_id": form_id, "profession_id": profession_id} for profession_id in checked_professions]
+        ).on_conflict_do_nothing())
 
-    await session.execute(delete(WorkingCompanies).where(WorkingCompanies.form_id == form_id))
-    # Inserting data about user's working company to table working_companies
+    # Writing user's working company only if it is changed
     if company:
-        await session.execute(insert(WorkingCompanies).values(form_id=form_id, name=company[0], position=company[1]))
-
-    await session.execute(delete(Languages).where(Languages.form_id == form_id))
-    # Inserting all data about languages to table languages
-    for language_data in languages:
-        await session.execute(insert(Languages).values(form_id=form_id, name=language_data["name"],
-                                                       level=language_data["level"]))
-
-    await session.execute(delete(Applications).where(Applications.form_id == form_id))
-    # Inserting all data about applications to table application
-    for app_data in applications:
-        await session.execute(insert(Applications).values(form_id=form_id, name=app_data["name"],
-                                                          level=app_data["level"]))
-    # Setting new updated time to table Forms
-    await session.execute(update(Forms).where(Forms.form_id == form_id).values(updated_at=datetime.now()))
+        company_query = pg_insert(WorkingCompanies).values(form_id=form_id, name=company[0], position=company[1])
+        await session.execute(company_query.on_conflict_do_update(
+            index_elements=[WorkingCompanies.form_id],
+            set_={"name": company_query.excluded.name, "position": company_query.excluded.position},
+            where=or_(WorkingCompanies.name != company_query.excluded.name,
+                      WorkingCompanies.position != company_query.excluded.position)))
+    else:
+        await session.execute(delete(WorkingCompanies).where(WorkingCompanies.form_id == form_id))
+
+    # Writing the difference between stored and new languages and applications
+    children = select_form_children(form_id)
+    stored_rows = (await session.execute(select(children).where(children.c.kind != "profession"))).all()
+    await save_levels_difference(session, Languages, Languages.language_id, form_id, languages,
+                                 [row for row in stored_rows if row.kind == "language"])
+    await save_levels_difference(session, Applications, Applications.application_id, form_id, applications,
+                                 [row for row in stored_rows if row.kind == "application"])
+
+    # The form is counted in stats only by its last update
+    if previous_updated_at is not None:
+        await increment_daily_stat(session, StatsMetricsEnum.UPDATED_FORMS, previous_updated_at.date(), -1)
+    await increment_daily_stat(session, StatsMetricsEnum.UPDATED_FORMS, updated_at.date())
     # Not committing here because function "update_users_form_id" will do it
     await update_users_form_id(session, telegram_id, form_id)
+    await forms_cache.invalidate(form_id)
+
+
+async def save_levels_difference(session: AsyncSession, table, id_column, form_id: int, new_rows: list[dict],
+                                 stored_rows: list):
+    """  Make rows of table languages or applications equal to new rows with one DELETE and one INSERT at most.
+    Stored rows are kept if there is a new row with the same name and level  """
+    not_matched = [(row["name"], row["level"]) for row in new_rows]
+    deleted_ids = []
+    for row in stored_rows:
+        if (row.name, row.level) in not_matched:
+            not_matched.remove((row.name, row.level))
+        else:
+            deleted_ids.append(row.position)
+    if deleted_ids:
+        await session.execute(delete(table).where(id_column.in_(deleted_ids)))
+    if not_matched:
+        await session.execute(insert(table).values(
+            [{"form_id": form_id, "name": name, "level": level} for name, level in not_matched]))
 
 
-async def get_forms(session: AsyncSession, begin: Optional[datetime] = None, action: str = "first",
-                    filter_type: Optional[str] = None, limit: int = 10):
-    """  Get a list of forms depending on the condition  """
-    case_xpr = case(
-        [(Forms.updated_at is not None and Forms.updated_at > Forms.registered_at, Forms.updated_at)],
-        else_=Forms.registered_at
-    ).label("date")
-    # Getting rows without filter
+def make_forms_filter(filter_type) -> list:
+    """  Make conditions of the admins' list of forms for the filter  """
     if filter_type is None:
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(begin > case_xpr).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr).order_by(asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()  # Reversing the result to the desc order
-        else:  # If it is first request to get all forms
-            query = select(Forms.form_id, Forms.full_name).order_by(
-                desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        # Making a dict where the keys are form_ids and values are full_names
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        # Getting the smallest and the biggest dates from all_rows
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-        # Getting the earliest and the latest registered or updated date of the form from table forms
-        first_row_date = (await session.execute(
-            select(case_xpr).order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all rows where gender is male
-    elif filter_type == "male":
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(begin > case_xpr, Forms.gender == "MALE").order_by(
-                desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.gender == "MALE").order_by(asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is first request with filter "MALE"
-            query = select(Forms.form_id, Forms.full_name).where(Forms.gender == "MALE").order_by(desc(case_xpr)
-                                                                                                  ).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.gender == "MALE").order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.gender == "MALE").order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all rows where gender is female
-    elif filter_type == "female":
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(
-                begin > case_xpr, Forms.gender == "FEMALE").order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.gender == "FEMALE").order_by(asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is first request with filter "MALE"
-            query = select(Forms.form_id, Forms.full_name).where(Forms.gender == "FEMALE").order_by(desc(case_xpr)
-                                                                                                    ).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.gender == "FEMALE").order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.gender == "FEMALE").order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all form ids where there is a record in table working_companies
-    elif filter_type == "working":
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(
-                begin > case_xpr, Forms.form_id.in_(select(WorkingCompanies.form_id))
-            ).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.form_id.in_(select(WorkingCompanies.form_id))).order_by(
-                asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is first request with filter "MALE"
-            query = select(Forms.form_id, Forms.full_name).where(
-                Forms.form_id.in_(select(WorkingCompanies.form_id))
-                ).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.form_id.in_(select(WorkingCompanies.form_id))).order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.form_id.in_(select(WorkingCompanies.form_id))).order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all form ids where there isn't any record in table working_companies
-    elif filter_type == "not_working":
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(
-                begin > case_xpr, Forms.form_id.not_in(select(WorkingCompanies.form_id))
-            ).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.form_id.not_in(select(WorkingCompanies.form_id))).order_by(
-                asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is first request with filter "MALE"
-            query = select(Forms.form_id, Forms.full_name).where(
-                Forms.form_id.not_in(select(WorkingCompanies.form_id))
-                ).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.form_id.not_in(select(WorkingCompanies.form_id))).order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.form_id.not_in(select(WorkingCompanies.form_id))).order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all rows where university_grade is 5 (5 means master)
-    elif filter_type == 5:
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(
-                begin > case_xpr, Forms.university_grade == 5).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.university_grade == 5).order_by(asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is the first request with filter 5
-            query = select(Forms.form_id, Forms.full_name).where(Forms.university_grade == 5).order_by(
-                desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.university_grade == 5).order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.university_grade == 5).order_by(desc(case_xpr))
-        )).scalar()
-
-    # Getting all rows where university_grade is equal to 1, 2, 3 or 4
-    else:
-        if action == "next":
-            query = select(Forms.form_id, Forms.full_name).where(
-                begin > case_xpr, Forms.university_grade == filter_type).order_by(desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        elif action == "previous":
-            subquery = select(Forms.form_id, Forms.full_name, case_xpr.label("reg_date")).where(
-                begin < case_xpr, Forms.university_grade == filter_type).order_by(asc(case_xpr)).limit(limit).subquery()
-            all_rows = (await session.execute(select(subquery.c.form_id, subquery.c.full_name).select_from(
-                subquery).order_by(desc(subquery.c.reg_date)))).all()
-        else:  # If it is first request with filter university grade 1 - 4
-            query = select(Forms.form_id, Forms.full_name).where(Forms.university_grade == filter_type).order_by(
-                desc(case_xpr)).limit(limit)
-            all_rows = (await session.execute(query)).all()
-        forms_dict = {}
-        for k, v in all_rows:
-            forms_dict[k] = v
-        if all_rows:
-            smallest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[-1][0])
-            )).scalar()
-            biggest_date = (await session.execute(
-                select(case_xpr).where(Forms.form_id == all_rows[0][0])
-            )).scalar()
-        else:
-            smallest_date = None
-            biggest_date = None
-        first_row_date = (await session.execute(
-            select(case_xpr).where(Forms.university_grade == filter_type).order_by(asc(case_xpr))
-        )).scalar()
-        last_row_date = (await session.execute(
-            select(case_xpr).where(Forms.university_grade == filter_type).order_by(desc(case_xpr))
-        )).scalar()
-
-    db_data = {"forms_dict": forms_dict, "smallest_date": smallest_date, "biggest_date": biggest_date,
-               "first_row_date": first_row_date, "last_row_date": last_row_date}
-    return db_data
+        return []
+    if filter_type == "male":
+        return [Forms.gender == "MALE"]
+    if filter_type == "female":
+        return [Forms.gender == "FEMALE"]
+    # EXISTS is planned as a semi or anti join on the primary key of working_companies, NOT IN can't be
+    # because of its NULL semantics
+    is_working = exists().where(WorkingCompanies.form_id == Forms.form_id)
+    if filter_type == "working":  # There is a record in table working_companies
+        return [is_working]
+    if filter_type == "not_working":
+        return [~is_working]
+    return [Forms.university_grade == filter_type]  # 1 - 4 or 5 (5 means master)
+
+
+def make_keyset_page_query(query: Select, keys: list, cursor: Optional[tuple] = None, backward: bool = False,
+                           limit: int = 10) -> Select:
+    """  Make the statement of get_keyset_page: one more row than the page and the is_behind column after a cursor  """
+    keys_tuple = tuple_(*keys)
+    if cursor is not None:
+        # One more column tells if there are rows on the other side of the cursor. The cursor row is counted,
+        # it may be the only row of the page the cursor was taken from
+        behind_condition = keys_tuple <= tuple_(*cursor) if backward else keys_tuple >= tuple_(*cursor)
+        behind_query = query.with_only_columns(literal(1)).where(behind_condition).limit(1).correlate(None)
+        ahead_condition = keys_tuple > tuple_(*cursor) if backward else keys_tuple < tuple_(*cursor)
+        query = query.add_columns(behind_query.exists().label("is_behind")).where(ahead_condition)
+    order = [asc(key) for key in keys] if backward else [desc(key) for key in keys]
+    # One more row than needed tells if there are rows ahead
+    return query.order_by(*order).limit(limit + 1)
+
+
+async def get_keyset_page(session: AsyncSession, query: Select, keys: list, cursor: Optional[tuple] = None,
+                          backward: bool = False, limit: int = 10) -> Page:
+    """
+    Get a page of rows of the query ordered by keys descending in one statement.
+    The page starts after the cursor, or ends before it if backward. The last key must be unique, so rows with equal
+    values of other keys are neither skipped nor repeated. The query must select all of the keys
+    """
+    rows = (await session.execute(make_keyset_page_query(query, keys, cursor, backward, limit))).all()
+    is_ahead = len(rows) > limit
+    rows = rows[:limit]
+    is_behind = rows[0].is_behind if cursor is not None and rows else cursor is not None
+    if backward:
+        rows.reverse()  # Reversing the result to the desc order
+    cursors = [tuple(row._mapping[key] for key in keys) for row in (rows[0], rows[-1])] if rows else [None, None]
+    return Page(rows=rows, has_next=is_behind if backward else is_ahead,
+                has_previous=is_ahead if backward else is_behind, first_cursor=cursors[0], last_cursor=cursors[1])
+
+
+FORMS_LIST_KEYS = [Forms.last_activity_at, Forms.form_id]
+
+
+def make_forms_list_query(filter_type: Optional[str] = None) -> Select:
+    """  Make a query of the admins' list of forms by the filter, it selects everything the list needs  """
+    return select(Forms.form_id, Forms.full_name, Forms.updated_at.is_not(None).label("is_updated"),
+                  Forms.last_activity_at).where(*make_forms_filter(filter_type))
+
+
+async def get_forms(session: AsyncSession, cursor: Optional[tuple] = None, action: str = "first",
+                    filter_type: Optional[str] = None, limit: int = 10) -> Page:
+    """  Get a page of forms by the filter ordered by the last registration or update time, newest first  """
+    # Everything the list needs is selected by one query, so a page of any size costs one statement
+    return await get_keyset_page(session, make_forms_list_query(filter_type), FORMS_LIST_KEYS,
+                                 cursor=cursor if action != "first" else None, backward=action == "previous",
+                                 limit=limit)
+
+
+def select_form_children(form_id: int):
+    """  Make a subquery of form's professions, languages and applications together:
+    kind of the row, its id (position), name and level  """
+    return union_all(
+        select(literal("profession").label("kind"), Professions.profession_id.label("position"),
+               Professions.title.label("name"), literal(None, SMALLINT).label("level")).join(
+            FormsProfessions, FormsProfessions.profession_id == Professions.profession_id
+        ).where(FormsProfessions.form_id == form_id),
+        select(literal("language"), Languages.language_id, Languages.name, Languages.level).where(
+            Languages.form_id == form_id),
+        select(literal("application"), Applications.application_id, Applications.name, Applications.level).where(
+            Applications.form_id == form_id)
+    ).subquery()
 
 
 async def get_form(session: AsyncSession, form_id) -> Form:
-    """  Get all data about form from database by its id  """
-    form = await session.scalar(select(Forms).where(Forms.form_id == form_id))
-    profession_ids = select(FormsProfessions.profession_id).where(FormsProfessions.form_id == form_id)
-    profession_titles = (await session.scalars(
-        select(Professions.title).where(Professions.profession_id.in_(profession_ids))
-    )).all()
-    direction_title = await session.scalar(
-        select(UniversityDirections.title).where(UniversityDirections.direction_id == form.direction_id)
-    )
-    company = (await session.execute(
-        select(WorkingCompanies.name, WorkingCompanies.position, ).where(WorkingCompanies.form_id == form_id))).all()
-    company = None if not company else company[0]  # If no data about company set None
-    languages = (await session.execute(
-        select(Languages.name, Languages.level).where(Languages.form_id == form_id))).all()
-    apps = (await session.execute(
-        select(Applications.name, Applications.level).where(Applications.form_id == form_id))).all()
-    user = await session.scalar(select(Users).where(Users.form_id == form_id))
+    """  Get all data about form from database by its id with two queries:
+    the form with its direction, company and user, then professions, languages and apps together  """
+    form = await session.scalar(select(Forms).where(Forms.form_id == form_id).options(
+        joinedload(Forms.direction), joinedload(Forms.company), joinedload(Forms.user)
+    ).execution_options(populate_existing=True))
+    children = select_form_children(form_id)
+    rows = (await session.execute(select(children).order_by(children.c.kind, children.c.position))).all()
+    profession_titles = [row.name for row in rows if row.kind == "profession"]
+    languages = [(row.name, row.level) for row in rows if row.kind == "language"]
+    apps = [(row.name, row.level) for row in rows if row.kind == "application"]
+    direction_title = form.direction.title if form.direction is not None else None
+    company = (form.company.name, form.company.position) if form.company is not None else None
+    user = form.user
 
     return Form(
         form.form_id, form.full_name, form.birth_date, form.gender, form.phonenum, profession_titles, form.address,
@@ -515,67 +388,180 @@ async def get_form(session: AsyncSession, form_id) -> Form:
         form.photo_id, form.registered_at, form.updated_at, user.telegram_name, user.username, user.telegram_id
     )
 
+
+async def get_rendered_form(session: AsyncSession, form_id: int, view: FormView) -> RenderedForm:
+    """  Get the rendered form from the forms cache, the form is loaded from database only on a miss  """
+    rendered = await forms_cache.get(form_id, view.value)
+    if rendered is None:
+        version = forms_cache.version()
+        form = await get_form(session, form_id)
+        rendered = RenderedForm(text=render_form(form, view), photo_id=form.photo_id,
+                                version=(form.updated_at or form.registered_at).isoformat())
+        await forms_cache.set(form_id, view.value, rendered, version)
+    return rendered
+
 # =========================================Functions to work with table Forms========================================= #
 
 
+# ---------------------------------------Functions to work with table DailyStats-------------------------------------- #
+
+STATS_PERIODS = {"one_day": timedelta(days=1), "one_week": timedelta(days=7), "one_month": timedelta(days=30),
+                 "half_year": timedelta(days=183), "one_year": timedelta(days=365)}
+
+
+async def increment_daily_stat(session: AsyncSession, metric: StatsMetricsEnum, day: Optional[date] = None,
+                               delta: int = 1):
+    """  Add delta to the metric of the day (today by default), not committing, so it is saved with the change  """
+    query = pg_insert(DailyStats).values(day=day if day is not None else func.current_date(), metric=metric,
+                                         count=delta)
+    query = query.on_conflict_do_update(index_elements=[DailyStats.day, DailyStats.metric],
+                                        set_={"count": DailyStats.count + query.excluded.count})
+    await session.execute(query)
+
+
 async def get_stats(session: AsyncSession):
     """  Get statistics of users and forms, exactly,
     count of registered users, registered forms and updated forms in periods:
-    last day, last week, last month, last half year, last year, all time  """
-    users_all_time = await session.scalar(select(func.count(Users.telegram_id)))
-    users_one_day = await session.scalar(
-        select(func.count(Users.telegram_id)).where(Users.registered_at >= datetime.now() - timedelta(hours=24))
-    )
-    users_one_week = await session.scalar(
-        select(func.count(Users.telegram_id)).where(Users.registered_at >= datetime.now() - timedelta(days=7))
-    )
-    users_one_month = await session.scalar(
-        select(func.count(Users.telegram_id)).where(Users.registered_at >= datetime.now() - timedelta(days=30))
-    )
-    users_half_year = await session.scalar(
-        select(func.count(Users.telegram_id)).where(Users.registered_at >= datetime.now() - timedelta(days=183))
-    )
-    users_one_year = await session.scalar(
-        select(func.count(Users.telegram_id)).where(Users.registered_at >= datetime.now() - timedelta(days=365))
-    )
-    forms_all_time = await session.scalar(select(func.count(Forms.form_id)))
-    forms_one_day = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.registered_at >= datetime.now() - timedelta(hours=24))
-    )
-    forms_one_week = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.registered_at >= datetime.now() - timedelta(days=7))
-    )
-    forms_one_month = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.registered_at >= datetime.now() - timedelta(days=30))
-    )
-    forms_half_year = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.registered_at >= datetime.now() - timedelta(days=183))
-    )
-    forms_one_year = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.registered_at >= datetime.now() - timedelta(days=365))
-    )
-    updated_forms_all_time = await session.scalar(select(func.count(Forms.form_id)).where(
-        Forms.updated_at.is_not(None)))
-    updated_forms_one_day = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.updated_at >= datetime.now() - timedelta(hours=24))
-    )
-    updated_forms_one_week = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.updated_at >= datetime.now() - timedelta(days=7))
-    )
-    updated_forms_one_month = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.updated_at >= datetime.now() - timedelta(days=30))
-    )
-    updated_forms_half_year = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.updated_at >= datetime.now() - timedelta(days=183))
-    )
-    updated_forms_one_year = await session.scalar(
-        select(func.count(Forms.form_id)).where(Forms.updated_at >= datetime.now() - timedelta(days=365))
-    )
-    stats = {"users_all_time": users_all_time, "users_one_day": users_one_day, "users_one_week": users_one_week,
-             "users_one_month": users_one_month, "users_half_year": users_half_year, "users_one_year": users_one_year,
-             "forms_all_time": forms_all_time, "forms_one_day": forms_one_day, "forms_one_week": forms_one_week,
-             "forms_one_month": forms_one_month, "forms_half_year": forms_half_year, "forms_one_year": forms_one_year,
-             "updated_forms_all_time": updated_forms_all_time, "updated_forms_one_day": updated_forms_one_day,
-             "updated_forms_one_week": updated_forms_one_week, "updated_forms_one_month": updated_forms_one_month,
-             "updated_forms_half_year": updated_forms_half_year, "updated_forms_one_year": updated_forms_one_year}
+    last day, last week, last month, last half year, last year, all time.
+    Periods are whole days including today, counts are summed from table daily_stats.
+    Today is taken from database, the same as days of the rows  """
+    query = select(
+        DailyStats.metric,
+        func.coalesce(func.sum(DailyStats.count), 0).label("all_time"),
+        *(func.coalesce(func.sum(DailyStats.count).filter(DailyStats.day > func.current_date() - period.days), 0)
+          .label(name) for name, period in STATS_PERIODS.items())
+    ).group_by(DailyStats.metric)
+    rows = {row.metric: row for row in (await session.execute(query)).all()}
+    stats = {}
+    for metric in StatsMetricsEnum:
+        row = rows.get(metric)
+        for name in ["all_time", *STATS_PERIODS]:
+            stats[f"{metric.value.lower()}_{name}"] = getattr(row, name) if row is not None else 0
     return stats
+
+
+async def rebuild_daily_stats(session: AsyncSession):
+    """  Recount table daily_stats from tables users and forms  """
+    def counts_by_day(column, metric: StatsMetricsEnum, *conditions):
+        day = cast(column, DATE)
+        # Cast, otherwise the metric is sent as text and can't be inserted to the enum column
+        metric_value = cast(literal(metric, DailyStats.metric.type), DailyStats.metric.type)
+        return select(day, metric_value, func.count()).where(*conditions).group_by(day)
+
+    await session.execute(delete(DailyStats))
+    await session.execute(insert(DailyStats).from_select(["day", "metric", "count"], union_all(
+        counts_by_day(Users.registered_at, StatsMetricsEnum.USERS),
+        counts_by_day(Forms.registered_at, StatsMetricsEnum.FORMS),
+        counts_by_day(Forms.updated_at, StatsMetricsEnum.UPDATED_FORMS, Forms.updated_at.is_not(None))
+    )))
+    await session.commit()
+
+
+# =======================================Functions to work with table DailyStats====================================== #
+
+
+# -----------------------------------Functions to work with table MailingJobs----------------------------------------- #
+
+async def add_mailing_job(session: AsyncSession, admin_id: int, from_chat_id: int, message_id: int,
+                          target_category: str, target, target_text: Optional[str] = None) -> int:
+    """  Create a mailing job and fill its recipients list with one INSERT ... SELECT  """
+    job_id = await session.scalar(insert(MailingJobs).values(
+        admin_id=admin_id, from_chat_id=from_chat_id, message_id=message_id, target_text=target_text
+    ).returning(MailingJobs.job_id))
+    user_ids = make_users_filter_query(target_category, target).where(Users.telegram_id != admin_id).subquery()
+    result = await session.execute(insert(MailingRecipients).from_select(
+        ["job_id", "telegram_id"], select(literal(job_id), user_ids.c.telegram_id)
+    ))
+    await session.execute(update(MailingJobs).where(MailingJobs.job_id == job_id).values(total=result.rowcount))
+    await session.commit()
+    return job_id
+
+
+async def get_mailing_job(session: AsyncSession, job_id: int) -> Optional[MailingJobs]:
+    """  Get a mailing job by its id  """
+    return await session.get(MailingJobs, job_id, populate_existing=True)
+
+
+async def get_mailing_jobs(session: AsyncSession, statuses: Optional[list] = None, limit: int = 10):
+    """  Get the latest mailing jobs, optionally only the ones in given statuses  """
+    query = select(MailingJobs).order_by(desc(MailingJobs.job_id)).limit(limit)
+    if statuses:
+        query = query.where(MailingJobs.status.in_(statuses))
+    return (await session.scalars(query)).all()
+
+
+async def set_mailing_job_status(session: AsyncSession, job_id: int, status: MailingStatusesEnum,
+                                 from_statuses: list) -> bool:
+    """  Change status of a mailing job if it is currently in one of 'from_statuses'  """
+    values = {"status": status}
+    if status in (MailingStatusesEnum.CANCELLED, MailingStatusesEnum.DONE):
+        values["finished_at"] = func.now()
+    result = await session.execute(update(MailingJobs).where(
+        MailingJobs.job_id == job_id, MailingJobs.status.in_(from_statuses)).values(**values))
+    await session.commit()
+    return result.rowcount > 0
+
+
+async def claim_mailing_recipients(session: AsyncSession, job_id: int, limit: int) -> list[int]:
+    """  Mark next pending recipients of the job as being sent and return their ids.
+    Rows locked by another worker are skipped, so several workers can process one job  """
+    pending = select(MailingRecipients.telegram_id).where(
+        MailingRecipients.job_id == job_id, MailingRecipients.status == RecipientStatusesEnum.PENDING
+    ).limit(limit).with_for_update(skip_locked=True)
+    result = await session.scalars(update(MailingRecipients).where(
+        MailingRecipients.job_id == job_id, MailingRecipients.telegram_id.in_(pending)
+    ).values(status=RecipientStatusesEnum.SENDING, updated_at=func.now()).returning(MailingRecipients.telegram_id))
+    user_ids = result.all()
+    await session.commit()
+    return user_ids
+
+
+async def save_mailing_progress(session: AsyncSession, job_id: int, sent_ids: list[int], failed: dict[int, str]):
+    """  Checkpoint the result of a sent batch: recipients' statuses and job counters  """
+    if sent_ids:
+        await session.execute(update(MailingRecipients).where(
+            MailingRecipients.job_id == job_id, MailingRecipients.telegram_id.in_(sent_ids)
+        ).values(status=RecipientStatusesEnum.SENT, updated_at=func.now()))
+    errors = {}
+    for user_id, error in failed.items():
+        errors.setdefault(error[:255], []).append(user_id)
+    for error, user_ids in errors.items():
+        await session.execute(update(MailingRecipients).where(
+            MailingRecipients.job_id == job_id, MailingRecipients.telegram_id.in_(user_ids)
+        ).values(status=RecipientStatusesEnum.FAILED, error=error, updated_at=func.now()))
+    await session.execute(update(MailingJobs).where(MailingJobs.job_id == job_id).values(
+        sent=MailingJobs.sent + len(sent_ids), failed=MailingJobs.failed + len(failed)))
+    await session.commit()
+
+
+async def release_mailing_recipients(session: AsyncSession, job_id: int, user_ids: list[int]):
+    """  Return claimed but not sent recipients back to the queue  """
+    if user_ids:
+        await session.execute(update(MailingRecipients).where(
+            MailingRecipients.job_id == job_id, MailingRecipients.telegram_id.in_(user_ids)
+        ).values(status=RecipientStatusesEnum.PENDING, updated_at=func.now()))
+        await session.commit()
+
+
+async def reset_stale_mailing_recipients(session: AsyncSession, older_than: timedelta):
+    """  Return recipients claimed by a crashed worker back to the queue  """
+    # The cutoff is computed by the database, which also stamps updated_at, so clocks of app hosts don't matter
+    await session.execute(update(MailingRecipients).where(
+        MailingRecipients.status == RecipientStatusesEnum.SENDING,
+        MailingRecipients.updated_at < func.now() - older_than
+    ).values(status=RecipientStatusesEnum.PENDING))
+    await session.commit()
+
+
+async def finish_mailing_job(session: AsyncSession, job_id: int) -> bool:
+    """  Mark the job as done if it has no recipients left to send. Return True if job was finished now  """
+    unfinished = select(MailingRecipients.telegram_id).where(
+        MailingRecipients.job_id == job_id,
+        MailingRecipients.status.in_([RecipientStatusesEnum.PENDING, RecipientStatusesEnum.SENDING]))
+    result = await session.execute(update(MailingJobs).where(
+        MailingJobs.job_id == job_id, MailingJobs.status == MailingStatusesEnum.RUNNING, ~unfinished.exists()
+    ).values(status=MailingStatusesEnum.DONE, finished_at=func.now()))
+    await session.commit()
+    return result.rowcount > 0
+
+# ===================================Functions to work with table MailingJobs========================================= #
@@ -1,6 +1,9 @@
 import enum
 
-from sqlalchemy import Column, BIGINT, SMALLINT, VARCHAR, TEXT, TIMESTAMP, DATE, ForeignKey, BOOLEAN, func, Enum
+from sqlalchemy import Column, BIGINT, SMALLINT, INTEGER, VARCHAR, TEXT, TIMESTAMP, DATE, ForeignKey, BOOLEAN, func, \
+    Enum, Index
+from sqlalchemy.orm import relationship
+
 from .base import Base
 
 
@@ -21,6 +24,26 @@ class WorkingStylesEnum(enum.Enum):
     INDIVIDUAL = "INDIVIDUAL"
 
 
+class MailingStatusesEnum(enum.Enum):
+    RUNNING = "RUNNING"
+    PAUSED = "PAUSED"
+    CANCELLED = "CANCELLED"
+    DONE = "DONE"
+
+
+class RecipientStatusesEnum(enum.Enum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class StatsMetricsEnum(enum.Enum):
+    USERS = "USERS"
+    FORMS = "FORMS"
+    UPDATED_FORMS = "UPDATED_FORMS"
+
+
 # Creating database tables
 class UniversityDirections(Base):
     __tablename__ = "university_directions"
@@ -49,8 +72,29 @@ class Forms(Base):
     positive_assessment = Column(TEXT, nullable=False)
     negative_assessment = Column(TEXT, nullable=False)
     photo_id = Column(TEXT, nullable=False)
-    registered_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
-    updated_at = Column(TIMESTAMP, nullable=True)
+    registered_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(TIMESTAMP, nullable=True, index=True)
+    # Time of the last registration or update, the admins' list of forms is ordered by it
+    last_activity_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    # The admins' list of forms is filtered by gender or grade and ordered by the last activity, mailings are
+    # filtered by gender, grade, direction or working style
+    __table_args__ = (
+        Index("ix_forms_last_activity_at_form_id", last_activity_at.desc(), form_id.desc()),
+        Index("ix_forms_gender_last_activity_at_form_id", gender, last_activity_at.desc(), form_id.desc()),
+        Index("ix_forms_university_grade_last_activity_at_form_id", university_grade, last_activity_at.desc(),
+              form_id.desc()),
+        Index("ix_forms_direction_id", direction_id),
+        Index("ix_forms_working_style", working_style),
+    )
+
+    # Relationships are never loaded implicitly, use loader options (joinedload, selectinload) in queries
+    direction = relationship("UniversityDirections", lazy="raise")
+    professions = relationship("Professions", secondary="forms_professions", order_by="Professions.profession_id",
+                               lazy="raise")
+    company = relationship("WorkingCompanies", uselist=False, lazy="raise")
+    languages = relationship("Languages", order_by="Languages.language_id", lazy="raise")
+    applications = relationship("Applications", order_by="Applications.application_id", lazy="raise")
+    user = relationship("Users", uselist=False, back_populates="form", lazy="raise")
 
 
 class Professions(Base):
@@ -100,4 +144,41 @@ class Users(Base):
     username = Column(VARCHAR(255), nullable=True)
     telegram_name = Column(VARCHAR(255), nullable=False)
     form_id = Column(SMALLINT, ForeignKey("forms.form_id", ondelete="SET NULL"), unique=True, nullable=True)
-    registered_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    registered_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+    form = relationship("Forms", back_populates="user", lazy="raise")
+
+
+class MailingJobs(Base):
+    __tablename__ = "mailing_jobs"
+
+    job_id = Column(INTEGER, primary_key=True, autoincrement=True)
+    admin_id = Column(BIGINT, nullable=False)
+    from_chat_id = Column(BIGINT, nullable=False)
+    message_id = Column(BIGINT, nullable=False)
+    target_text = Column(TEXT, nullable=True)
+    status = Column(Enum(MailingStatusesEnum), server_default="RUNNING", nullable=False)
+    total = Column(INTEGER, server_default="0", nullable=False)
+    sent = Column(INTEGER, server_default="0", nullable=False)
+    failed = Column(INTEGER, server_default="0", nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    finished_at = Column(TIMESTAMP, nullable=True)
+
+
+class MailingRecipients(Base):
+    __tablename__ = "mailing_recipients"
+    __table_args__ = (Index("ix_mailing_recipients_job_id_status", "job_id", "status"),)
+
+    job_id = Column(INTEGER, ForeignKey("mailing_jobs.job_id", ondelete="CASCADE"), primary_key=True)
+    telegram_id = Column(BIGINT, primary_key=True)
+    status = Column(Enum(RecipientStatusesEnum), server_default="PENDING", nullable=False)
+    error = Column(VARCHAR(255), nullable=True)
+    updated_at = Column(TIMESTAMP, nullable=True)
+
+
+class DailyStats(Base):  # Counts of registered users, registered and updated forms by days
+    __tablename__ = "daily_stats"
+
+    day = Column(DATE, primary_key=True)
+    metric = Column(Enum(StatsMetricsEnum), primary_key=True)
+    count = Column(INTEGER, server_default="0", nullable=False)
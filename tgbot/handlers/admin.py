@@ -1,12 +1,10 @@
-from datetime import datetime
 from contextlib import suppress
-from asyncio import sleep as asleep
 
 from aiogram import Router, Bot, F
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, InlineKeyboardMarkup
-from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
+from aiogram.exceptions import TelegramBadRequest
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,16 +12,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from tgbot.config import Config
 from tgbot.database.functions.functions import (add_profession, get_professions, get_profession, delete_profession,
                                                 get_directions, delete_direction, add_direction, get_direction,
-                                                get_form, get_user_ids_by_filter, get_stats)
-from tgbot.database.models.models import NationsEnum, GendersEnum, WorkingStylesEnum, Users, Forms, UniversityDirections
+                                                get_rendered_form, get_stats, add_mailing_job, get_mailing_jobs,
+                                                set_mailing_job_status)
+from tgbot.database.models.models import Users, Forms, UniversityDirections, MailingJobs, MailingStatusesEnum
 from tgbot.keyboards.inline import (cancel_keyboard, raw_true_false_keyboard, make_directions_keyboard,
                                     make_professions_keyboard_for_admin, admin_functions, make_forms_keyboard,
                                     filter_categories_keyboard, menu_navigation_keyboard, genders_keyboard,
-                                    university_grades_keyboard, working_style_keyboard)
+                                    university_grades_keyboard, working_style_keyboard, make_mailing_jobs_keyboard)
 from tgbot.keyboards.reply import make_menu_keyboard
 from tgbot.misc.cbdata import MainCallbackFactory
+from tgbot.misc.form_renderer import FormView
 from tgbot.misc.filters import AdminFilter
 from tgbot.misc.states import ProfessionStates, DirectionStates, AdminStates
+from tgbot.misc.cleanup import deletion_scheduler
 
 flags = {"throttling_key": "default"}
 admin_router = Router()
@@ -72,8 +73,7 @@ async def incorrect_title_alert(message: Message, bot: Bot):
                                          "1. Lotincha xarflardan iborat bo'lishi\n"
                                          "2. 1ta belgidan ko'p bo'lishi va 32ta belgidan kam bo'lishi\n"
                                          "3. Mumkin bo'lgan simvollar:  <code>. / - '</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.data == 1), ProfessionStates.waiting_for_confirmation)
@@ -253,8 +253,7 @@ async def incorrect_title_alert(message: Message, bot: Bot):
         "1. Lotincha xarflardan iborat bo'lishi\n"
         "2. 1ta belgidan ko'p bo'lishi va 64ta belgidan kam bo'lishi\n"
         "3. Mumkin bo'lgan simvollar:  <code>. / - '</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.data == 1), DirectionStates.waiting_for_confirmation)
@@ -398,6 +397,12 @@ async def show_admin_functions(message: Message, state: FSMContext):
     await state.update_data(function_message_id=function_message.message_id)
 
 
+async def delete_sent_forms(chat_id: int, sent_forms: list):
+    """  Delete messages of the forms the admin viewed in the background, so leaving the list answers immediately  """
+    await deletion_scheduler.schedule_many(
+        [(chat_id, message_id) for form_message_ids in sent_forms for message_id in form_message_ids], delay=0)
+
+
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "home"), AdminStates())
 async def go_home(call: CallbackQuery, bot: Bot, state: FSMContext, session: AsyncSession, config: Config):
     """  Return to main menu  """
@@ -406,10 +411,7 @@ async def go_home(call: CallbackQuery, bot: Bot, state: FSMContext, session: Asy
     current_state = await state.get_state()
     menu_keyboard = await make_menu_keyboard(session, call.from_user.id, config)
     if current_state == "AdminStates:forms":
-        sent_forms = state_data["sent_forms"]
-        for form_id, photo_id in sent_forms:
-            await bot.delete_message(chat_id=call.message.chat.id, message_id=form_id)
-            await bot.delete_message(chat_id=call.message.chat.id, message_id=photo_id)
+        await delete_sent_forms(call.message.chat.id, state_data["sent_forms"])
     try:
         await bot.delete_message(chat_id=call.message.chat.id, message_id=state_data["function_message_id"])
     except TelegramBadRequest:
@@ -427,14 +429,17 @@ async def go_back_from_forms(call: CallbackQuery, bot: Bot, state: FSMContext):
     await call.answer(cache_time=1)
     await state.set_state(AdminStates.admin_mode)
     state_data = await state.get_data()
-    sent_forms = state_data["sent_forms"]
-    for form_id, photo_id in sent_forms:
-        await bot.delete_message(chat_id=call.message.chat.id, message_id=form_id)
-        await bot.delete_message(chat_id=call.message.chat.id, message_id=photo_id)
+    await delete_sent_forms(call.message.chat.id, state_data["sent_forms"])
+    await state.update_data(sent_forms=[])
     await bot.edit_message_text(text="Mavjud funktsiyalar:", chat_id=call.message.chat.id,
                                 message_id=state_data["function_message_id"], reply_markup=admin_functions)
 
 
+def make_forms_page_state(forms_page: dict, keyboard_data: dict) -> dict:
+    """  Make a compact state of the forms list: request of the shown page and cursors of its first and last rows  """
+    return {**forms_page, "first_cursor": keyboard_data["first_cursor"], "last_cursor": keyboard_data["last_cursor"]}
+
+
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "show_forms"), AdminStates.admin_mode)
 async def send_form_list(call: CallbackQuery, bot: Bot, state: FSMContext, session: AsyncSession):
     """  Send a list of forms and names of its owners to admin
@@ -442,14 +447,13 @@ async def send_form_list(call: CallbackQuery, bot: Bot, state: FSMContext, sessi
     await call.answer(cache_time=1)
     await state.set_state(AdminStates.forms)
     state_data = await state.get_data()
-    keyboard_data = await make_forms_keyboard(session)
-    # Converting from JSON to InlineKeyboardMarkup
-    forms_keyboard = InlineKeyboardMarkup.parse_raw(keyboard_data["keyboard"])
+    forms_page = {"cursor": None, "action": "first", "filter_type": None, "counter": 0}
+    keyboard_data = await make_forms_keyboard(session, **forms_page)
     await bot.edit_message_text(chat_id=call.message.chat.id, message_id=state_data["function_message_id"],
-                                text=keyboard_data["text"], reply_markup=forms_keyboard)
+                                text=keyboard_data["text"], reply_markup=keyboard_data["keyboard"])
     # We will use empty list "sent_forms" soon to save ids of sent forms messages
     # to delete them when we are leaving from state "AdminStates:forms"
-    await state.update_data(sent_forms=[], keyboard_data=keyboard_data, filter_type=None)
+    await state.update_data(sent_forms=[], forms_page=make_forms_page_state(forms_page, keyboard_data))
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "filter"), AdminStates.forms)
@@ -476,11 +480,11 @@ async def filter_sent_forms(call: CallbackQuery, bot: Bot, state: FSMContext, ca
         next_filter = 4
     elif callback_data.data == 4:
         next_filter = 5
-    keyboard_data = await make_forms_keyboard(session, filter_type=next_filter)
-    forms_keyboard = InlineKeyboardMarkup.parse_raw(keyboard_data["keyboard"])
+    forms_page = {"cursor": None, "action": "first", "filter_type": next_filter, "counter": 0}
+    keyboard_data = await make_forms_keyboard(session, **forms_page)
     await bot.edit_message_text(chat_id=call.message.chat.id, message_id=state_data["function_message_id"],
-                                text=keyboard_data["text"], reply_markup=forms_keyboard)
-    await state.update_data(keyboard_data=keyboard_data, filter_type=next_filter)
+                                text=keyboard_data["text"], reply_markup=keyboard_data["keyboard"])
+    await state.update_data(forms_page=make_forms_page_state(forms_page, keyboard_data))
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "next"), AdminStates.forms)
@@ -488,14 +492,13 @@ async def send_next_form_list(call: CallbackQuery, bot: Bot, state: FSMContext,
                               callback_data: MainCallbackFactory):
     await call.answer(cache_time=1)
     state_data = await state.get_data()
-    old_keyboard_data = state_data["keyboard_data"]
-    begin = datetime.fromtimestamp(old_keyboard_data["smallest_date"])
-    keyboard_data = await make_forms_keyboard(session, begin=begin, action="next", counter=callback_data.counter,
-                                              filter_type=state_data["filter_type"])
-    forms_keyboard = InlineKeyboardMarkup.parse_raw(keyboard_data["keyboard"])
+    old_forms_page = state_data["forms_page"]
+    forms_page = {"cursor": old_forms_page["last_cursor"], "action": "next",
+                  "filter_type": old_forms_page["filter_type"], "counter": callback_data.counter}
+    keyboard_data = await make_forms_keyboard(session, **forms_page)
     await bot.edit_message_text(chat_id=call.message.chat.id, message_id=state_data["function_message_id"],
-                                text=keyboard_data["text"], reply_markup=forms_keyboard)
-    await state.update_data(keyboard_data=keyboard_data)
+                                text=keyboard_data["text"], reply_markup=keyboard_data["keyboard"])
+    await state.update_data(forms_page=make_forms_page_state(forms_page, keyboard_data))
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "previous"), AdminStates.forms)
@@ -503,16 +506,15 @@ async def send_previous_form_list(call: CallbackQuery, bot: Bot, state: FSMConte
                                   callback_data: MainCallbackFactory):
     await call.answer(cache_time=1)
     state_data = await state.get_data()
-    old_keyboard_data = state_data["keyboard_data"]
-    begin = datetime.fromtimestamp(old_keyboard_data["biggest_date"])
+    old_forms_page = state_data["forms_page"]
     # Cause of this condition is to make a correct counter when user goes back to previous list of forms
     counter = ((callback_data.counter - 1) // 10 - 1) * 10 if callback_data.counter >= 20 else 0
-    keyboard_data = await make_forms_keyboard(session, begin=begin, action="previous", counter=counter,
-                                              filter_type=state_data["filter_type"])
-    forms_keyboard = InlineKeyboardMarkup.parse_raw(keyboard_data["keyboard"])
+    forms_page = {"cursor": old_forms_page["first_cursor"], "action": "previous",
+                  "filter_type": old_forms_page["filter_type"], "counter": counter}
+    keyboard_data = await make_forms_keyboard(session, **forms_page)
     await bot.edit_message_text(chat_id=call.message.chat.id, message_id=state_data["function_message_id"],
-                                text=keyboard_data["text"], reply_markup=forms_keyboard)
-    await state.update_data(keyboard_data=keyboard_data)
+                                text=keyboard_data["text"], reply_markup=keyboard_data["keyboard"])
+    await state.update_data(forms_page=make_forms_page_state(forms_page, keyboard_data))
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "select"), AdminStates.forms)
@@ -520,76 +522,16 @@ async def show_form(call: CallbackQuery, bot: Bot, state: FSMContext, session: A
                     callback_data: MainCallbackFactory):
     await call.answer(cache_time=1)
     state_data = await state.get_data()
-    form = await get_form(session, callback_data.data)
-    gender = 'Erkak' if form.gender == GendersEnum.MALE else 'Ayol'
-    professions = "Mavjud emas!" if not form.professions else ', '.join(form.professions)
-    nation = "O'zbek"
-    if form.nation == NationsEnum.RUSSIAN:
-        nation = "Rus"
-    elif form.nation == NationsEnum.OTHER:
-        nation = "Boshqa"
-
-    university_grade = 'Magistr' if form.university_grade == 5 else form.university_grade
-    university_direction = form.direction.capitalize() if form.direction is not None else "Ma'lumotlar bazasidan o'chirilgan!"
-    working_company = "Mavjud emas!" if not form.working_company else f"\n    <b>Nomi:</b> {form.working_company[0]}" \
-                                                                      f"\n    <b>Lavozimi:</b> {form.working_company[1]}"
-    driver_license = "Bor" if form.driver_license else "Yo'q"
-    languages = ""
-    for i in form.languages:
-        languages += f"    <b>{i[0]}:</b> {i[1]}%\n"
-
-    apps = ""
-    for i in form.apps:
-        apps += f"    <b>{i[0]}:</b> {i[1]}%\n"
-
-    working_style = 'Jamoada' if form.working_style == WorkingStylesEnum.COLLECTIVE else 'Individual'
-    salary = "1 - 2 milion so'm"
-    if form.wanted_salary == 2:
-        salary = "3 - 4 million so'm"
-    elif form.wanted_salary == 3:
-        salary = "5 million so'm va undan yuqori"
-
-    username = "Mavjud emas!" if form.username is None else f"@{form.username}"
-    registered_at = f"{form.registered_at.day}.{form.registered_at.month}.{form.registered_at.year} " \
-        f"{form.registered_at.hour}:{form.registered_at.minute}:{form.registered_at.second}"
-    updated_at = "\n" if not form.updated_at else \
-        f"\n<b>Yangilangan vaqt:</b> " \
-        f"{form.updated_at.day}.{form.updated_at.month}.{form.updated_at.year} " \
-        f"{form.updated_at.hour}:{form.updated_at.minute}:{form.updated_at.second}"
-
-    form_text = f"<b>Ism va Familiya:</b> {form.full_name}\n" \
-                f"<b>Tug'ilgan sana:</b> {form.birth_date.day}.{form.birth_date.month}.{form.birth_date.year}\n" \
-                f"<b>Jins:</b> {gender}\n" \
-                f"<b>Telefon raqam:</b> {form.phonenum}\n" \
-                f"<b>Qiziqtirgan sohalar:</b> {professions}\n" \
-                f"<b>Yashash manzil:</b> {form.address}\n" \
-                f"<b>Millat:</b> {nation}\n" \
-                f"<b>Kurs:</b> {university_grade}\n" \
-                f"<b>Ta'lim yo'nalishi:</b> {university_direction}\n" \
-                f"<b>Ish o'rni:</b> {working_company}\n" \
-                f"<b>Oilaviy ahvol:</b> {'Turmush qurgan' if form.marital_status else 'Turmush qurmagan'}\n" \
-                f"<b>Haydovchilik guvohnomasi:</b> {driver_license}\n" \
-                f"<b>Tillar:</b>\n" \
-                f"{languages}" \
-                f"<b>Dasturlar:</b>\n" \
-                f"{apps}" \
-                f"<b>Ishlash uslubi:</b> {working_style}\n" \
-                f"<b>Oylik maoshi:</b> {salary}\n" \
-                f"<b>Ijobiy ta'rif:</b> {form.positive_assessment}\n" \
-                f"<b>Salbiy ta'rif:</b> {form.negative_assessment}\n" \
-                f"<b>Telegramdagi ismi:</b> {form.telegram_name}\n" \
-                f"<b>Telegramdagi nomi:</b> {username}\n" \
-                f"<b>Telegram ID:</b> {form.telegram_id}\n" \
-                f"<b>Tuzilgan vaqt:</b> {registered_at}" \
-                f"{updated_at}"
-    old_keyboard_data = state_data["keyboard_data"]
-    old_forms_keyboard = InlineKeyboardMarkup.parse_raw(old_keyboard_data["keyboard"])
+    form = await get_rendered_form(session, callback_data.data, view=FormView.ADMIN)
+    forms_page = state_data["forms_page"]
+    # The same page is rebuilt from the cache by the request saved in the state
+    keyboard_data = await make_forms_keyboard(session, cursor=forms_page["cursor"], action=forms_page["action"],
+                                              filter_type=forms_page["filter_type"], counter=forms_page["counter"])
     await bot.delete_message(chat_id=call.message.chat.id, message_id=state_data["function_message_id"])
     form_photo_message = await call.message.answer_photo(photo=form.photo_id)
-    form_message = await bot.send_message(text=form_text, chat_id=call.message.chat.id,
+    form_message = await bot.send_message(text=form.text, chat_id=call.message.chat.id,
                                           reply_to_message_id=form_photo_message.message_id)
-    function_message = await call.message.answer(text=old_keyboard_data["text"],
-                                                 reply_markup=old_forms_keyboard)
+    function_message = await call.message.answer(text=keyboard_data["text"], reply_markup=keyboard_data["keyboard"])
     sent_forms = state_data["sent_forms"]
     sent_forms.append((form_message.message_id, form_photo_message.message_id))
     await state.update_data(sent_forms=sent_forms, function_message_id=function_message.message_id)
@@ -710,8 +652,7 @@ async def ask_mailing_text_for_user(message: Message, bot: Bot, state: FSMContex
         user_data = query.all()[0]
     except IndexError:
         alert_message = await message.answer("<b>Bunday ID raqamli foydalanuvchi ma'lumotlar bazasida yo'q!</b>")
-        await asleep(5)
-        await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+        await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=5)
         return
     await state.set_state(AdminStates.mailing_text)
     full_name = await session.scalar(select(Forms.full_name).where(Forms.form_id == user_data[3]))
@@ -791,40 +732,21 @@ async def cancel_mailing(call: CallbackQuery, bot: Bot, state: FSMContext):
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.data == 1), AdminStates.mailing_confirm)
-async def complete_mailing(call: CallbackQuery, bot: Bot, state: FSMContext, session: AsyncSession):
+async def complete_mailing(call: CallbackQuery, state: FSMContext, session: AsyncSession):
+    """  Put the mailing into the queue, the mailing worker will send it in background  """
     await call.answer(cache_time=1)
     state_data = await state.get_data()
     target_category = state_data["filter_category"]
-    target = state_data["target"]
-    if target_category == "one_user":
-        user_ids = [state_data["target_user_id"]]
-    else:
-        user_ids = await get_user_ids_by_filter(session, target_category, target)
-    counter = 0
-    try:
-        for user_id in user_ids:
-            if user_id == call.from_user.id:
-                continue
-            with suppress(TelegramBadRequest, TelegramForbiddenError):
-                await bot.copy_message(chat_id=user_id, from_chat_id=call.message.chat.id,
-                                       message_id=state_data["copied_message_id"])
-                counter += 1
-    except Exception as error:
-        await call.message.answer(text=f"Xato! Dasturchiga murojat qiling!\n{error}")
-        await bot.delete_message(chat_id=call.message.chat.id, message_id=state_data["copied_message_id"])
-        await bot.delete_message(chat_id=call.message.chat.id, message_id=state_data["filter_message_id"])
-        await bot.delete_message(chat_id=call.message.chat.id, message_id=state_data["function_title_message_id"])
-        await state.clear()
-        function_message = await call.message.edit_text("Mavjud funktsiyalar:", reply_markup=admin_functions)
-        await state.set_state(AdminStates.admin_mode)
-        await state.update_data(function_message_id=function_message.message_id)
-    else:
-        await call.message.edit_reply_markup()
-        await call.message.answer(f"E'lon {counter} kishiga muvaffaqiyatli jo'natildi\U0001F389")
-        function_message = await call.message.answer("Mavjud funktsiyalar:", reply_markup=admin_functions)
-        await state.clear()
-        await state.set_state(AdminStates.admin_mode)
-        await state.update_data(function_message_id=function_message.message_id)
+    target = state_data["target_user_id"] if target_category == "one_user" else state_data["target"]
+    job_id = await add_mailing_job(session, admin_id=call.from_user.id, from_chat_id=call.message.chat.id,
+                                   message_id=state_data["copied_message_id"], target_category=target_category,
+                                   target=target, target_text=state_data["filter_text"])
+    await call.message.edit_text(f"E'lon #{job_id} navbatga qo'yildi\U0001F389\n"
+                                 f"Jarayonni \"Jo'natmalar\" bo'limida kuzatishingiz mumkin.")
+    function_message = await call.message.answer("Mavjud funktsiyalar:", reply_markup=admin_functions)
+    await state.clear()
+    await state.set_state(AdminStates.admin_mode)
+    await state.update_data(function_message_id=function_message.message_id)
 
 
 @admin_router.callback_query(MainCallbackFactory.filter(F.action == "back"), AdminStates.mailing_target_categories)
@@ -849,6 +771,69 @@ async def go_back_from_mailing(call: CallbackQuery, bot: Bot, state: FSMContext)
             chat_id=call.message.chat.id, message_id=state_data["function_message_id"],
             reply_markup=filter_categories_keyboard)
 
+
+def make_mailing_jobs_text(jobs: list[MailingJobs]) -> str:
+    """  Make a text about progress of the given mailing jobs  """
+    if not jobs:
+        return "<b>Jo'natmalar mavjud emas!</b>"
+    statuses = {
+        MailingStatusesEnum.RUNNING: "Jo'natilmoqda",
+        MailingStatusesEnum.PAUSED: "To'xtatilgan",
+        MailingStatusesEnum.CANCELLED: "Bekor qilingan",
+        MailingStatusesEnum.DONE: "Yakunlangan"
+    }
+    text = "<b>Oxirgi jo'natmalar:</b>\n\n"
+    for job in jobs:
+        text += f"<b>#{job.job_id}</b> - <i>{statuses[job.status]}</i>\n" \
+                f"    {job.target_text or ''}\n" \
+                f"    Jo'natildi: <code>{job.sent}/{job.total}</code>, jo'natilmadi: <code>{job.failed}</code>\n"
+    return text
+
+
+@admin_router.callback_query(MainCallbackFactory.filter(F.action == "show_mailings"), AdminStates.admin_mode)
+async def show_mailings(call: CallbackQuery, bot: Bot, state: FSMContext, session: AsyncSession):
+    """  Send the list of the latest mailing jobs with buttons to control them  """
+    await call.answer(cache_time=1)
+    await state.set_state(AdminStates.mailings)
+    state_data = await state.get_data()
+    jobs = await get_mailing_jobs(session, limit=5)
+    await bot.edit_message_text(text=make_mailing_jobs_text(jobs), chat_id=call.message.chat.id,
+                                message_id=state_data["function_message_id"],
+                                reply_markup=make_mailing_jobs_keyboard(jobs))
+
+
+@admin_router.callback_query(MainCallbackFactory.filter(F.action.in_({"mailing_pause", "mailing_resume",
+                                                                      "mailing_cancel"})), AdminStates.mailings)
+async def control_mailing(call: CallbackQuery, bot: Bot, state: FSMContext, session: AsyncSession,
+                          callback_data: MainCallbackFactory):
+    """  Pause, resume or cancel the mailing job  """
+    await call.answer(cache_time=1)
+    state_data = await state.get_data()
+    if callback_data.action == "mailing_pause":
+        await set_mailing_job_status(session, callback_data.data, MailingStatusesEnum.PAUSED,
+                                     from_statuses=[MailingStatusesEnum.RUNNING])
+    elif callback_data.action == "mailing_resume":
+        await set_mailing_job_status(session, callback_data.data, MailingStatusesEnum.RUNNING,
+                                     from_statuses=[MailingStatusesEnum.PAUSED])
+    else:
+        await set_mailing_job_status(session, callback_data.data, MailingStatusesEnum.CANCELLED,
+                                     from_statuses=[MailingStatusesEnum.RUNNING, MailingStatusesEnum.PAUSED])
+    jobs = await get_mailing_jobs(session, limit=5)
+    with suppress(TelegramBadRequest):  # Skip if nothing has changed in the message
+        await bot.edit_message_text(text=make_mailing_jobs_text(jobs), chat_id=call.message.chat.id,
+                                    message_id=state_data["function_message_id"],
+                                    reply_markup=make_mailing_jobs_keyboard(jobs))
+
+
+@admin_router.callback_query(MainCallbackFactory.filter(F.action == "back"), AdminStates.mailings)
+async def go_back_from_mailings(call: CallbackQuery, bot: Bot, state: FSMContext):
+    """  Return to admin functions from state "AdminStates:mailings"  """
+    await call.answer(cache_time=1)
+    await state.set_state(AdminStates.admin_mode)
+    state_data = await state.get_data()
+    await bot.edit_message_text(text="Mavjud funktsiyalar:", chat_id=call.message.chat.id,
+                                message_id=state_data["function_message_id"], reply_markup=admin_functions)
+
 # ==================================================Function Mailing================================================== #
 
 
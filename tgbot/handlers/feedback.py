@@ -1,15 +1,13 @@
-from asyncio import sleep as asleep
-from contextlib import suppress
-
 from aiogram import Router, Bot, F, html
-from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tgbot.config import Config
 from tgbot.keyboards.reply import contact_keyboard, home_keyboard, confirming_keyboard, make_menu_keyboard
+from tgbot.misc.broadcaster import default_broadcaster
 from tgbot.misc.states import FeedbackStates
+from tgbot.misc.cleanup import deletion_scheduler
 
 flags = {"throttling_key": "default"}
 feedback_router = Router()
@@ -71,11 +69,14 @@ async def send_feedback(message: Message, bot: Bot, state: FSMContext, session:
         await bot.send_message(text=feedback_text, chat_id=config.tgbot.feedbacks_group)
 
     except Exception as error:
-        for admin_id in config.tgbot.admins:
-            with suppress(TelegramBadRequest):
-                await bot.send_message(chat_id=admin_id, text=f"Guruhga xabar jo'natish jarayonida xatolik!\n"
-                                                              f"<code>{error}</code>")
-                await bot.send_message(text=feedback_text, chat_id=admin_id)
+        error_text = str(error)  # 'error' is deleted when the except block ends, before admins get the message
+
+        async def send_to_admin(admin_id: int):
+            await bot.send_message(chat_id=admin_id, text=f"Guruhga xabar jo'natish jarayonida xatolik!\n"
+                                                          f"<code>{error_text}</code>")
+            await bot.send_message(text=feedback_text, chat_id=admin_id)
+
+        await default_broadcaster.run(config.tgbot.admins, send_to_admin, messages=2)
     menu_keyboard = await make_menu_keyboard(session, message.from_user.id, config)
     await message.answer(text="<b>Xabaringiz muvaffaqiyatli jo'natildi</b>\U0001F389",  # Emoji "tada"
                          reply_markup=menu_keyboard)
@@ -86,5 +87,4 @@ async def send_feedback(message: Message, bot: Bot, state: FSMContext, session:
 async def incorrect_message_alert(message: Message, bot: Bot):
     await message.delete()
     alert_message = await message.answer(text="<b>Iltimos ko'rsatmalarga amal qiling!</b>")
-    await asleep(5)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=5)
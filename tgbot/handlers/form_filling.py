@@ -1,16 +1,15 @@
-from re import findall as regexp_findall
 from contextlib import suppress
 from datetime import datetime
-from asyncio import sleep as asleep
 
-from aiogram import Router, Bot, F, html
+from aiogram import Router, Bot, F
 from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
 from aiogram.exceptions import TelegramBadRequest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tgbot.config import Config
-from tgbot.database.functions.functions import get_profession, get_direction, get_users_form_id, add_form, update_form
+from tgbot.database.functions.functions import get_profession, get_direction, get_users_form_id, add_form, \
+    update_form, get_rendered_form
 from tgbot.keyboards.inline import home_keyboard, menu_navigation_keyboard, raw_true_false_keyboard, \
     genders_keyboard, make_professions_keyboard, nations_keyboard, university_grades_keyboard, confirming_keyboard, \
     make_directions_keyboard, marital_status_keyboard, level_keyboard, working_style_keyboard, \
@@ -18,6 +17,9 @@ from tgbot.keyboards.inline import home_keyboard, menu_navigation_keyboard, raw_
 from tgbot.keyboards.reply import make_menu_keyboard
 from tgbot.misc.states import FormFillingStates
 from tgbot.misc.cbdata import MainCallbackFactory
+from tgbot.misc.broadcaster import default_broadcaster
+from tgbot.misc.form_renderer import FormView, render_form_preview
+from tgbot.misc.cleanup import deletion_scheduler
 
 flags = {"throttling_key": "default"}
 form_filling_router = Router()
@@ -25,6 +27,16 @@ form_filling_router = Router()
 # --------------------------------------------------Form Filling------------------------------------------------------ #
 
 
+async def edit_form_preview(bot: Bot, chat_id: int, state_data: dict):
+    """  Render the answers saved in the state to the form message  """
+    try:
+        await bot.edit_message_text(text=render_form_preview(state_data), chat_id=chat_id,
+                                    message_id=state_data["form_message_id"])
+    except TelegramBadRequest as error:
+        if "message is not modified" not in str(error):  # Answers the preview doesn't show, e.g. the phone number
+            raise
+
+
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.action == "home"), FormFillingStates())
 async def cancel_form(call: CallbackQuery, state: FSMContext, bot: Bot, session: AsyncSession, config: Config):
     """  Cancel form filling and back to home menu  """
@@ -60,15 +72,12 @@ async def ask_q1(message: Message, state: FSMContext):
 async def ask_q2(message: Message, state: FSMContext, bot: Bot):
     """  Ask for the user's date of birth  """
     await state.set_state(FormFillingStates.q2_birth_date)
-    full_name = message.text.title()
-    form_text = f"<b>F.I.Sh.:</b> {full_name}\n"
-    state_data = await state.get_data()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id,
-                                message_id=state_data["form_message_id"])
+    state_data = await state.update_data(full_name=message.text.title())
+    await edit_form_preview(bot, message.chat.id, state_data)
     question_message = await message.answer("<b>Tug'ilgan sanangizni kiriting.</b>\n(11.09.1988)",
                                             reply_markup=menu_navigation_keyboard)
     await message.delete()
-    await state.update_data(full_name=full_name, form_text=form_text, question_message_id=question_message.message_id)
+    await state.update_data(question_message_id=question_message.message_id)
 
 
 @form_filling_router.message(
@@ -77,15 +86,12 @@ async def ask_q2(message: Message, state: FSMContext, bot: Bot):
 async def ask_q3(message: Message, state: FSMContext, bot: Bot):
     """  Ask for the user's gender  """
     await state.set_state(FormFillingStates.q3_gender)
-    state_data = await state.get_data()
-    date_list = message.text.split(".")
-    birth_date = f"{date_list[2]}-{date_list[1]}-{date_list[0]}"
-    form_text = state_data["form_text"] + f"<b>Tug'ilgan sana:</b> {message.text}\n"
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    day, month, year = message.text.split(".")
+    state_data = await state.update_data(birth_date=f"{year}-{month.zfill(2)}-{day.zfill(2)}")
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Jinsingiz:</b>", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=genders_keyboard)
     await message.delete()
-    await state.update_data(birth_date=birth_date, form_text=form_text)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data), FormFillingStates.q3_gender)
@@ -93,15 +99,12 @@ async def ask_q4(call: CallbackQuery, bot: Bot, state: FSMContext, callback_data
     """  Ask for the user's phone number  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q4_phonenum)
-    state_data = await state.get_data()
-    gender_uz = "Erkak" if callback_data.data == "MALE" else "Ayol"  # Gender in Uzbek language
-    form_text = state_data["form_text"] + f"<b>Jins:</b> {gender_uz}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(gender=callback_data.data)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>Siz bilan bog'lanishimiz mumkin bo'lgan telefon raqamni kiriting.</b>\n(+998735455555)",
         chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
         reply_markup=menu_navigation_keyboard)
-    await state.update_data(gender=callback_data.data, form_text=form_text)
 
 
 @form_filling_router.message(F.text.regexp(r"\+998[0-9]{9}$"), FormFillingStates.q4_phonenum, flags=flags)
@@ -110,10 +113,10 @@ async def confirm_q3(message: Message, state: FSMContext, bot: Bot):
     """  Ask the user to confirm that the phone number is correct  """
     await message.delete()
     phonenum = message.text
-    state_data = await state.get_data()
+    # The number is an answer only after the user confirms it
+    state_data = await state.update_data(unconfirmed_phonenum=phonenum)
     await bot.edit_message_text(text=f"<b>Raqamni to'g'ri terdingizmi?</b>\n{phonenum}", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=raw_true_false_keyboard)
-    await state.update_data(phonenum=phonenum)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 0), FormFillingStates.q4_phonenum)
@@ -142,12 +145,10 @@ async def ask_q5(call: CallbackQuery, state: FSMContext, bot: Bot, session: Asyn
                                   reply_markup=menu_keyboard)
         await state.clear()
         return
-    form_text = state_data["form_text"] + f"<b>Telefon raqam:</b> {state_data['phonenum']}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                message_id=state_data["form_message_id"])
+    state_data = await state.update_data(phonenum=state_data["unconfirmed_phonenum"])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await call.message.edit_text("<b>Sizni qiziqtirgan sohalarni tanlang:</b>",
                                  reply_markup=keyboard)
-    await state.update_data(form_text=form_text)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.action == "select"), FormFillingStates.q5_professions)
@@ -180,36 +181,30 @@ async def ask_q6(call: CallbackQuery, bot: Bot, state: FSMContext, session: Asyn
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q6_address)
     state_data = await state.get_data()
+    checked_professions = state_data.get("checked_professions") or []
     profession_titles = []
-    if not state_data["checked_professions"]:
-        form_text = state_data["form_text"] + "<b>Qiziqtirgan sohalar:</b> Mavjud emas!\n"
-    else:
-        for profession_id in state_data["checked_professions"]:
-            # Getting profession title from database and adding it to the list above
-            profession_title = (await get_profession(session, profession_id))[0]
-            profession_titles.append(profession_title.capitalize())
-        form_text = state_data["form_text"] + f"<b>Qiziqtirgan sohalar:</b> {', '.join(profession_titles)}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    for profession_id in checked_professions:
+        # Getting profession title from database and adding it to the list above
+        profession_title = (await get_profession(session, profession_id))[0]
+        profession_titles.append(profession_title.capitalize())
+    state_data = await state.update_data(checked_professions=checked_professions, profession_titles=profession_titles)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>Doimiy yashash manzilingizni kiriting.</b>\nMusol: <i>Qoʻqon shahri, Turkiston koʻchasi, 28-A uy</i>)",
         chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
         reply_markup=menu_navigation_keyboard
     )
-    await state.update_data(form_text=form_text, profession_titles=profession_titles)
 
 
 @form_filling_router.message(F.text.regexp(r"^.{3,150}$"), FormFillingStates.q6_address, flags=flags)
 async def ask_q7(message: Message, state: FSMContext, bot: Bot):
     """  Ask for the user's nation  """
     await state.set_state(FormFillingStates.q7_nation)
-    state_data = await state.get_data()
-    address = html.quote(message.text)
-    form_text = state_data["form_text"] + f"<b>Yashash manzil:</b> {address}\n"
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(address=message.text)
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Millatingiz:</b>", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=nations_keyboard)
     await message.delete()
-    await state.update_data(form_text=form_text, address=address)
 
 
 @form_filling_router.message(FormFillingStates.q6_address)
@@ -220,8 +215,7 @@ async def incorrect_address_alert(message: Message, bot: Bot):
                                          "1. Lotincha xarflar yoki raqamlardan iborat bo'lishi\n"
                                          "2. 3ta belgidan ko'p bo'lishi va 150 belgidan kam bo'lishi\n"
                                          "3. Mumkin bo'lgan simvollar:  <code>. , / - '</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data), FormFillingStates.q7_nation)
@@ -229,20 +223,13 @@ async def ask_q8(call: CallbackQuery, bot: Bot, state: FSMContext, callback_data
     """  Ask for the user's university grade   """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q8_university_grade)
-    state_data = await state.get_data()
-    nation = "O'zbek"
-    if callback_data.data == "RUSSIAN":
-        nation = "Rus"
-    elif callback_data.data == "OTHER":
-        nation = "Boshqa"
-    form_text = state_data["form_text"] + f"<b>Millat:</b> {nation}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(nation=callback_data.data)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>Nechanchi kurs talabasisiz?</b>",
         chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
         reply_markup=university_grades_keyboard
     )
-    await state.update_data(form_text=form_text, nation=callback_data.data)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data), FormFillingStates.q8_university_grade)
@@ -251,17 +238,14 @@ async def ask_q9(call: CallbackQuery, bot: Bot, state: FSMContext, session: Asyn
     """  Ask for the user's university direction  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q9_university_direction)
-    state_data = await state.get_data()
-    university_grade_uz = "Magistr" if callback_data.data == 5 else callback_data.data
-    form_text = state_data["form_text"] + f"<b>Kurs:</b> {university_grade_uz}\n"
+    state_data = await state.update_data(university_grade=callback_data.data)
     keyboard = await make_directions_keyboard(session)
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>Ta'lim yo'nalishingiz:</b>",
         chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
         reply_markup=keyboard
     )
-    await state.update_data(form_text=form_text, university_grade=callback_data.data)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data), FormFillingStates.q9_university_direction)
@@ -269,41 +253,31 @@ async def ask_q10(call: CallbackQuery, bot: Bot, state: FSMContext, session: Asy
                   callback_data: MainCallbackFactory):
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q10_working_company)
-    state_data = await state.get_data()
     direction_title = (await get_direction(session, callback_data.data))[0]
-    form_text = state_data["form_text"] + f"<b>Ta'lim yo'nalishi: </b> {direction_title.capitalize()}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                message_id=state_data["form_message_id"])
-    await state.update_data(direction_id=callback_data.data, form_text=form_text)
+    state_data = await state.update_data(direction_id=callback_data.data, direction_title=direction_title)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await call.message.edit_text("<b>Hozirda ish bilan bandmisiz?</b>",
                                  reply_markup=confirming_keyboard)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 1), FormFillingStates.q10_working_company)
-async def ask_company_name(call: CallbackQuery, bot: Bot, state: FSMContext):
+async def ask_company_name(call: CallbackQuery, state: FSMContext):
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.company_name)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"<b>Ish o'rni: </b>"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                message_id=state_data["form_message_id"])
     question_message = await call.message.edit_text(
         "<b>Ishlayotgan korxonangizning nomi nima?</b>\n(Kokand University)",
         reply_markup=menu_navigation_keyboard)
-    await state.update_data(question_message_id=question_message.message_id, form_text=form_text)
+    await state.update_data(question_message_id=question_message.message_id)
 
 
 @form_filling_router.message(F.text.regexp(r"^.{2,150}$"), FormFillingStates.company_name, flags=flags)
 async def ask_company_position(message: Message, bot: Bot, state: FSMContext):
     await state.set_state(FormFillingStates.company_position)
-    state_data = await state.get_data()
-    company_name = message.text.strip()
-    form_text = state_data["form_text"] + f"\n    <b>Nomi:</b> {company_name}\n"
+    state_data = await state.update_data(company=[message.text.strip()])  # The position is asked next
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Qaysi lavozimda ishlaysiz?</b>\n(Buxgalter)", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=menu_navigation_keyboard)
-    await state.update_data(form_text=form_text, company_name=company_name)
 
 
 @form_filling_router.message(F.text.regexp(r"^.{2,150}$"), FormFillingStates.company_position,
@@ -311,13 +285,11 @@ async def ask_company_position(message: Message, bot: Bot, state: FSMContext):
 async def ask_q11(message: Message, bot: Bot, state: FSMContext):
     await state.set_state(FormFillingStates.q11_marital_status)
     state_data = await state.get_data()
-    company_position = message.text.strip()
-    form_text = state_data["form_text"] + f"    <b>Lavozimi:</b> {company_position}\n"
+    state_data = await state.update_data(company=[state_data["company"][0], message.text.strip()])
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Oilaviy ahvolingiz:</b>", reply_markup=marital_status_keyboard,
                                 chat_id=message.chat.id, message_id=state_data["question_message_id"])
-    await state.update_data(form_text=form_text, company=[state_data["company_name"], company_position])
 
 
 @form_filling_router.message(FormFillingStates.company_name)
@@ -329,8 +301,7 @@ async def incorrect_company_data_alert(message: Message, bot: Bot):
                                          "1. Lotincha xarflar yoki raqamlardan iborat bo'lishi\n"
                                          "2. 1ta belgidan ko'p bo'lishi va 150 belgidan kam bo'lishi\n"
                                          "3. Mumkin bo'lgan simvollar:  <code>. / - '</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 0), FormFillingStates.q10_working_company)
@@ -338,12 +309,10 @@ async def ask_q11_callback(call: CallbackQuery, bot: Bot, state: FSMContext):
     """  Ask marital status if didn't add working company  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q11_marital_status)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + "<b>Ish o'rni: </b>\U00002796\n"  # Emoji 'heavy_minus_sign'
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(company=[])  # Empty list means the user isn't working
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Oilaviy ahvolingiz:</b>", reply_markup=marital_status_keyboard,
                                 chat_id=call.message.chat.id, message_id=state_data["question_message_id"])
-    await state.update_data(company=None, form_text=form_text)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 1), FormFillingStates.q11_marital_status)
@@ -352,15 +321,12 @@ async def ask_q12(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask for user's driver license  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q12_driver_license)
-    state_data = await state.get_data()
-    marital_status_uz = "Turmush qurgan" if callback_data.data else "Turmush qurmagan"
-    form_text = state_data["form_text"] + f"<b>Oilaviy ahvol:</b> {marital_status_uz}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    # We need an empty list 'languages' in next handlers
+    state_data = await state.update_data(marital_status=callback_data.data, languages=[])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Haydovchilik guvohnomangiz bormi?</b>",
                                 chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
                                 reply_markup=confirming_keyboard)
-    # We need an empty list 'languages' in next handlers
-    await state.update_data(form_text=form_text, marital_status=callback_data.data, languages=[])
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 1), FormFillingStates.q12_driver_license)
@@ -369,14 +335,10 @@ async def ask_q13(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask for user how well he speaks russian  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q13_ru_lang)
-    state_data = await state.get_data()
-    driver_license_uz = "Bor" if callback_data.data else "Yo'q"
-    form_text = state_data["form_text"] + f"<b>Haydovchilik guvohnomasi:</b> {driver_license_uz}\n" \
-                                          f"<b>Tillar:</b>\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(driver_license=callback_data.data)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Rus tilida suhbatlashish darajangiz:</b>", chat_id=call.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=level_keyboard)
-    await state.update_data(form_text=form_text, driver_license=callback_data.data)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -385,14 +347,10 @@ async def ask_q14(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask for user how well he speaks english  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q14_eng_lang)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"Rus tili: {callback_data.data}%\n"
-    languages = state_data["languages"]
-    languages.append({"name": "rus", "level": callback_data.data})
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(languages=[{"name": "rus", "level": callback_data.data}])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Ingiliz tilida suhbatlashish darajangiz:</b>", chat_id=call.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=level_keyboard)
-    await state.update_data(form_text=form_text, languages=languages)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -402,13 +360,11 @@ async def ask_q15(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q15_other_lang)
     state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"Ingiliz tili: {callback_data.data}%\n"
-    languages = state_data["languages"]
-    languages.append({"name": "ingiliz", "level": callback_data.data})
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    languages = state_data["languages"][:1] + [{"name": "ingiliz", "level": callback_data.data}]
+    state_data = await state.update_data(languages=languages)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Yana boshqa bir tilni bilasizmi?</b>", chat_id=call.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=confirming_keyboard)
-    await state.update_data(form_text=form_text, languages=languages)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 1), FormFillingStates.q15_other_lang)
@@ -426,13 +382,11 @@ async def ask_lang_name(call: CallbackQuery, state: FSMContext):
 async def ask_lang_level(message: Message, bot: Bot, state: FSMContext):
     """  Ask user how well he speaks that language  """
     await state.set_state(FormFillingStates.lang_level)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"{message.text.capitalize()}: "
+    state_data = await state.update_data(lang_name=message.text.lower())
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Bu tilda qay darajada suhbatlasha olasiz?</b>", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=level_keyboard)
-    await state.update_data(form_text=form_text, lang_name=message.text.lower())
 
 
 @form_filling_router.message(FormFillingStates.lang_name)
@@ -442,8 +396,7 @@ async def incorrect_lang_name_alert(message: Message, bot: Bot):
     alert_message = await message.answer("<b>Lotincha harflardan foydalangan holda faqatgina tilning nomini kiriting, "
                                          "32ta harfdan oshmasin!</b>\n"
                                          "Misol: <code>Xitoy</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -452,21 +405,17 @@ async def ask_again_q16(call: CallbackQuery, bot: Bot, state: FSMContext, callba
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q15_other_lang)
     state_data = await state.get_data()
-    languages = state_data["languages"]
-    languages.append({"name": state_data["lang_name"], "level": callback_data.data})
-    form_text = state_data["form_text"] + f"{callback_data.data}%\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
-    await state.update_data(form_text=form_text, languages=languages)
+    languages = state_data["languages"] + [{"name": state_data["lang_name"], "level": callback_data.data}]
+    state_data = await state.update_data(languages=languages, lang_name=None)
     if len(languages) >= 7:
         await state.set_state(FormFillingStates.q16_word_app)
-        form_text = form_text + f"<b>Dasturlar:</b>\n"
-        await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                    message_id=state_data["form_message_id"])
+        state_data = await state.update_data(applications=[])
+        await edit_form_preview(bot, call.message.chat.id, state_data)
         await bot.edit_message_text(text="<b>Word dasturidan foydalana olish darajangiz:</b>",
                                     chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
                                     reply_markup=level_keyboard)
-        await state.update_data(applications=[], form_text=form_text)
         return
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Yana boshqa bir tilni bilasizmi?</b>", chat_id=call.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=confirming_keyboard)
 
@@ -476,13 +425,10 @@ async def ask_q16(call: CallbackQuery, bot: Bot, state: FSMContext):
     """  Ask user how well he knows word app  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q16_word_app)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"<b>Dasturlar:</b>\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                message_id=state_data["form_message_id"])
+    state_data = await state.update_data(applications=[])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await call.message.edit_text("<b>Word dasturidan foydalana olish darajangiz:</b>",
                                  reply_markup=level_keyboard)
-    await state.update_data(applications=[], form_text=form_text)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -491,14 +437,10 @@ async def ask_q17(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask for user how well he knows excel app  """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q17_excel_app)
-    state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"Word: {callback_data.data}%\n"
-    applications = state_data["applications"]
-    applications.append({"name": "word", "level": callback_data.data})
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(applications=[{"name": "word", "level": callback_data.data}])
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Excel dasturidan foydalana olish darajangiz:</b>", reply_markup=level_keyboard,
                                 chat_id=call.message.chat.id, message_id=state_data["question_message_id"])
-    await state.update_data(form_text=form_text, applications=applications)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -508,13 +450,11 @@ async def ask_q18(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q18_1c_app)
     state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"Excel: {callback_data.data}%\n"
-    applications = state_data["applications"]
-    applications.append({"name": "excel", "level": callback_data.data})
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    applications = state_data["applications"][:1] + [{"name": "excel", "level": callback_data.data}]
+    state_data = await state.update_data(applications=applications)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>1C dasturidan foydalana olish darajangiz:</b>", reply_markup=level_keyboard,
                                 chat_id=call.message.chat.id, message_id=state_data["question_message_id"])
-    await state.update_data(form_text=form_text, applications=applications)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -524,13 +464,11 @@ async def ask_q19(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q19_other_app)
     state_data = await state.get_data()
-    form_text = state_data["form_text"] + f"1C: {callback_data.data}%\n"
-    applications = state_data["applications"]
-    applications.append({"name": "1c", "level": callback_data.data})
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    applications = state_data["applications"][:2] + [{"name": "1c", "level": callback_data.data}]
+    state_data = await state.update_data(applications=applications)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Yana boshqa bir dasturni bilasizmi?</b>", chat_id=call.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=confirming_keyboard)
-    await state.update_data(form_text=form_text, applications=applications)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data == 1), FormFillingStates.q19_other_app)
@@ -548,14 +486,12 @@ async def ask_app_name(call: CallbackQuery, state: FSMContext):
 async def ask_app_level(message: Message, bot: Bot, state: FSMContext):
     """  Ask user how well he knows that application """
     await state.set_state(FormFillingStates.app_level)
-    state_data = await state.get_data()
     # Application name which user sent
-    form_text = state_data["form_text"] + f"{message.text.capitalize()}: "
+    state_data = await state.update_data(app_name=message.text.lower())
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(text="<b>Bu dasturni qay darajada bilasiz?</b>", chat_id=message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=level_keyboard)
-    await state.update_data(form_text=form_text, app_name=message.text.lower())
 
 
 @form_filling_router.message(FormFillingStates.app_name)
@@ -565,8 +501,7 @@ async def incorrect_app_name_alert(message: Message, bot: Bot):
     alert_message = await message.answer("<b>Lotincha harflar, raqam va belgilardan foydalangan holda faqatgina "
                                          "dasturning nomini kiriting, 32ta harfdan oshmasin!</b>\n"
                                          "Misol: <code>Adobe Photoshop</code>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data.in_([0, 25, 50, 75, 100])),
@@ -575,11 +510,9 @@ async def ask_again_q19(call: CallbackQuery, bot: Bot, state: FSMContext, callba
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q19_other_app)
     state_data = await state.get_data()
-    applications = state_data["applications"]
-    applications.append({"name": state_data["app_name"], "level": callback_data.data})
-    form_text = state_data["form_text"] + f"{callback_data.data}%\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
-    await state.update_data(form_text=form_text, applications=applications)
+    applications = state_data["applications"] + [{"name": state_data["app_name"], "level": callback_data.data}]
+    state_data = await state.update_data(applications=applications, app_name=None)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     if len(applications) >= 10:
         await state.set_state(FormFillingStates.q20_working_style)
         await bot.edit_message_text(text="<b>Qanday ishlashni afzal ko'rasiz?</b>", chat_id=call.message.chat.id,
@@ -602,15 +535,12 @@ async def ask_q21(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask user for how many salary suits him """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q21_salary)
-    state_data = await state.get_data()
-    working_style_uz = "Jamoada" if callback_data.data == "COLLECTIVE" else "Individual"
-    form_text = state_data["form_text"] + f"<b>Ishlash uslubi:</b> {working_style_uz}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(working_style=callback_data.data)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>Qancha oylik maoshiga ishlagan bo'lar edingiz?</b>", chat_id=call.message.chat.id,
         message_id=state_data["question_message_id"], reply_markup=salary_keyboard
     )
-    await state.update_data(form_text=form_text, working_style=callback_data.data)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.data), FormFillingStates.q21_salary)
@@ -618,19 +548,12 @@ async def ask_q22(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
     """  Ask user for a positive self-assessment """
     await call.answer(cache_time=1)
     await state.set_state(FormFillingStates.q22_positive_assessment)
-    state_data = await state.get_data()
-    salary_uz = "1 - 2 milion so'm"
-    if callback_data.data == 2:
-        salary_uz = "3 - 4 million so'm"
-    elif callback_data.data == 3:
-        salary_uz = "5 million so'm va undan yuqori"
-    form_text = state_data["form_text"] + f"<b>Oylik maoshi:</b> {salary_uz}\n"
-    await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id, message_id=state_data["form_message_id"])
+    state_data = await state.update_data(salary=callback_data.data)
+    await edit_form_preview(bot, call.message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>O'zingizga qanday ijobiy ta'rif bera olasiz?</b>", chat_id=call.message.chat.id,
         message_id=state_data["question_message_id"], reply_markup=menu_navigation_keyboard
     )
-    await state.update_data(form_text=form_text, salary=callback_data.data)
 
 
 @form_filling_router.message(F.text.func(lambda text: len(text) <= 250), FormFillingStates.q22_positive_assessment,
@@ -638,16 +561,13 @@ async def ask_q22(call: CallbackQuery, bot: Bot, state: FSMContext, callback_dat
 async def ask_q23(message: Message, bot: Bot, state: FSMContext):
     """  Ask user for a negative self-assessment   """
     await state.set_state(FormFillingStates.q23_negative_assessment)
-    state_data = await state.get_data()
-    positive_assessment = html.quote(message.text.strip())
-    form_text = state_data["form_text"] + f"<b>Ijobiy ta'rif:</b> {positive_assessment}\n"
+    state_data = await state.update_data(positive_assessment=message.text.strip())
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>O'zingizga qanday salbiy ta'rif bera olasiz?</b>", chat_id=message.chat.id,
         message_id=state_data["question_message_id"], reply_markup=menu_navigation_keyboard
     )
-    await state.update_data(form_text=form_text, positive_assessment=positive_assessment)
 
 
 @form_filling_router.message(F.text.func(lambda text: len(text) <= 250), FormFillingStates.q23_negative_assessment,
@@ -655,16 +575,13 @@ async def ask_q23(message: Message, bot: Bot, state: FSMContext):
 async def ask_q24(message: Message, bot: Bot, state: FSMContext):
     """  Ask for user to send his photo  """
     await state.set_state(FormFillingStates.q24_photo)
-    state_data = await state.get_data()
-    negative_assessment = html.quote(message.text.strip())
-    form_text = state_data["form_text"] + f"<b>Salbiy ta'rif:</b> {negative_assessment}\n"
+    state_data = await state.update_data(negative_assessment=message.text.strip())
     await message.delete()
-    await bot.edit_message_text(text=form_text, chat_id=message.chat.id, message_id=state_data["form_message_id"])
+    await edit_form_preview(bot, message.chat.id, state_data)
     await bot.edit_message_text(
         text="<b>O'zingizni rasmingizni jo'nating.</b>\n(Fayl ko'rinishida jo'natmang. Selfi ham bo'laveradi)",
         chat_id=message.chat.id, message_id=state_data["question_message_id"], reply_markup=menu_navigation_keyboard
     )
-    await state.update_data(form_text=form_text, negative_assessment=negative_assessment)
 
 
 @form_filling_router.message(FormFillingStates.q22_positive_assessment)
@@ -674,8 +591,7 @@ async def incorrect_assessment_alert(message: Message, bot: Bot):
     await message.delete()
     alert_message = await message.answer("<b>Ta'rifni faqat matn bilan bayon qiling, "
                                          "hajmi 250ta belgidan oshmasligi kerak!</b>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.message(F.content_type == "photo", FormFillingStates.q24_photo, flags=flags)
@@ -683,14 +599,13 @@ async def confirming_form(message: Message, bot: Bot, state: FSMContext):
     await state.set_state(FormFillingStates.ready_form)
     state_data = await state.get_data()
     photo_id = message.photo[0].file_id
-    form_text = state_data["form_text"]
     await message.delete()
     await bot.delete_message(chat_id=message.chat.id, message_id=state_data["question_message_id"])
     await bot.delete_message(chat_id=message.chat.id, message_id=state_data["form_message_id"])
     await bot.delete_message(chat_id=message.chat.id, message_id=state_data["anketa_text_message_id"])
     anketa_text_message = await message.answer("<b>Anketangiz tayyor!</b>")
     form_photo_message = await message.answer_photo(photo=photo_id)
-    form_message = await bot.send_message(text=form_text, chat_id=message.chat.id,
+    form_message = await bot.send_message(text=render_form_preview(state_data), chat_id=message.chat.id,
                                           reply_to_message_id=form_photo_message.message_id,
                                           reply_markup=sending_keyboard)
     await state.update_data(photo_id=photo_id, form_message_id=form_message.message_id,
@@ -703,8 +618,7 @@ async def incorrect_photo_alert(message: Message, bot: Bot):
     """  Send an alert message about incorrect answer  """
     await message.delete()
     alert_message = await message.answer("<b>Faqatgina rasm jo'nating, fayl ko'rinishida bo'lmasin!</b>")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.message(FormFillingStates())
@@ -713,8 +627,7 @@ async def other_incorrect_messages_alert(message: Message, bot: Bot):
     await message.delete()
     alert_message = await message.answer("<b>Noto'g'ri ma'lumot kiritdingiz!</b>\n"
                                          "Iltimos, ma'lumotlarni ko'rsatilgan shakilda kiriting.")
-    await asleep(10)
-    await bot.delete_message(chat_id=message.chat.id, message_id=alert_message.message_id)
+    await deletion_scheduler.schedule(message.chat.id, alert_message.message_id, delay=10)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.action == "send"), FormFillingStates.ready_form)
@@ -724,10 +637,6 @@ async def send_form(call: CallbackQuery, bot: Bot, state: FSMContext, session: A
     state_data = await state.get_data()
     await call.message.edit_reply_markup()
     old_form_id = await get_users_form_id(session, telegram_id=call.from_user.id)
-    username = "Mavjud emas!" if call.from_user.username is None else f"@{call.from_user.username}"
-    form_text = state_data["form_text"] + f"<b>Telegramdagi ismi:</b> {call.from_user.full_name}\n" \
-                                          f"<b>Telegramdagi nomi:</b> {username}\n" \
-                                          f"<b>Telegram ID:</b> {call.from_user.id}\n"
     birth_date = datetime.strptime(state_data["birth_date"], '%Y-%m-%d')
     if old_form_id:  # If user already have another form update it
         await update_form(session, form_id=old_form_id, telegram_id=call.from_user.id,
@@ -740,59 +649,59 @@ async def send_form(call: CallbackQuery, bot: Bot, state: FSMContext, session: A
                           negative_assessment=state_data["negative_assessment"], photo_id=state_data["photo_id"],
                           checked_professions=state_data["checked_professions"], company=state_data["company"],
                           languages=state_data["languages"], applications=state_data["applications"])
-        form_text = form_text + "<code>YANGILANGAN!</code>"
+        form_id = old_form_id
         menu_keyboard = await make_menu_keyboard(session, call.from_user.id, config)
         await call.message.answer(f"<b>Anketangiz muvaffaqiyatli yangilandi va administratorlarga jo'natildi</b>"
                                   f"\U0001F389",
                                   reply_markup=menu_keyboard)
     else:
-        await add_form(session, telegram_id=call.from_user.id, full_name=state_data["full_name"],
-                       birth_date=birth_date, gender=state_data["gender"],
-                       phonenum=state_data["phonenum"], address=state_data["address"], nation=state_data["nation"],
-                       university_grade=state_data["university_grade"], direction_id=state_data["direction_id"],
-                       marital_status=state_data["marital_status"], driver_license=state_data["driver_license"],
-                       working_style=state_data["working_style"], wanted_salary=state_data["salary"],
-                       positive_assessment=state_data["positive_assessment"],
-                       negative_assessment=state_data["negative_assessment"], photo_id=state_data["photo_id"],
-                       checked_professions=state_data["checked_professions"], company=state_data["company"],
-                       languages=state_data["languages"], applications=state_data["applications"])
+        form_id = await add_form(
+            session, telegram_id=call.from_user.id, full_name=state_data["full_name"], birth_date=birth_date,
+            gender=state_data["gender"], phonenum=state_data["phonenum"], address=state_data["address"],
+            nation=state_data["nation"], university_grade=state_data["university_grade"],
+            direction_id=state_data["direction_id"], marital_status=state_data["marital_status"],
+            driver_license=state_data["driver_license"], working_style=state_data["working_style"],
+            wanted_salary=state_data["salary"], positive_assessment=state_data["positive_assessment"],
+            negative_assessment=state_data["negative_assessment"], photo_id=state_data["photo_id"],
+            checked_professions=state_data["checked_professions"], company=state_data["company"],
+            languages=state_data["languages"], applications=state_data["applications"])
         menu_keyboard = await make_menu_keyboard(session, call.from_user.id, config)
         await call.message.answer(text=f"<b>Anketangiz muvaffaqiyatli shakillandi va administratorlarga jo'natildi</b>"
                                   f"\U0001F389",
                                   reply_markup=menu_keyboard)
     # Sending form to admins and administrator's group
+    form = await get_rendered_form(session, form_id, view=FormView.GROUP)
+    form_text = form.text
     try:
         photo_message = await bot.send_photo(chat_id=config.tgbot.forms_group, photo=state_data["photo_id"])
         await bot.send_message(chat_id=config.tgbot.forms_group, text=form_text,
                                reply_to_message_id=photo_message.message_id)
 
     except Exception as error:
-        for admin_id in config.tgbot.admins:
-            with suppress(TelegramBadRequest):
-                await bot.send_message(chat_id=admin_id, text=f"Guruhga anketa jo'natish jarayonida xatolik!\n"
-                                                              f"<code>{error}</code>")
-                photo_message = await bot.send_photo(chat_id=admin_id, photo=state_data["photo_id"])
-                await bot.send_message(chat_id=admin_id, text=form_text, reply_to_message_id=photo_message.message_id)
+        error_text = str(error)  # 'error' is deleted when the except block ends, before admins get the message
+
+        async def send_to_admin(admin_id: int):
+            await bot.send_message(chat_id=admin_id, text=f"Guruhga anketa jo'natish jarayonida xatolik!\n"
+                                                          f"<code>{error_text}</code>")
+            photo_message = await bot.send_photo(chat_id=admin_id, photo=state_data["photo_id"])
+            await bot.send_message(chat_id=admin_id, text=form_text, reply_to_message_id=photo_message.message_id)
+
+        await default_broadcaster.run(config.tgbot.admins, send_to_admin, messages=3)
     await state.clear()
 
 
 # --------------------------------------------------Back Buttons------------------------------------------------------ #
 
-async def edit_form_question(callback_query: CallbackQuery, bot: Bot, state: FSMContext, text_to_cut: str,
-                             question_text: str, reply_markup: InlineKeyboardMarkup):
+async def edit_form_question(callback_query: CallbackQuery, bot: Bot, state: FSMContext, question_text: str,
+                             reply_markup: InlineKeyboardMarkup, **answers):
     """
-    Edit current question and cut the given text from form text.
-    Use this function when handling back buttons in form filling
+    Edit current question, save the given answers and update the form preview.
+    Use this function when handling back buttons in form filling, answers to dropped questions are set to None
     """
-    state_data = await state.get_data()
-    form_text = state_data["form_text"]
-    last_answer_index = form_text.find(text_to_cut)
-    form_text = form_text[:last_answer_index]  # Form text where deleted the answer to last question
-    await bot.edit_message_text(text=question_text, chat_id=callback_query.message.chat.id, 
+    state_data = await state.update_data(**answers)
+    await bot.edit_message_text(text=question_text, chat_id=callback_query.message.chat.id,
                                 message_id=state_data["question_message_id"], reply_markup=reply_markup)
-    await bot.edit_message_text(text=form_text, chat_id=callback_query.message.chat.id,
-                                message_id=state_data["form_message_id"])
-    await state.update_data(form_text=form_text)
+    await edit_form_preview(bot, callback_query.message.chat.id, state_data)
 
 
 @form_filling_router.callback_query(MainCallbackFactory.filter(F.action == "back"), FormFillingStates())
@@ -807,230 +716,140 @@ async def form_filling_back_buttons(call: CallbackQuery, bot: Bot, state: FSMCon
         form_message = await call.message.edit_text(
             "<b>Ism va familiyangizni to'liq kiriting.</b>\n(Ikramov Akrom)",
             reply_markup=home_keyboard)
-        await state.update_data(form_message_id=form_message.message_id)
+        await state.update_data(form_message_id=form_message.message_id, full_name=None)
 
     elif current_state == "FormFillingStates:q3_gender":
         await state.set_state(FormFillingStates.q2_birth_date)
-        await edit_form_question(call, bot, state, text_to_cut="<b>Tug'ilgan sana:</b>",
-                                 question_text="<b>Tug'ilgan sanangizni kiriting.</b>\n(24.03.1998)",
-                                 reply_markup=menu_navigation_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Tug'ilgan sanangizni kiriting.</b>\n(24.03.1998)",
+                                 reply_markup=menu_navigation_keyboard, birth_date=None)
 
     elif current_state == "FormFillingStates:q4_phonenum":
         await state.set_state(FormFillingStates.q3_gender)
-        await edit_form_question(call, bot, state, text_to_cut="<b>Jins:</b>",  question_text="<b>Jinsingiz:</b>",
-                                 reply_markup=genders_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Jinsingiz:</b>", reply_markup=genders_keyboard,
+                                 gender=None)
 
     elif current_state == "FormFillingStates:q5_professions":
         await state.set_state(FormFillingStates.q4_phonenum)
         await edit_form_question(
-            call, bot, state, text_to_cut="<b>Telefon raqam:</b>", reply_markup=menu_navigation_keyboard,
+            call, bot, state, reply_markup=menu_navigation_keyboard, phonenum=None,
             question_text="<b>Siz bilan bog'lanishimiz mumkin bo'lgan telefon raqamni kiriting.</b>\n(+998333360006)")
 
     elif current_state == "FormFillingStates:q6_address":
         await state.set_state(FormFillingStates.q5_professions)
         keyboard = await make_professions_keyboard(session)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Qiziqtirgan sohalar:</b>", question_text="<b>Qiziqtirgan sohalar:</b>",
-            reply_markup=keyboard)
-        await state.update_data(checked_professions=[])
+        await edit_form_question(call, bot, state, question_text="<b>Qiziqtirgan sohalar:</b>", reply_markup=keyboard,
+                                 checked_professions=[], profession_titles=None)
 
     elif current_state == "FormFillingStates:q7_nation":
         await state.set_state(FormFillingStates.q6_address)
         await edit_form_question(
-            call, bot, state, text_to_cut="<b>Yashash manzil:</b>",
+            call, bot, state,
             question_text="<b>Doyimiy yashash manzilingizni kiriting.</b>\n(Qoʻqon shahri, Turkiston koʻchasi, 28-A uy)",
-            reply_markup=menu_navigation_keyboard)
+            reply_markup=menu_navigation_keyboard, address=None)
 
     elif current_state == "FormFillingStates:q8_university_grade":
         await state.set_state(FormFillingStates.q7_nation)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Millat:</b>", question_text="<b>Millatingiz:</b>",
-            reply_markup=nations_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Millatingiz:</b>", reply_markup=nations_keyboard,
+                                 nation=None)
 
     elif current_state == "FormFillingStates:q9_university_direction":
         await state.set_state(FormFillingStates.q8_university_grade)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Kurs:</b>", question_text="<b>Nechanchi kurs talabasisiz?</b>",
-            reply_markup=university_grades_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Nechanchi kurs talabasisiz?</b>",
+                                 reply_markup=university_grades_keyboard, university_grade=None)
 
     elif current_state == "FormFillingStates:q10_working_company":
         await state.set_state(FormFillingStates.q9_university_direction)
         keyboard = await make_directions_keyboard(session)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Ta'lim yo'nalishi: </b>", question_text="<b>Ta'lim yo'nalishingiz:</b>",
-            reply_markup=keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Ta'lim yo'nalishingiz:</b>", reply_markup=keyboard,
+                                 direction_id=None, direction_title=None)
 
     elif current_state in ["FormFillingStates:company_name", "FormFillingStates:company_position",
                            "FormFillingStates:q11_marital_status"]:
         await state.set_state(FormFillingStates.q10_working_company)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Ish o'rni: </b>", question_text="<b>Hozirda ish bilan bandmisiz?</b>",
-            reply_markup=confirming_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Hozirda ish bilan bandmisiz?</b>",
+                                 reply_markup=confirming_keyboard, company=None)
 
     elif current_state == "FormFillingStates:q12_driver_license":
         await state.set_state(FormFillingStates.q11_marital_status)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Oilaviy ahvol:</b>", question_text="<b>Oilaviy ahvolingiz:</b>",
-            reply_markup=marital_status_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Oilaviy ahvolingiz:</b>",
+                                 reply_markup=marital_status_keyboard, marital_status=None)
 
     elif current_state == "FormFillingStates:q13_ru_lang":
         await state.set_state(FormFillingStates.q12_driver_license)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Haydovchilik guvohnomasi:</b>",
-            question_text="<b>Haydovchilik guvohnomangiz bormi?</b>",
-            reply_markup=confirming_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Haydovchilik guvohnomangiz bormi?</b>",
+                                 reply_markup=confirming_keyboard, driver_license=None)
 
     elif current_state == "FormFillingStates:q14_eng_lang":
         await state.set_state(FormFillingStates.q13_ru_lang)
-        await edit_form_question(
-            call, bot, state, text_to_cut="Rus tili:",
-            question_text="<b>Rus tilida suhbatlashish darajangiz:</b>",
-            reply_markup=level_keyboard)
-        await state.update_data(languages=[])
+        await edit_form_question(call, bot, state, question_text="<b>Rus tilida suhbatlashish darajangiz:</b>",
+                                 reply_markup=level_keyboard, languages=[])
 
     elif current_state == "FormFillingStates:q15_other_lang":
         await state.set_state(FormFillingStates.q14_eng_lang)
-        await edit_form_question(
-            call, bot, state, text_to_cut="Ingiliz tili:",
-            question_text="<b>Ingiliz tilida suhbatlashish darajangiz:</b>",
-            reply_markup=level_keyboard)
-        languages = state_data["languages"]
-        languages = languages[:1]
-        await state.update_data(languages=languages)
+        await edit_form_question(call, bot, state, question_text="<b>Ingiliz tilida suhbatlashish darajangiz:</b>",
+                                 reply_markup=level_keyboard, languages=state_data["languages"][:1])
 
     elif current_state == "FormFillingStates:lang_name":
         await state.set_state(FormFillingStates.q15_other_lang)
-        state_data = await state.get_data()
-        form_text = state_data["form_text"]
-        languages = state_data["languages"]
-        # Searching text about last added language
-        text_to_cut = regexp_findall(r"Ingiliz tili: \d{0,3}%\n", form_text)
-        if len(languages) > 2:  # If user didn't add other language
-            last_answer_index = form_text.find(text_to_cut[0]) + len(text_to_cut[0])
-            form_text = form_text[:last_answer_index]  # Form text where deleted the answer to last question
-            await bot.edit_message_text(text="<b>Yana boshqa bir tilni bilasizmi?</b>",
-                                        chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                        reply_markup=confirming_keyboard)
-            await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                        message_id=state_data["form_message_id"])
-        else: 
-            await bot.edit_message_text(text="<b>Yana boshqa bir tilni bilasizmi?</b>",
-                                        chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                        reply_markup=confirming_keyboard)
-
-        languages = languages[:2]  # Deleting data about other languages
-        await state.update_data(form_text=form_text, languages=languages)
+        # Deleting data about other languages
+        await edit_form_question(call, bot, state, question_text="<b>Yana boshqa bir tilni bilasizmi?</b>",
+                                 reply_markup=confirming_keyboard, languages=state_data["languages"][:2])
 
     elif current_state == "FormFillingStates:lang_level":
         await state.set_state(FormFillingStates.q15_other_lang)
-        state_data = await state.get_data()
-        form_text = state_data["form_text"]
-        last_answer_index = form_text.find(f"{state_data['lang_name'].capitalize()}:")
-        form_text = form_text[:last_answer_index]  # Form text where deleted the answer to last question
-        await bot.edit_message_text(text="<b>Yana boshqa bir tilni bilasizmi?</b>",
-                                    chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                    reply_markup=confirming_keyboard)
-        await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                    message_id=state_data["form_message_id"])
-        await state.update_data(form_text=form_text)
+        await edit_form_question(call, bot, state, question_text="<b>Yana boshqa bir tilni bilasizmi?</b>",
+                                 reply_markup=confirming_keyboard, lang_name=None)
 
     elif current_state == "FormFillingStates:q16_word_app":
         await state.set_state(FormFillingStates.q15_other_lang)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Dasturlar:</b>",
-            question_text="<b>Yana boshqa bir tilni bilasizmi?</b>",
-            reply_markup=confirming_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Yana boshqa bir tilni bilasizmi?</b>",
+                                 reply_markup=confirming_keyboard, applications=None)
 
     elif current_state == "FormFillingStates:q17_excel_app":
         await state.set_state(FormFillingStates.q16_word_app)
-        await edit_form_question(
-            call, bot, state, text_to_cut="Word:",
-            question_text="<b>Word dasturidan foydalana olish darajangiz:</b>",
-            reply_markup=level_keyboard)
-        await state.update_data(applications=[])
+        await edit_form_question(call, bot, state, question_text="<b>Word dasturidan foydalana olish darajangiz:</b>",
+                                 reply_markup=level_keyboard, applications=[])
 
     elif current_state == "FormFillingStates:q18_1c_app":
         await state.set_state(FormFillingStates.q17_excel_app)
-        await edit_form_question(
-            call, bot, state, text_to_cut="Excel:",
-            question_text="<b>Excel dasturidan foydalana olish darajangiz:</b>",
-            reply_markup=level_keyboard)
-        applications = state_data["applications"]
-        applications = applications[:1]
-        await state.update_data(applications=applications)
+        await edit_form_question(call, bot, state, question_text="<b>Excel dasturidan foydalana olish darajangiz:</b>",
+                                 reply_markup=level_keyboard, applications=state_data["applications"][:1])
 
     elif current_state == "FormFillingStates:q19_other_app":
         await state.set_state(FormFillingStates.q18_1c_app)
-        await edit_form_question(
-            call, bot, state, text_to_cut="1C:",
-            question_text="<b>1C dasturidan foydalana olish darajangiz:</b>",
-            reply_markup=level_keyboard)
-        applications = state_data["applications"]
-        applications = applications[:2]
-        await state.update_data(applications=applications)
+        await edit_form_question(call, bot, state, question_text="<b>1C dasturidan foydalana olish darajangiz:</b>",
+                                 reply_markup=level_keyboard, applications=state_data["applications"][:2])
 
     elif current_state in ["FormFillingStates:app_name", "FormFillingStates:q20_working_style"]:
         await state.set_state(FormFillingStates.q19_other_app)
-        state_data = await state.get_data()
-        form_text = state_data["form_text"]
-        applications = state_data["applications"]
-        # Searching text about last added application
-        text_to_cut = regexp_findall(r"1C: \d{0,3}%\n", form_text)
-        if len(state_data["applications"]) > 3:  # If user didn't add other application
-            last_answer_index = form_text.find(text_to_cut[0]) + len(text_to_cut[0])
-            form_text = form_text[:last_answer_index]  # Form text where deleted the answer to last question
-            await bot.edit_message_text(text="<b>Yana boshqa bir dasturni bilasizmi?</b>",
-                                        chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                        reply_markup=confirming_keyboard)
-            await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                        message_id=state_data["form_message_id"])
-        else: 
-            await bot.edit_message_text(text="<b>Yana boshqa bir dasturni bilasizmi?</b>",
-                                        chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                        reply_markup=confirming_keyboard)
-
-        applications = applications[:3]  # Deleting data about other applications
-        await state.update_data(form_text=form_text, applications=applications)
+        # Deleting data about other applications
+        await edit_form_question(call, bot, state, question_text="<b>Yana boshqa bir dasturni bilasizmi?</b>",
+                                 reply_markup=confirming_keyboard, applications=state_data["applications"][:3])
 
     elif current_state == "FormFillingStates:app_level":
         await state.set_state(FormFillingStates.q19_other_app)
-        state_data = await state.get_data()
-        form_text = state_data["form_text"]
-        last_answer_index = form_text.find(f"{state_data['app_name'].capitalize()}:")
-        form_text = form_text[:last_answer_index]  # Form text where deleted the answer to last question
-        await bot.edit_message_text(text="<b>Yana boshqa biron dasturni bilasizmi?</b>",
-                                    chat_id=call.message.chat.id, message_id=state_data["question_message_id"],
-                                    reply_markup=confirming_keyboard)
-        await bot.edit_message_text(text=form_text, chat_id=call.message.chat.id,
-                                    message_id=state_data["form_message_id"])
-        await state.update_data(form_text=form_text)
+        await edit_form_question(call, bot, state, question_text="<b>Yana boshqa biron dasturni bilasizmi?</b>",
+                                 reply_markup=confirming_keyboard, app_name=None)
 
     elif current_state == "FormFillingStates:q21_salary":
         await state.set_state(FormFillingStates.q20_working_style)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Ishlash uslubi:</b>",
-            question_text="<b>Qanday ishlashni afzal ko'rasiz?</b>",
-            reply_markup=working_style_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>Qanday ishlashni afzal ko'rasiz?</b>",
+                                 reply_markup=working_style_keyboard, working_style=None)
 
     elif current_state == "FormFillingStates:q22_positive_assessment":
         await state.set_state(FormFillingStates.q21_salary)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Oylik maoshi:</b>",
-            question_text="<b>Qancha oylik maoshiga ishlagan bo'lar edingiz?</b>",
-            reply_markup=salary_keyboard)
+        await edit_form_question(call, bot, state,
+                                 question_text="<b>Qancha oylik maoshiga ishlagan bo'lar edingiz?</b>",
+                                 reply_markup=salary_keyboard, salary=None)
 
     elif current_state == "FormFillingStates:q23_negative_assessment":
         await state.set_state(FormFillingStates.q22_positive_assessment)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Ijobiy ta'rif:</b>",
-            question_text="<b>O'zingizga qanday ijobiy ta'rif bera olasiz?</b>",
-            reply_markup=menu_navigation_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>O'zingizga qanday ijobiy ta'rif bera olasiz?</b>",
+                                 reply_markup=menu_navigation_keyboard, positive_assessment=None)
 
     elif current_state == "FormFillingStates:q24_photo":
         await state.set_state(FormFillingStates.q23_negative_assessment)
-        await edit_form_question(
-            call, bot, state, text_to_cut="<b>Salbiy ta'rif:</b>",
-            question_text="<b>O'zingizga qanday salbiy ta'rif bera olasiz?</b>",
-            reply_markup=menu_navigation_keyboard)
+        await edit_form_question(call, bot, state, question_text="<b>O'zingizga qanday salbiy ta'rif bera olasiz?</b>",
+                                 reply_markup=menu_navigation_keyboard, negative_assessment=None)
 
 # ====================================================Back Buttons==================================================== #
@@ -1,14 +1,22 @@
-import logging
 from datetime import datetime
 from typing import Optional, Union
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from cachetools import LRUCache, TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tgbot.database.functions.functions import get_forms, get_professions, get_directions, is_form_updated
+from tgbot.database.functions.cache import catalog_cache
+from tgbot.database.functions.functions import get_forms, get_professions, get_directions
+from tgbot.database.models.models import MailingJobs, MailingStatusesEnum
 from tgbot.misc.cbdata import MainCallbackFactory
 
+# Keyboards built from the catalogs, keys contain the catalog version, so old keyboards are never served
+catalog_keyboards = LRUCache(maxsize=1024)
+# Pages of the admins' list of forms by filter, action, cursor and counter. Admins click through the same pages
+# while viewing forms, ttl bounds staleness of names and stars
+forms_pages = TTLCache(maxsize=1024, ttl=60)
+
 admin_functions = InlineKeyboardMarkup(
     inline_keyboard=[
         [
@@ -19,6 +27,10 @@ admin_functions = InlineKeyboardMarkup(
             InlineKeyboardButton(text="\U00002709 E'lon berish",  # Emoji "envelope"
                                  callback_data=MainCallbackFactory(action="mailing").pack())
         ],
+        [
+            InlineKeyboardButton(text="\U0001F4E8 Jo'natmalar",  # Emoji "incoming_envelope"
+                                 callback_data=MainCallbackFactory(action="show_mailings").pack())
+        ],
         [
             InlineKeyboardButton(text="\U0001F3E0",  # Emoji "house"
                                  callback_data=MainCallbackFactory(action="home").pack())
@@ -231,11 +243,14 @@ async def make_professions_keyboard(session: AsyncSession, checked_professions:
 ]:
     """  Make a keyboard that contains a list of professions and check or uncheck it
     when user selects that button  """
-    builder = InlineKeyboardBuilder()
     all_professions = {k: v for k, v in await get_professions(session)}
     if not all_professions:
         return None
-    checked_professions = checked_professions
+    key = ("professions", catalog_cache.version("professions"), frozenset(checked_professions),
+           last_selected_profession, is_check)
+    if key in catalog_keyboards:
+        return catalog_keyboards[key]
+    builder = InlineKeyboardBuilder()
 
     for profession_id, title in all_professions.items():
         # Uncheck button if user has already checked this button
@@ -263,15 +278,19 @@ async def make_professions_keyboard(session: AsyncSession, checked_professions:
             text="\U0001F3E0",  # Emoji "house"
             callback_data=MainCallbackFactory(action="home").pack())
     )
-    return builder.as_markup()
+    keyboard = catalog_keyboards[key] = builder.as_markup()
+    return keyboard
 
 
 async def make_professions_keyboard_for_admin(session: AsyncSession) -> Optional[
     InlineKeyboardMarkup
 ]:
     """  Make a keyboard that contains a list of professions with emoji "X"  """
-    builder = InlineKeyboardBuilder()
     all_professions = {k: v for k, v in await get_professions(session)}
+    key = ("professions_for_admin", catalog_cache.version("professions"))
+    if key in catalog_keyboards:
+        return catalog_keyboards[key]
+    builder = InlineKeyboardBuilder()
     counter = 1  # Using it to numerate the buttons
 
     for profession_id, title in all_professions.items():
@@ -284,15 +303,19 @@ async def make_professions_keyboard_for_admin(session: AsyncSession) -> Optional
         text="\U0001F3E0",  # Emoji "house"
         callback_data=MainCallbackFactory(action="home").pack())
     )
-    return builder.as_markup()
+    keyboard = catalog_keyboards[key] = builder.as_markup()
+    return keyboard
 
 
 async def make_directions_keyboard(session: AsyncSession, with_cross: bool = False) -> Optional[
     InlineKeyboardMarkup
 ]:
     """  Make a keyboard that contains a list of university directions  """
-    builder = InlineKeyboardBuilder()
     all_directions = {k: v for k, v in await get_directions(session)}
+    key = ("directions", catalog_cache.version("directions"), with_cross)
+    if key in catalog_keyboards:
+        return catalog_keyboards[key]
+    builder = InlineKeyboardBuilder()
     counter = 1
 
     if with_cross:
@@ -320,26 +343,68 @@ async def make_directions_keyboard(session: AsyncSession, with_cross: bool = Fal
                 text="\U0001F3E0",  # Emoji "house"
                 callback_data=MainCallbackFactory(action="home").pack())
         )
+    keyboard = catalog_keyboards[key] = builder.as_markup()
+    return keyboard
+
+
+def make_mailing_jobs_keyboard(jobs: list[MailingJobs]) -> InlineKeyboardMarkup:
+    """  Make a keyboard to pause, resume or cancel the given mailing jobs  """
+    builder = InlineKeyboardBuilder()
+    for job in jobs:
+        buttons = []
+        if job.status == MailingStatusesEnum.RUNNING:
+            buttons.append(InlineKeyboardButton(
+                text=f"#{job.job_id} \U000023F8",  # Emoji "pause_button"
+                callback_data=MainCallbackFactory(action="mailing_pause", data=job.job_id).pack()))
+        elif job.status == MailingStatusesEnum.PAUSED:
+            buttons.append(InlineKeyboardButton(
+                text=f"#{job.job_id} \U000025B6",  # Emoji "arrow_forward"
+                callback_data=MainCallbackFactory(action="mailing_resume", data=job.job_id).pack()))
+        if job.status in (MailingStatusesEnum.RUNNING, MailingStatusesEnum.PAUSED):
+            buttons.append(InlineKeyboardButton(
+                text=f"#{job.job_id} \U0000274C",  # Emoji "x"
+                callback_data=MainCallbackFactory(action="mailing_cancel", data=job.job_id).pack()))
+            builder.row(*buttons)
+    builder.row(
+        InlineKeyboardButton(text="\U00002B05", callback_data=MainCallbackFactory(action="back").pack()),
+        InlineKeyboardButton(text="\U0001F3E0", callback_data=MainCallbackFactory(action="home").pack())
+    )
     return builder.as_markup()
 
 
-async def make_forms_keyboard(session: AsyncSession, begin: Optional[datetime] = None, action: str = "first",
-                              filter_type: str = None, counter: int = 0):
-    # Getting forms from database
-    db_data = await get_forms(session, begin, action, filter_type)
-    forms_dict = db_data["forms_dict"]
+def dump_cursor(cursor: Optional[tuple]) -> Optional[list]:
+    """  Make a JSON serializable cursor of the forms list to save it in the state  """
+    return [cursor[0].isoformat(), cursor[1]] if cursor is not None else None
+
+
+def load_cursor(cursor: Optional[list]) -> Optional[tuple]:
+    return (datetime.fromisoformat(cursor[0]), cursor[1]) if cursor is not None else None
+
+
+async def make_forms_keyboard(session: AsyncSession, cursor: Optional[list] = None, action: str = "first",
+                              filter_type: str = None, counter: int = 0) -> dict:
+    """  Get a page of the admins' list of forms from the cache, or build it if it isn't there  """
+    key = (filter_type, action, tuple(cursor) if cursor is not None else None, counter)
+    keyboard_data = forms_pages.get(key)
+    if keyboard_data is None:
+        keyboard_data = forms_pages[key] = await build_forms_keyboard(session, cursor, action, filter_type, counter)
+    return keyboard_data
+
+
+async def build_forms_keyboard(session: AsyncSession, cursor: Optional[list], action: str, filter_type: Optional[str],
+                               counter: int) -> dict:
+    # Getting a page of forms from database
+    page = await get_forms(session, load_cursor(cursor), action, filter_type)
     # Creating a form list with inline keyboard
     inline_keyboard = InlineKeyboardBuilder()
-    if forms_dict:
+    if page.rows:
         text = ""
-        for key in forms_dict:
+        for row in page.rows:
             counter += 1
-            if await is_form_updated(session, key):
-                text += f"{counter}. {forms_dict[key]}*\n"
-            else:
-                text += f"{counter}. {forms_dict[key]}\n"
-            inline_keyboard.row(InlineKeyboardButton(text=counter, callback_data=MainCallbackFactory(action="select",
-                                                                                                     data=key).pack()))
+            # Updated forms are marked with a star
+            text += f"{counter}. {row.full_name}{'*' if row.is_updated else ''}\n"
+            inline_keyboard.row(InlineKeyboardButton(text=counter, callback_data=MainCallbackFactory(
+                action="select", data=row.form_id).pack()))
         inline_keyboard.adjust(5)
     else:
         text = "Anketa mavjud emas!"
@@ -367,35 +432,23 @@ async def make_forms_keyboard(session: AsyncSession, begin: Optional[datetime] =
         inline_keyboard.row(InlineKeyboardButton(
             text=f"Filter - Kurs: {filter_type}",
             callback_data=MainCallbackFactory(action="filter", data=filter_type).pack()), width=1)
-    # Make next button if it's first row
-    smallest_date = datetime.timestamp(db_data["smallest_date"]) if db_data["smallest_date"] else None
-    biggest_date = datetime.timestamp(db_data["biggest_date"]) if db_data["biggest_date"] else None
-    first_row_date = datetime.timestamp(db_data["first_row_date"]) if db_data["first_row_date"] else None
-    last_row_date = datetime.timestamp(db_data["last_row_date"]) if db_data["last_row_date"] else None
-    logging.info(f"{smallest_date=}")
-    logging.info(f"{biggest_date=}")
-    logging.info(f"{first_row_date=}")
-    logging.info(f"{last_row_date=}")
-
-    if smallest_date is not None and biggest_date == last_row_date and smallest_date != first_row_date:
-        inline_keyboard.row(InlineKeyboardButton(text="\U000023ED", callback_data=MainCallbackFactory(
-            action="next", counter=counter).pack()))
-    elif biggest_date is not None and smallest_date == first_row_date and biggest_date != last_row_date:
-        inline_keyboard.row(InlineKeyboardButton(text="\U000023EE", callback_data=MainCallbackFactory(
-            action="previous", counter=counter).pack()))
-    elif biggest_date is not None and biggest_date != last_row_date and smallest_date != first_row_date:
-        inline_keyboard.row(InlineKeyboardButton(text="\U000023EE", callback_data=MainCallbackFactory(
+    # Making previous and next buttons if there are forms before or after the page
+    navigation_buttons = []
+    if page.has_previous:
+        navigation_buttons.append(InlineKeyboardButton(text="\U000023EE", callback_data=MainCallbackFactory(
             action="previous", counter=counter).pack()))
-        inline_keyboard.add(InlineKeyboardButton(text="\U000023ED", callback_data=MainCallbackFactory(
+    if page.has_next:
+        navigation_buttons.append(InlineKeyboardButton(text="\U000023ED", callback_data=MainCallbackFactory(
             action="next", counter=counter).pack()))
+    if navigation_buttons:
+        inline_keyboard.row(*navigation_buttons)
 
     inline_keyboard.row(
         InlineKeyboardButton(text="\U00002B05", callback_data=MainCallbackFactory(action="back").pack()),
         InlineKeyboardButton(text="\U0001F3E0", callback_data=MainCallbackFactory(action="home").pack())
     )
 
-    # Making a JSON because InlineKeyboardMarkup isn't JSON serializable
-    # You can deserialize it using InlineKeyboardMarkup.parse_raw(keyboard_markup_json_here)
-    keyboard_data = {"keyboard": inline_keyboard.as_markup().json(), "text": text, "smallest_date": smallest_date,
-                     "biggest_date": biggest_date}
+    # Only cursors of the page are saved in the state, the keyboard itself stays in the cache
+    keyboard_data = {"keyboard": inline_keyboard.as_markup(), "text": text,
+                     "first_cursor": dump_cursor(page.first_cursor), "last_cursor": dump_cursor(page.last_cursor)}
     return keyboard_data
@@ -1,18 +1,15 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from tgbot.config import Config
-from tgbot.database.models.models import Users
+from tgbot.database.functions.functions import get_user_profile
 
 
-async def make_menu_keyboard(session: AsyncSession, current_user_id: int, config: Config):
-    form_id = await session.scalar(select(Users.form_id).where(Users.telegram_id == current_user_id))
+def build_menu_keyboard(has_form: bool, is_admin: bool) -> ReplyKeyboardMarkup:
     keyboard = ReplyKeyboardBuilder()
-    admin_ids = config.tgbot.admins
 
-    if form_id:
+    if has_form:
         keyboard.row(KeyboardButton(text="\U0001f4dd Anketamni yangilash"))  # Emoji "memo"
         keyboard.row(
             KeyboardButton(text="\U0001F4CB Mening anketam"),  # Emoji "clipboard"
@@ -22,8 +19,6 @@ async def make_menu_keyboard(session: AsyncSession, current_user_id: int, config
             KeyboardButton(text="\U0001F4AC Qayta aloqa"),  # Emoji "speech_balloon"
             KeyboardButton(text="\U0000260E Kontaktlar")  # Emoji "office_building"
         )
-        if current_user_id in admin_ids:
-            keyboard.row(KeyboardButton(text="\U000026A1"))  # Emoji "Zap"
     else:
         keyboard.row(KeyboardButton(text="\U0001f4dd Anketa to'ldirish"))  # Emoji "memo"
         keyboard.row(
@@ -33,12 +28,24 @@ async def make_menu_keyboard(session: AsyncSession, current_user_id: int, config
             KeyboardButton(text="\U0001f3e2 Biz haqimizda"),  # Emoji "office_building"
             KeyboardButton(text="\U0000260E Kontaktlar")  # Emoji "office_building"
         )
-        if current_user_id in admin_ids:
-            keyboard.row(KeyboardButton(text="\U000026A1"))  # Emoji "Zap"
+    if is_admin:
+        keyboard.row(KeyboardButton(text="\U000026A1"))  # Emoji "Zap"
 
     return keyboard.as_markup(resize_keyboard=True)
 
 
+# Menu keyboards by (has_form, is_admin), they never change, so they are built once
+menu_keyboards = {
+    (has_form, is_admin): build_menu_keyboard(has_form, is_admin)
+    for has_form in (True, False) for is_admin in (True, False)
+}
+
+
+async def make_menu_keyboard(session: AsyncSession, current_user_id: int, config: Config):
+    profile = await get_user_profile(session, current_user_id)
+    return menu_keyboards[bool(profile.form_id), current_user_id in config.tgbot.admins]
+
+
 home_keyboard = ReplyKeyboardMarkup(
     keyboard=[[KeyboardButton(text="\U0001F3E0")]],  # Emoji "home"
     input_field_placeholder="Tushunarli qilib yozing :)",
@@ -1,13 +1,39 @@
-from typing import Callable, Awaitable, Dict, Any
+import logging
+from typing import Callable, Awaitable, Dict, Any, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class LazySession:
+    """  Proxy of AsyncSession that creates the session only when a handler uses it for the first time  """
+
+    def __init__(self, session_pool: Callable[[], AsyncSession]):
+        self._session_pool = session_pool
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def used(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_pool()
+        return getattr(self._session, name)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
 
 
 class DbSessionMiddleware(BaseMiddleware):
-    def __init__(self, session_pool):
+    def __init__(self, session_pool, log_every: int = 1000):
         super().__init__()
         self.session_pool = session_pool
+        self.log_every = log_every
+        self.updates_count = 0
+        self.used_count = 0
 
     async def __call__(
             self,
@@ -15,6 +41,16 @@ class DbSessionMiddleware(BaseMiddleware):
             event: TelegramObject,
             data: Dict[str, Any],
     ) -> Any:
-        async with self.session_pool() as session:
-            data["session"] = session
+        session = LazySession(self.session_pool)
+        data["session"] = session
+        try:
             return await handler(event, data)
+        finally:
+            await session.close()
+            self.count_usage(session.used)
+
+    def count_usage(self, used: bool):
+        self.updates_count += 1
+        self.used_count += used
+        if self.updates_count % self.log_every == 0:
+            logging.info(f"Database was used by {self.used_count} of {self.updates_count} updates")
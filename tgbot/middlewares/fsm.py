@@ -0,0 +1,92 @@
+import copy
+from typing import Callable, Dict, Any, Awaitable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType
+from aiogram.types import Message
+
+from tgbot.misc.storage import HashRedisStorage
+
+
+class BufferedFSMContext(FSMContext):
+    """
+    FSM context for one update: state and data are read from the storage once, later reads are served from memory
+    and changes are written by flush() in one round trip
+    """
+
+    def __init__(self, context: FSMContext, raw_state: Optional[str]):
+        super().__init__(bot=context.bot, storage=context.storage, key=context.key)
+        self.state = raw_state  # Already read by the FSM middleware of the dispatcher
+        self.data: Optional[Dict[str, Any]] = None  # Read on the first use
+        self.state_changed = False
+        self.data_replaced = False
+        self.changed_fields: set[str] = set()
+
+    async def set_state(self, state: StateType = None) -> None:
+        self.state = state.state if isinstance(state, State) else state
+        self.state_changed = True
+
+    async def get_state(self) -> Optional[str]:
+        return self.state
+
+    async def load_data(self) -> Dict[str, Any]:
+        if self.data is None:
+            self.data = await self.storage.get_data(bot=self.bot, key=self.key)
+        return self.data
+
+    async def set_data(self, data: Dict[str, Any]) -> None:
+        self.data = copy.deepcopy(data)
+        self.data_replaced = True
+        self.changed_fields.clear()
+
+    async def get_data(self) -> Dict[str, Any]:
+        # Copy, so handlers changing lists of the data don't change it before update_data
+        return copy.deepcopy(await self.load_data())
+
+    async def update_data(self, data: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        changes = {**(data or {}), **kwargs}
+        (await self.load_data()).update(copy.deepcopy(changes))
+        self.changed_fields.update(changes)
+        return copy.deepcopy(self.data)
+
+    async def flush(self):
+        """  Write changes of the update to the storage  """
+        if not (self.state_changed or self.data_replaced or self.changed_fields):
+            return
+        if self.data_replaced:
+            fields = self.data
+        else:
+            fields = {name: self.data[name] for name in self.changed_fields}
+        if isinstance(self.storage, HashRedisStorage):
+            await self.storage.save(bot=self.bot, key=self.key, state=self.state if self.state_changed else ...,
+                                    fields=fields, replace=self.data_replaced)
+        else:
+            if self.state_changed:
+                await self.storage.set_state(bot=self.bot, key=self.key, state=self.state)
+            if self.data_replaced:
+                await self.storage.set_data(bot=self.bot, key=self.key, data=fields)
+            elif fields:
+                await self.storage.update_data(bot=self.bot, key=self.key, data=fields)
+        self.state_changed = self.data_replaced = False
+        self.changed_fields.clear()
+
+
+class FSMBufferMiddleware(BaseMiddleware):
+    """  Replaces FSM context of the handler with a buffered one and writes its changes when the handler returns  """
+
+    async def __call__(
+            self,
+            handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+            event: Message,
+            data: Dict[str, Any]
+    ) -> Any:
+        context: Optional[FSMContext] = data.get("state")
+        if context is None:
+            return await handler(event, data)
+        buffered = data["state"] = BufferedFSMContext(context, data.get("raw_state"))
+        try:
+            return await handler(event, data)
+        finally:
+            await buffered.flush()
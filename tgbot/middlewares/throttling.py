@@ -1,12 +1,17 @@
+import itertools
+import logging
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
 from aiogram.dispatcher.flags import get_flag
 from aiogram.types import Message
 from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 
 class ThrottlingMiddleware(BaseMiddleware):
+    """  In-memory throttling, works only when the bot runs in one process  """
     caches = {
         "default": TTLCache(maxsize=10_000, ttl=1)
     }
@@ -23,4 +28,54 @@ class ThrottlingMiddleware(BaseMiddleware):
                 return
             else:
                 self.caches[throttling_key][event.chat.id] = None
-        return await handler(event, data)
\ No newline at end of file
+        return await handler(event, data)
+
+
+# Sliding window: timestamps of allowed events are kept in a sorted set, the clock is Redis' one,
+# so limits are the same for all processes and hosts
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local window = tonumber(ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], 0, now - window)
+if redis.call("ZCARD", KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call("ZADD", KEYS[1], now, now .. ":" .. ARGV[3])
+redis.call("PEXPIRE", KEYS[1], math.ceil(window / 1000))
+return 1
+"""
+
+
+class RedisThrottlingMiddleware(BaseMiddleware):
+    """  Throttling shared by all processes of the bot, the check and the update are atomic in one Lua script  """
+    limits = {
+        "default": (1, 1.0)  # Count of messages allowed per period in seconds
+    }
+
+    def __init__(self, redis: Redis, prefix: str = "throttling"):
+        self.redis = redis
+        self.prefix = prefix
+        self.script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+        self.counter = itertools.count()  # Makes members of the sorted set unique
+
+    async def is_allowed(self, throttling_key: str, chat_id: int) -> bool:
+        limit, period = self.limits[throttling_key]
+        try:
+            return bool(await self.script(keys=[f"{self.prefix}:{throttling_key}:{chat_id}"],
+                                          args=[limit, int(period * 1_000_000), f"{id(self)}:{next(self.counter)}"]))
+        except RedisError:
+            logging.exception("Throttling is skipped, Redis is unavailable")
+            return True
+
+    async def __call__(
+            self,
+            handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+            event: Message,
+            data: Dict[str, Any],
+    ) -> Any:
+        throttling_key = get_flag(data, "throttling_key")
+        if throttling_key is not None and throttling_key in self.limits:
+            if not await self.is_allowed(throttling_key, event.chat.id):
+                return
+        return await handler(event, data)
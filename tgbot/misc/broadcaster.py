@@ -1,39 +1,156 @@
 import asyncio
+import enum
 import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional
 
 from aiogram import Bot
 from aiogram import exceptions
+from cachetools import TTLCache
 
 
-async def send_message(bot: Bot, user_id, text: str, disable_notification: bool = False) -> bool:
-    try:
-        await bot.send_message(user_id, text, disable_notification=disable_notification)
-    except exceptions.TelegramForbiddenError:
-        logging.error(f"Target [ID:{user_id}]: got TelegramForbiddenError")
-    except exceptions.TelegramRetryAfter as e:
-        logging.error(f"Target [ID:{user_id}]: Flood limit is exceeded. Sleep {e.retry_after} seconds.")
-        await asyncio.sleep(e.retry_after)
-        return await send_message(bot, user_id, text)  # Recursive call
-    except exceptions.TelegramAPIError:
-        logging.exception(f"Target [ID:{user_id}]: failed")
-    else:
-        logging.info(f"Target [ID:{user_id}]: success")
-        return True
-    return False
-
-
-async def broadcast(bot, users, text) -> int:
+class SendStatus(enum.Enum):
+    SENT = "SENT"
+    FORBIDDEN = "FORBIDDEN"
+    FAILED = "FAILED"
+
+
+@dataclass
+class BroadcastReport:
+    results: dict[int, SendStatus] = field(default_factory=dict)
+    errors: dict[int, str] = field(default_factory=dict)
+    retries: int = 0
+
+    @property
+    def count(self) -> int:
+        """  Count of recipients that successfully got the message  """
+        return sum(1 for status in self.results.values() if status == SendStatus.SENT)
+
+
+class TokenBucket:
+    """  Token bucket limiter: allows 'rate' operations per second with bursts up to 'capacity'  """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """  Stop giving tokens for the given time, e.g. after Telegram's 'retry after' error  """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.updated_at = self.paused_until  # Tokens are not refilled during the pause
+        self.tokens = 0
+
+    async def acquire(self, tokens: float = 1):
+        if tokens > self.capacity:  # The bucket never holds more than 'capacity' tokens, so it would wait forever
+            raise ValueError(f"Can't acquire {tokens} tokens from a bucket with capacity {self.capacity}")
+        async with self.lock:  # Waiters are served one by one in order of arrival
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class Broadcaster:
+    """
+    Sends messages to many chats with N concurrent senders behind shared token buckets:
+    one global bucket for the whole bot (Telegram allows about 30 messages per second)
+    and one bucket per chat (about 1 message per second to the same chat)
+    """
+
+    def __init__(self, rate: float = 30, per_chat_rate: float = 1, workers: int = 10, max_retries: int = 3):
+        self.global_bucket = TokenBucket(rate)
+        self.chat_buckets = TTLCache(maxsize=100_000, ttl=60)
+        self.per_chat_rate = per_chat_rate
+        self.workers = workers
+        self.max_retries = max_retries
+
+    def chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.per_chat_rate, capacity=1)
+        return bucket
+
+    async def throttle(self, chat_id: int, messages: int = 1):
+        """  Wait until it is allowed to send the given count of messages to the chat  """
+        bucket = self.chat_bucket(chat_id)
+        for _ in range(messages):  # One token per message, the chat bucket holds only one
+            await bucket.acquire()
+            await self.global_bucket.acquire()
+
+    async def send_one(self, chat_id: int, send: Callable[[int], Awaitable], report: BroadcastReport,
+                       messages: int = 1):
+        """  Send to one chat, retrying after flood control errors without recursion  """
+        for _ in range(self.max_retries + 1):
+            await self.throttle(chat_id, messages)
+            try:
+                await send(chat_id)
+            except exceptions.TelegramRetryAfter as error:
+                logging.error(f"Target [ID:{chat_id}]: Flood limit is exceeded. Sleep {error.retry_after} seconds.")
+                self.global_bucket.pause(error.retry_after)  # Flood control is global, so all senders wait
+                report.retries += 1
+                continue
+            except exceptions.TelegramForbiddenError as error:
+                logging.error(f"Target [ID:{chat_id}]: got TelegramForbiddenError")
+                report.results[chat_id] = SendStatus.FORBIDDEN
+                report.errors[chat_id] = str(error)
+            except exceptions.TelegramAPIError as error:
+                logging.exception(f"Target [ID:{chat_id}]: failed")
+                report.results[chat_id] = SendStatus.FAILED
+                report.errors[chat_id] = str(error)
+            else:
+                logging.info(f"Target [ID:{chat_id}]: success")
+                report.results[chat_id] = SendStatus.SENT
+            return
+        report.results[chat_id] = SendStatus.FAILED
+        report.errors[chat_id] = "Flood limit retries are exhausted"
+
+    async def run(self, chat_ids: Iterable[int], send: Callable[[int], Awaitable], messages: int = 1,
+                  report: Optional[BroadcastReport] = None) -> BroadcastReport:
+        """
+        Call 'send(chat_id)' for every chat id.
+        :param messages: count of API requests that 'send' makes, it is used for rate limiting
+        :param report: report to fill, pass it to keep partial results if the broadcast gets cancelled
+        :return: Report with a result for every recipient
+        """
+        report = report if report is not None else BroadcastReport()
+        queue = asyncio.Queue()
+        for chat_id in chat_ids:
+            queue.put_nowait(chat_id)
+
+        async def sender():
+            while not queue.empty():
+                chat_id = queue.get_nowait()
+                await self.send_one(chat_id, send, report, messages)
+
+        try:
+            await asyncio.gather(*(sender() for _ in range(min(self.workers, queue.qsize()))))
+        finally:
+            logging.info(f"{report.count} messages successful sent.")
+        return report
+
+
+default_broadcaster = Broadcaster()
+
+
+async def broadcast(bot: Bot, users: Iterable[int], text: str, disable_notification: bool = False,
+                    broadcaster: Broadcaster = default_broadcaster) -> BroadcastReport:
     """
-    Simple broadcaster
-    :return: Count of messages
+    Send the text to every user concurrently within Telegram limits
+    :return: Report with a result for every recipient
     """
-    count = 0
-    try:
-        for user_id in users:
-            if await send_message(bot, user_id, text):
-                count += 1
-            await asyncio.sleep(0.05)  # 20 messages per second (Limit: 30 messages per second)
-    finally:
-        logging.info(f"{count} messages successful sent.")
-
-    return count
+    async def send(user_id: int):
+        await bot.send_message(user_id, text, disable_notification=disable_notification)
+
+    return await broadcaster.run(users, send)
@@ -0,0 +1,114 @@
+import asyncio
+import heapq
+import logging
+import time
+from contextlib import suppress
+from typing import Iterable, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+DELETIONS_KEY = "deletions"  # Sorted set: "chat_id:message_id" -> time when the message must be deleted
+
+POP_DUE_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+if #due > 0 then
+    redis.call("zrem", KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+async def delete_messages(bot: Bot, messages: Iterable[tuple[int, int]], concurrency: int = 10):
+    """
+    Delete (chat_id, message_id) pairs with at most 'concurrency' requests at a time.
+    Messages that are already deleted or too old to be deleted are skipped
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def delete(chat_id: int, message_id: int):
+        async with semaphore:
+            with suppress(TelegramBadRequest):
+                await bot.delete_message(chat_id=chat_id, message_id=message_id)
+
+    results = await asyncio.gather(*(delete(chat_id, message_id) for chat_id, message_id in messages),
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error("Failed to delete a message", exc_info=result)
+
+
+class DeletionScheduler:
+    """
+    Deletes messages (alerts about incorrect answers and so on) after a delay, so handlers return immediately.
+    Due times are kept in a Redis sorted set, so messages scheduled by one process may be deleted by any of them,
+    or in an in-process heap when Redis isn't used. One background loop deletes due messages in batches
+    """
+
+    def __init__(self, batch_size: int = 100, interval: float = 1):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.heap: list[tuple[float, int, int]] = []
+        self.redis: Optional[Redis] = None
+        self.pop_due_script: Optional[AsyncScript] = None
+
+    async def schedule(self, chat_id: int, message_id: int, delay: float):
+        await self.schedule_many([(chat_id, message_id)], delay)
+
+    async def schedule_many(self, messages: Iterable[tuple[int, int]], delay: float = 0):
+        """  Schedule deletion of (chat_id, message_id) pairs in one write  """
+        due_at = time.time() + delay
+        messages = list(messages)
+        if not messages:
+            return
+        if self.redis is not None:
+            with suppress(RedisError):
+                await self.redis.zadd(DELETIONS_KEY, {f"{chat_id}:{message_id}": due_at
+                                                      for chat_id, message_id in messages})
+                return
+        for chat_id, message_id in messages:
+            heapq.heappush(self.heap, (due_at, chat_id, message_id))
+
+    async def pop_due(self) -> list[tuple[int, int]]:
+        """  Take due messages from Redis first, then from the heap, so a Redis failure never loses popped messages  """
+        now = time.time()
+        due = []
+        if self.pop_due_script is not None:
+            try:
+                # Taken atomically, so two processes never delete the same message
+                members = await self.pop_due_script(keys=[DELETIONS_KEY], args=[now, self.batch_size])
+            except RedisError:
+                logging.exception("Failed to take due messages from Redis")
+                members = []
+            for member in members:
+                chat_id, message_id = (member.decode() if isinstance(member, bytes) else member).split(":")
+                due.append((int(chat_id), int(message_id)))
+        while self.heap and self.heap[0][0] <= now and len(due) < self.batch_size:
+            _, chat_id, message_id = heapq.heappop(self.heap)
+            due.append((chat_id, message_id))
+        return due
+
+    async def run(self, bot: Bot, redis: Optional[Redis] = None):
+        """  Delete due messages until the task is cancelled  """
+        if redis is not None:
+            self.redis = redis
+            self.pop_due_script = redis.register_script(POP_DUE_SCRIPT)
+        logging.info("Deletion scheduler started")
+        while True:
+            try:
+                due = await self.pop_due()
+                if due:
+                    await delete_messages(bot, due)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Deletion scheduler failed to delete messages")
+                due = []
+            if len(due) < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+
+deletion_scheduler = DeletionScheduler()
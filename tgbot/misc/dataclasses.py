@@ -33,3 +33,24 @@ class Form:
     username: str
     telegram_id: int
 
+
+@dataclass
+class UserProfile:
+    exists: bool
+    form_id: Optional[int] = None
+
+
+@dataclass
+class RenderedForm:
+    text: str
+    photo_id: str
+    version: str  # Time of the last change of the form, when it was rendered
+
+
+@dataclass
+class Page:
+    rows: list
+    has_next: bool  # There are rows after the last one
+    has_previous: bool  # There are rows before the first one
+    first_cursor: Optional[tuple] = None  # Values of the sort keys of the first row
+    last_cursor: Optional[tuple] = None  # Values of the sort keys of the last row
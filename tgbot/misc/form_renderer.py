@@ -0,0 +1,141 @@
+import enum
+from datetime import date, datetime
+
+from aiogram import html
+
+from tgbot.database.models.models import GendersEnum, NationsEnum, WorkingStylesEnum
+from tgbot.misc.dataclasses import Form
+
+
+class FormView(enum.Enum):
+    ADMIN = "admin"  # Admins' list of forms
+    OWNER = "owner"  # User's own form
+    GROUP = "group"  # Post to the forms group and admins when a form is sent
+
+
+GENDER_LABELS = {GendersEnum.MALE: "Erkak", GendersEnum.FEMALE: "Ayol"}
+NATION_LABELS = {NationsEnum.UZBEK: "O'zbek", NationsEnum.RUSSIAN: "Rus", NationsEnum.OTHER: "Boshqa"}
+WORKING_STYLE_LABELS = {WorkingStylesEnum.COLLECTIVE: "Jamoada", WorkingStylesEnum.INDIVIDUAL: "Individual"}
+SALARY_LABELS = {1: "1 - 2 milion so'm", 2: "3 - 4 million so'm", 3: "5 million so'm va undan yuqori"}
+UNIVERSITY_GRADE_LABELS = {1: "1", 2: "2", 3: "3", 4: "4", 5: "Magistr"}
+MARITAL_STATUS_LABELS = {True: "Turmush qurgan", False: "Turmush qurmagan"}
+DRIVER_LICENSE_LABELS = {True: "Bor", False: "Yo'q"}
+DELETED_DIRECTION_LABEL = "Ma'lumotlar bazasidan o'chirilgan!"
+# Names of the languages and apps which are asked about in every form, other names are capitalized
+LANGUAGE_LABELS = {"rus": "Rus tili", "ingiliz": "Ingiliz tili"}
+APPLICATION_LABELS = {"1c": "1C"}
+
+
+def format_datetime(value: datetime) -> str:
+    return f"{value.day}.{value.month}.{value.year} {value.hour}:{value.minute}:{value.second}"
+
+
+def render_form(form: Form, view: FormView) -> str:
+    """  Make HTML text of the form for the given view in one pass, texts entered by users are escaped  """
+    is_detailed = view != FormView.OWNER  # Admins see titled lists of skills and the user's telegram data
+    level_indent = "    " if is_detailed else ""
+    direction = html.quote(form.direction.capitalize()) if form.direction is not None else DELETED_DIRECTION_LABEL
+    company = "Mavjud emas!" if not form.working_company else \
+        f"\n    <b>Nomi:</b> {html.quote(form.working_company[0])}\n" \
+        f"    <b>Lavozimi:</b> {html.quote(form.working_company[1])}"
+    professions = html.quote(', '.join(form.professions)) if form.professions else 'Mavjud emas!'
+    parts = [
+        f"<b>Ism va Familiya:</b> {html.quote(form.full_name)}\n"
+        f"<b>Tug'ilgan sana:</b> {form.birth_date.day}.{form.birth_date.month}.{form.birth_date.year}\n"
+        f"<b>Jins:</b> {GENDER_LABELS[form.gender]}\n"
+        f"<b>Telefon raqam:</b> {html.quote(form.phonenum)}\n"
+        f"<b>Qiziqtirgan sohalar:</b> {professions}\n"
+        f"<b>Yashash manzil:</b> {html.quote(form.address)}\n"
+        f"<b>Millat:</b> {NATION_LABELS[form.nation]}\n"
+        f"<b>Kurs:</b> {UNIVERSITY_GRADE_LABELS.get(form.university_grade, form.university_grade)}\n"
+        f"<b>Ta'lim yo'nalishi:</b> {direction}\n"
+        f"<b>Ish o'rni:</b> {company}\n"
+        f"<b>Oilaviy ahvol:</b> {MARITAL_STATUS_LABELS[bool(form.marital_status)]}\n"
+        f"<b>Haydovchilik guvohnomasi:</b> {DRIVER_LICENSE_LABELS[bool(form.driver_license)]}\n"
+    ]
+    if is_detailed:
+        parts.append("<b>Tillar:</b>\n")
+    parts.extend(f"{level_indent}<b>{html.quote(name)}:</b> {level}%\n" for name, level in form.languages)
+    if is_detailed:
+        parts.append("<b>Dasturlar:</b>\n")
+    parts.extend(f"{level_indent}<b>{html.quote(name)}:</b> {level}%\n" for name, level in form.apps)
+    parts.append(
+        f"<b>Ishlash uslubi:</b> {WORKING_STYLE_LABELS[form.working_style]}\n"
+        f"<b>Oylik maoshi:</b> {SALARY_LABELS.get(form.wanted_salary, SALARY_LABELS[1])}\n"
+        f"<b>Ijobiy ta'rif:</b> {html.quote(form.positive_assessment)}\n"
+        f"<b>Salbiy ta'rif:</b> {html.quote(form.negative_assessment)}\n"
+    )
+    if is_detailed:
+        parts.append(
+            f"<b>Telegramdagi ismi:</b> {html.quote(form.telegram_name)}\n"
+            f"<b>Telegramdagi nomi:</b> {'Mavjud emas!' if form.username is None else '@' + form.username}\n"
+            f"<b>Telegram ID:</b> {form.telegram_id}\n"
+        )
+    parts.append(f"<b>Tuzilgan vaqt:</b> {format_datetime(form.registered_at)}\n")
+    if form.updated_at:
+        parts.append(f"<b>Yangilangan vaqt:</b> {format_datetime(form.updated_at)}")
+        if view == FormView.GROUP:
+            parts.append("\n<code>YANGILANGAN!</code>")
+    return "".join(parts)
+
+
+def render_levels(levels: list[dict], labels: dict[str, str]) -> str:
+    return "".join(f"{html.quote(labels.get(level['name'], level['name'].capitalize()))}: {level['level']}%\n"
+                   for level in levels)
+
+
+def render_form_preview(answers: dict) -> str:
+    """
+    Make HTML text of the form which is being filled from the answers saved in the state.
+    Unanswered questions are missing or None, so going back to a question only drops its answer.
+    Answers are saved as the user typed them and escaped here
+    """
+    parts = []
+    if answers.get("full_name") is not None:
+        parts.append(f"<b>Ism va Familiya:</b> {html.quote(answers['full_name'])}\n")
+    if answers.get("birth_date") is not None:
+        birth_date = date.fromisoformat(answers["birth_date"])
+        parts.append(f"<b>Tug'ilgan sana:</b> {birth_date.day}.{birth_date.month}.{birth_date.year}\n")
+    if answers.get("gender") is not None:
+        parts.append(f"<b>Jins:</b> {GENDER_LABELS[GendersEnum(answers['gender'])]}\n")
+    if answers.get("phonenum") is not None:
+        parts.append(f"<b>Telefon raqam:</b> {html.quote(answers['phonenum'])}\n")
+    if answers.get("profession_titles") is not None:
+        professions = html.quote(', '.join(answers['profession_titles'])) or 'Mavjud emas!'
+        parts.append(f"<b>Qiziqtirgan sohalar:</b> {professions}\n")
+    if answers.get("address") is not None:
+        parts.append(f"<b>Yashash manzil:</b> {html.quote(answers['address'])}\n")
+    if answers.get("nation") is not None:
+        parts.append(f"<b>Millat:</b> {NATION_LABELS[NationsEnum(answers['nation'])]}\n")
+    if answers.get("university_grade") is not None:
+        parts.append(f"<b>Kurs:</b> {UNIVERSITY_GRADE_LABELS.get(answers['university_grade'])}\n")
+    if answers.get("direction_title") is not None:
+        parts.append(f"<b>Ta'lim yo'nalishi:</b> {html.quote(answers['direction_title'].capitalize())}\n")
+    company = answers.get("company")
+    if company is not None:  # Empty list means the user isn't working, the position may be not answered yet
+        parts.append("<b>Ish o'rni:</b> Mavjud emas!\n" if not company else
+                     f"<b>Ish o'rni:</b>\n    <b>Nomi:</b> {html.quote(company[0])}\n")
+        if len(company) > 1:
+            parts.append(f"    <b>Lavozimi:</b> {html.quote(company[1])}\n")
+    if answers.get("marital_status") is not None:
+        parts.append(f"<b>Oilaviy ahvol:</b> {MARITAL_STATUS_LABELS[bool(answers['marital_status'])]}\n")
+    if answers.get("driver_license") is not None:
+        parts.append(f"<b>Haydovchilik guvohnomasi:</b> {DRIVER_LICENSE_LABELS[bool(answers['driver_license'])]}\n"
+                     f"<b>Tillar:</b>\n")
+        parts.append(render_levels(answers.get("languages") or [], LANGUAGE_LABELS))
+        if answers.get("lang_name") is not None:  # Level of the language is being asked
+            parts.append(f"{html.quote(answers['lang_name'].capitalize())}: ")
+    if answers.get("applications") is not None:
+        parts.append("<b>Dasturlar:</b>\n")
+        parts.append(render_levels(answers["applications"], APPLICATION_LABELS))
+        if answers.get("app_name") is not None:  # Level of the app is being asked
+            parts.append(f"{html.quote(answers['app_name'].capitalize())}: ")
+    if answers.get("working_style") is not None:
+        parts.append(f"<b>Ishlash uslubi:</b> {WORKING_STYLE_LABELS[WorkingStylesEnum(answers['working_style'])]}\n")
+    if answers.get("salary") is not None:
+        parts.append(f"<b>Oylik maoshi:</b> {SALARY_LABELS.get(answers['salary'], SALARY_LABELS[1])}\n")
+    if answers.get("positive_assessment") is not None:
+        parts.append(f"<b>Ijobiy ta'rif:</b> {html.quote(answers['positive_assessment'])}\n")
+    if answers.get("negative_assessment") is not None:
+        parts.append(f"<b>Salbiy ta'rif:</b> {html.quote(answers['negative_assessment'])}\n")
+    return "".join(parts)
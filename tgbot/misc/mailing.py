@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import timedelta
+from typing import Callable, Optional
+
+from aiogram import Bot
+from aiogram import exceptions
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tgbot.database.functions.functions import (get_mailing_jobs, get_mailing_job, claim_mailing_recipients,
+                                                save_mailing_progress, release_mailing_recipients,
+                                                reset_stale_mailing_recipients, finish_mailing_job)
+from tgbot.database.models.models import MailingStatusesEnum
+from tgbot.misc.broadcaster import Broadcaster, BroadcastReport, SendStatus
+from tgbot.misc.updates_stream import RENEW_LEASE_SCRIPT, RELEASE_LEASE_SCRIPT
+
+MAILING_LEASE_KEY = "mailing:owner"
+
+
+class MailingWorker:
+    """
+    Background worker that sends mailing jobs stored in database.
+    Handlers only create a job, the worker claims its recipients in batches, sends the message
+    through the broadcaster's token buckets and saves the progress after every batch, so a restart
+    continues the job from the last checkpoint.
+    With Redis, only the process holding the mailing lease sends, so the rate is global for all replicas
+    """
+
+    def __init__(self, bot: Bot, session_pool: Callable[[], AsyncSession], rate: float = 25,
+                 poll_interval: float = 5, stale_after: timedelta = timedelta(minutes=30),
+                 redis: Optional[Redis] = None, owner_name: str = "", lease_ttl: float = 60):
+        self.bot = bot
+        self.session_pool = session_pool
+        self.broadcaster = Broadcaster(rate=rate)
+        self.batch_size = max(int(rate), 1)  # About one second of sending, so pause and cancel react quickly
+        self.poll_interval = poll_interval
+        # A batch takes about a second, but flood control pauses of Telegram may make it take several minutes.
+        # Recipients claimed earlier than that are left by a worker that crashed
+        self.stale_after = stale_after
+        self.redis = redis
+        self.owner_name = owner_name
+        self.lease_ttl = lease_ttl
+        if redis is not None:
+            self.renew_lease = redis.register_script(RENEW_LEASE_SCRIPT)
+            self.release_lease = redis.register_script(RELEASE_LEASE_SCRIPT)
+
+    async def hold_lease(self) -> bool:
+        """  Take or renew the mailing lease. Return False if another process sends mailings  """
+        if self.redis is None:
+            return True
+        lease_ms = int(self.lease_ttl * 1000)
+        if await self.renew_lease(keys=[MAILING_LEASE_KEY], args=[self.owner_name, lease_ms]):
+            return True
+        return bool(await self.redis.set(MAILING_LEASE_KEY, self.owner_name, nx=True, px=lease_ms))
+
+    async def run(self):
+        logging.info("Mailing worker started")
+        try:
+            await self.process_jobs()
+        finally:
+            if self.redis is not None:
+                with suppress(RedisError):
+                    await self.release_lease(keys=[MAILING_LEASE_KEY], args=[self.owner_name])
+
+    async def process_jobs(self):
+        while True:
+            try:
+                if not await self.hold_lease():
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                async with self.session_pool() as session:
+                    await reset_stale_mailing_recipients(session, older_than=self.stale_after)
+                    jobs = await get_mailing_jobs(session, statuses=[MailingStatusesEnum.RUNNING], limit=100)
+                    job_ids = [job.job_id for job in jobs]
+                sent_any = False
+                for job_id in reversed(job_ids):  # Oldest jobs first
+                    if not await self.hold_lease():  # Renewed before every batch, a batch takes about a second
+                        break
+                    sent_any |= await self.process_batch(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Mailing worker failed to process jobs")
+                sent_any = False
+            if not sent_any:
+                await asyncio.sleep(self.poll_interval)
+
+    async def process_batch(self, job_id: int) -> bool:
+        """  Send one batch of the job. Return False if there was nothing to send  """
+        async with self.session_pool() as session:
+            job = await get_mailing_job(session, job_id)
+            if job is None or job.status != MailingStatusesEnum.RUNNING:
+                return False
+            user_ids = await claim_mailing_recipients(session, job_id, limit=self.batch_size)
+            if not user_ids:
+                if await finish_mailing_job(session, job_id):
+                    await self.notify_admin(session, job_id)
+                return False
+
+        async def send(user_id: int):
+            await self.bot.copy_message(chat_id=user_id, from_chat_id=job.from_chat_id, message_id=job.message_id)
+
+        report = BroadcastReport()
+        try:
+            await self.broadcaster.run(user_ids, send, report=report)
+        finally:
+            sent_ids = [user_id for user_id, status in report.results.items() if status == SendStatus.SENT]
+            failed = {user_id: report.errors[user_id] for user_id, status in report.results.items()
+                      if status != SendStatus.SENT}
+            async with self.session_pool() as session:
+                await save_mailing_progress(session, job_id, sent_ids, failed)
+                not_sent = [user_id for user_id in user_ids if user_id not in report.results]
+                await release_mailing_recipients(session, job_id, not_sent)
+        return True
+
+    async def notify_admin(self, session: AsyncSession, job_id: int):
+        job = await get_mailing_job(session, job_id)
+        with suppress(exceptions.TelegramAPIError):
+            await self.bot.send_message(
+                chat_id=job.admin_id,
+                text=f"<b>E'lon #{job.job_id} jo'natib bo'lindi</b>\U0001F389\n"
+                     f"Jo'natildi: <code>{job.sent}</code>\n"
+                     f"Jo'natilmadi: <code>{job.failed}</code>")
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError
+
+# Request timeouts in seconds by method, other methods use DEFAULT_TIMEOUT
+DEFAULT_TIMEOUT = 30
+UPLOAD_TIMEOUT = 60
+SHORT_TIMEOUT = 10
+METHOD_TIMEOUTS = {
+    "SendPhoto": UPLOAD_TIMEOUT,
+    "SendDocument": UPLOAD_TIMEOUT,
+    "SendVideo": UPLOAD_TIMEOUT,
+    "SendMediaGroup": UPLOAD_TIMEOUT,
+    "CopyMessage": UPLOAD_TIMEOUT,
+    "AnswerCallbackQuery": SHORT_TIMEOUT,
+    "DeleteMessage": SHORT_TIMEOUT,
+    "EditMessageText": SHORT_TIMEOUT,
+    "EditMessageReplyMarkup": SHORT_TIMEOUT,
+}
+# Methods that can be repeated after a network error without sending anything twice
+IDEMPOTENT_PREFIXES = ("Get", "Edit", "Delete", "Set", "AnswerCallbackQuery")
+
+
+@dataclass
+class MethodStats:
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_time: float = 0
+    max_time: float = 0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+
+class InstrumentedAiohttpSession(AiohttpSession):
+    """
+    Bot API session with a tuned connection pool and timeouts by method.
+    Latency, errors and retries are counted per method and logged every 'log_every' requests,
+    to compare time spent on Telegram with time spent on database
+    """
+
+    def __init__(self, pool_size: int = 100, keepalive_timeout: float = 30, dns_cache_ttl: int = 300,
+                 retries: int = 1, timeouts: Optional[Dict[str, float]] = None, log_every: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self._connector_init.update(limit=pool_size, keepalive_timeout=keepalive_timeout, use_dns_cache=True,
+                                    ttl_dns_cache=dns_cache_ttl)
+        self.retries = retries
+        self.timeouts = METHOD_TIMEOUTS if timeouts is None else timeouts
+        self.log_every = log_every
+        self.requests_count = 0
+        self.stats: defaultdict[str, MethodStats] = defaultdict(MethodStats)
+
+    async def make_request(self, bot: Bot, method, timeout: Optional[int] = None):
+        name = type(method).__name__
+        stats = self.stats[name]
+        if timeout is None:  # getUpdates passes its own timeout for long polling
+            timeout = self.timeouts.get(name, DEFAULT_TIMEOUT)
+        attempts = 1 + (self.retries if name.startswith(IDEMPOTENT_PREFIXES) else 0)
+        started = time.monotonic()
+        try:
+            for attempt in range(attempts):
+                try:
+                    return await super().make_request(bot, method, timeout=timeout)
+                except TelegramNetworkError:
+                    if attempt + 1 == attempts:
+                        raise
+                    stats.retries += 1
+                    await asyncio.sleep(0.5 * (attempt + 1))
+        except TelegramAPIError:
+            stats.errors += 1
+            raise
+        finally:
+            stats.add(time.monotonic() - started)
+            self.count_request()
+
+    def count_request(self):
+        self.requests_count += 1
+        if self.requests_count % self.log_every == 0:
+            self.log_stats()
+
+    def log_stats(self):
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].total_time, reverse=True):
+            logging.info(f"Bot API {name}: {stats.count} requests, {stats.errors} errors, {stats.retries} retries, "
+                         f"avg {stats.total_time / stats.count * 1000:.0f} ms, max {stats.max_time * 1000:.0f} ms")
@@ -10,6 +10,7 @@ class AdminStates(StatesGroup):
     mailing_user_id = State()
     mailing_text = State()
     mailing_confirm = State()
+    mailings = State()
 
 
 class ProfessionStates(StatesGroup):
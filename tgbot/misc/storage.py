@@ -0,0 +1,83 @@
+from typing import Any, Dict, Optional, Union
+
+import orjson
+from aiogram import Bot
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+# Data is kept in its own key part, so hashes never collide with JSON strings left by RedisStorage
+DATA_PART = "fields"
+LEGACY_DATA_PART = "data"  # Key part of data saved by RedisStorage as one JSON string
+
+
+class HashRedisStorage(RedisStorage):
+    """
+    FSM storage that keeps data of the state as a Redis hash, one orjson encoded field per key of the data.
+    Updates write only the changed fields, and every write of state and data is one pipelined round trip.
+    Data saved by RedisStorage is moved to the hash on the first read, so users filling a form keep their answers
+    """
+
+    async def save(self, bot: Bot, key: StorageKey, state: Any = ...,
+                   fields: Optional[Dict[str, Any]] = None, replace: bool = False,
+                   read: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Write the state (unless it is ..., None deletes it) and the fields of data in one round trip.
+        If replace, other fields are deleted. If read, the whole data after the write is returned
+        """
+        data_key = self.key_builder.build(key, DATA_PART)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if state is not ...:
+                state_key = self.key_builder.build(key, "state")
+                if state is None:
+                    pipe.delete(state_key)
+                else:
+                    pipe.set(state_key, state.state if isinstance(state, State) else state, ex=self.state_ttl)
+            if replace:
+                pipe.delete(data_key, self.key_builder.build(key, LEGACY_DATA_PART))
+            if fields:
+                pipe.hset(data_key, mapping={name: orjson.dumps(value) for name, value in fields.items()})
+                if self.data_ttl:
+                    pipe.expire(data_key, self.data_ttl)
+            if read:  # Reading the merged data in the same round trip
+                pipe.hgetall(data_key)
+            results = await pipe.execute()
+        return self.decode(results[-1]) if read else None
+
+    @staticmethod
+    def decode(fields: Dict[Union[str, bytes], Union[str, bytes]]) -> Dict[str, Any]:
+        return {name.decode() if isinstance(name, bytes) else name: orjson.loads(value)
+                for name, value in fields.items()}
+
+    async def set_state(self, bot: Bot, key: StorageKey, state: StateType = None) -> None:
+        await self.save(bot, key, state=state)
+
+    async def migrate_data(self, key: StorageKey) -> Optional[Dict[str, Any]]:
+        """  Move data saved by RedisStorage to the hash and return it, or None if there is no such data  """
+        legacy_data = await self.redis.getdel(self.key_builder.build(key, LEGACY_DATA_PART))
+        if legacy_data is None:
+            return None
+        data = orjson.loads(legacy_data)
+        if data:
+            data_key = self.key_builder.build(key, DATA_PART)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for name, value in data.items():  # Fields written since are newer, they are kept
+                    pipe.hsetnx(data_key, name, orjson.dumps(value))
+                if self.data_ttl:
+                    pipe.expire(data_key, self.data_ttl)
+                pipe.hgetall(data_key)
+                data = self.decode((await pipe.execute())[-1])
+        return data
+
+    async def get_data(self, bot: Bot, key: StorageKey) -> Dict[str, Any]:
+        data = self.decode(await self.redis.hgetall(self.key_builder.build(key, DATA_PART)))
+        if not data:  # An empty hash doesn't exist, so the data may be not migrated yet
+            data = await self.migrate_data(key) or data
+        return data
+
+    async def set_data(self, bot: Bot, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self.save(bot, key, fields=data, replace=True)
+
+    async def update_data(self, bot: Bot, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
+        await self.migrate_data(key)
+        return await self.save(bot, key, fields=data, read=True)
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+STREAM_KEY = "updates:{partition}"
+LEASE_KEY = "updates:{partition}:owner"
+WORKERS_KEY = "updates:workers"
+GROUP_NAME = "workers"
+
+RENEW_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def get_partition_key(update: Dict[str, Any]) -> int:
+    """  Get id of the chat the update belongs to, updates of one chat must be handled in order  """
+    for event in update.values():
+        if not isinstance(event, dict):
+            continue
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        user = event.get("from") or event.get("user")
+        if user:
+            return user["id"]
+    return update["update_id"]
+
+
+class UpdatesProducer:
+    """  Pushes raw updates to Redis Streams, one stream per partition of chat ids  """
+
+    def __init__(self, redis: Redis, partitions: int, maxlen: int = 100_000, max_backoff: float = 30):
+        self.redis = redis
+        self.partitions = partitions
+        self.maxlen = maxlen
+        self.max_backoff = max_backoff
+
+    async def push_raw(self, update: Dict[str, Any]):
+        """  Push the update, retrying with backoff while Redis is unavailable, so the update is never lost  """
+        stream = STREAM_KEY.format(partition=get_partition_key(update) % self.partitions)
+        fields = {"update": json.dumps(update)}
+        backoff = 0.5
+        while True:
+            try:
+                await self.redis.xadd(stream, fields, maxlen=self.maxlen, approximate=True)
+                return
+            except RedisError:
+                logging.exception(f"Failed to push update {update.get('update_id')}, retry in {backoff} seconds")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def push(self, update: Update):
+        await self.push_raw(json.loads(update.json(exclude_none=True)))
+
+
+async def poll_updates(bot: Bot, producer: UpdatesProducer, allowed_updates: list[str], timeout: int = 30):
+    """  Long poll Telegram and push updates to the stream without handling them  """
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=timeout, allowed_updates=allowed_updates,
+                                            request_timeout=timeout + 10)
+        except Exception:
+            logging.exception("Failed to get updates")
+            await asyncio.sleep(1)
+            continue
+        for update in updates:
+            await producer.push(update)  # Waits until Redis is back, the offset is moved only after a push
+            offset = update.update_id + 1
+
+
+class UpdatesConsumer:
+    """
+    Stateless worker that handles updates from the streams.
+    Every partition is owned by one worker at a time (a lease key with TTL in Redis), so updates of one chat
+    are handled in order. Partitions are shared between live workers equally. When a worker dies its lease
+    expires, another worker takes the partition and first claims messages the dead worker didn't acknowledge.
+    A partition given away stops reading new messages and finishes the current update before its lease is released
+    """
+
+    def __init__(self, redis: Redis, dp: Dispatcher, bot: Bot, partitions: int, consumer_name: str,
+                 lease_ttl: float = 30, **workflow_data: Any):
+        self.redis = redis
+        self.dp = dp
+        self.bot = bot
+        self.partitions = partitions
+        self.consumer_name = consumer_name
+        self.lease_ttl = lease_ttl
+        self.workflow_data = workflow_data
+        self.owned: Dict[int, asyncio.Task] = {}
+        self.stopping: Dict[int, asyncio.Event] = {}
+        self.renew_lease = redis.register_script(RENEW_LEASE_SCRIPT)
+        self.release_lease = redis.register_script(RELEASE_LEASE_SCRIPT)
+
+    async def create_groups(self):
+        for partition in range(self.partitions):
+            try:
+                await self.redis.xgroup_create(STREAM_KEY.format(partition=partition), GROUP_NAME, id="0",
+                                               mkstream=True)
+            except ResponseError as error:
+                if "BUSYGROUP" not in str(error):  # Group already exists
+                    raise
+
+    async def run(self):
+        await self.create_groups()
+        logging.info(f"Updates consumer {self.consumer_name} started")
+        try:
+            while True:
+                try:
+                    await self.balance()
+                except Exception:
+                    logging.exception("Failed to balance partitions")
+                await asyncio.sleep(self.lease_ttl / 3)
+        finally:
+            for partition in list(self.owned):
+                await self.stop_partition(partition)
+            await self.redis.zrem(WORKERS_KEY, self.consumer_name)
+
+    async def balance(self):
+        """  Renew owned leases, take free partitions up to the fair share and give away extra ones  """
+        now = time.time()
+        await self.redis.zadd(WORKERS_KEY, {self.consumer_name: now})
+        await self.redis.zremrangebyscore(WORKERS_KEY, 0, now - self.lease_ttl)
+        workers_count = max(await self.redis.zcard(WORKERS_KEY), 1)
+        fair_share = math.ceil(self.partitions / workers_count)
+        lease_ms = int(self.lease_ttl * 1000)
+
+        for partition, task in list(self.owned.items()):
+            lost = not await self.renew_lease(keys=[LEASE_KEY.format(partition=partition)],
+                                              args=[self.consumer_name, lease_ms])
+            if lost or task.done():
+                await self.stop_partition(partition)
+
+        for partition in range(self.partitions):
+            if len(self.owned) >= fair_share:
+                break
+            if partition in self.owned:
+                continue
+            if await self.redis.set(LEASE_KEY.format(partition=partition), self.consumer_name, nx=True, px=lease_ms):
+                self.stopping[partition] = asyncio.Event()
+                self.owned[partition] = asyncio.create_task(self.consume(partition, self.stopping[partition]))
+                logging.info(f"Partition {partition} is taken by {self.consumer_name}")
+
+        if len(self.owned) > fair_share:
+            await self.stop_partition(max(self.owned))
+
+    async def stop_partition(self, partition: int):
+        task = self.owned.pop(partition)
+        self.stopping.pop(partition).set()
+        try:
+            # The lease was renewed by this balance, so the current update has time to be handled and acknowledged
+            await asyncio.wait_for(asyncio.shield(task), timeout=self.lease_ttl / 2)
+        except asyncio.TimeoutError:
+            logging.error(f"Partition {partition} didn't stop in time, its current update will be handled again")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        except Exception:
+            logging.exception(f"Partition {partition} failed")
+        await self.release_lease(keys=[LEASE_KEY.format(partition=partition)], args=[self.consumer_name])
+        logging.info(f"Partition {partition} is released by {self.consumer_name}")
+
+    async def consume(self, partition: int, stopping: asyncio.Event):
+        """  Handle messages of the partition one by one until 'stopping' is set  """
+        stream = STREAM_KEY.format(partition=partition)
+        # Messages that previous owner read but didn't acknowledge go first, they are older than new ones
+        start_id: Optional[str] = "0-0"
+        while start_id and not stopping.is_set():
+            result = await self.redis.xautoclaim(stream, GROUP_NAME, self.consumer_name, min_idle_time=0,
+                                                 start_id=start_id, count=100)
+            start_id, messages = result[0], result[1]
+            for message_id, fields in messages:
+                if stopping.is_set():  # Left pending, the next owner claims them
+                    return
+                await self.handle(stream, message_id, fields)
+            if start_id in ("0-0", b"0-0"):
+                break
+
+        while not stopping.is_set():
+            response = await self.redis.xreadgroup(GROUP_NAME, self.consumer_name, {stream: ">"}, count=10,
+                                                   block=1000)
+            for _, messages in response:
+                for message_id, fields in messages:
+                    if stopping.is_set():
+                        return
+                    await self.handle(stream, message_id, fields)
+
+    async def handle(self, stream: str, message_id: str, fields: Optional[Dict[str, str]]):
+        try:
+            if fields:  # Claimed entries that were trimmed from the stream have no fields
+                await self.dp.feed_raw_update(self.bot, json.loads(fields["update"]), **self.workflow_data)
+        except Exception:
+            # Acknowledged anyway, an update that breaks the handler would break it again
+            logging.exception(f"Failed to handle update {message_id} from {stream}")
+        # Not acknowledged if the handler was cancelled, the update is claimed and handled again by the next owner.
+        # Shielded, so a handled update isn't left pending if cancellation comes during the acknowledgement
+        await asyncio.shield(self.redis.xack(stream, GROUP_NAME, message_id))
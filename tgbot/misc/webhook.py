@@ -0,0 +1,64 @@
+import asyncio
+import hmac
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from aiohttp import web
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookHandler:
+    """
+    Receives updates from Telegram, checks the secret token and answers immediately,
+    the update itself is processed by 'feed' in a background task
+    """
+
+    def __init__(self, feed: Callable[[Dict[str, Any]], Awaitable], secret_token: Optional[str] = None):
+        self.feed = feed
+        self.secret_token = secret_token
+        self.tasks: Set[asyncio.Task] = set()  # Keep references, so tasks aren't garbage collected
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.secret_token and not hmac.compare_digest(request.headers.get(SECRET_TOKEN_HEADER, ""),
+                                                         self.secret_token):
+            return web.Response(status=401)
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        task = asyncio.create_task(self.feed(update))
+        self.tasks.add(task)
+        task.add_done_callback(self.on_task_done)
+        return web.Response()
+
+    def on_task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error("Failed to process update", exc_info=task.exception())
+
+    async def close(self):
+        """  Wait for updates that are still being processed  """
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.Response(text="OK")
+
+
+async def run_webhook_server(handler: WebhookHandler, path: str, host: str, port: int):
+    """  Serve the webhook until the task is cancelled  """
+    app = web.Application()
+    app.router.add_post(path, handler.handle)
+    app.router.add_get("/health", health)  # For load balancer health checks
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=host, port=port)
+    await site.start()
+    logging.info(f"Webhook server is listening on {host}:{port}{path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await handler.close()